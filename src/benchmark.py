@@ -0,0 +1,200 @@
+"""
+Accuracy and latency benchmark for vision.py over a folder of labeled screenshots.
+Every screenshot (png/jpg) needs a json file with the same name holding the expected vision output, e.g.
+{"layout": {"0F2": {"Name": "ENTRANCE", "Connections": ["—"]}, ...}, "incursion": {...}, "remaining": 1}
+
+Usage: python -m src.benchmark <screenshot folder> [--report benchmark.json]
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+import numpy as np
+import cv2
+
+from src import vision
+from src.data import ImageParams
+
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+# vision.py functions timed as stages, they are looked up through the module so wrapping the attribute is enough
+STAGES = {
+    "process_screenshot": "process_screenshot",
+    "pixel_classification": "classify_pixels",
+    "get_image_parameters": "get_image_parameters",
+    "get_room_boxes": "get_room_boxes",
+    "read_image_using_saved_params": "read_image_using_saved_params",
+    "connection_detection": "read_door_bitmask",
+    "read_incursions_remaining": "read_incursions_remaining",
+    "read_remaining_digits": "read_remaining_digits",
+    "read_incursion_submenu": "read_incursion_submenu",
+    "get_text_masks": "get_text_masks",
+    "recognize_room_text": "recognize_room_text",
+    "ocr_call": "image_to_string",
+}
+
+
+class StageTimer:
+    """
+    Collects the duration of every call to each stage. OCR runs on the worker pool, so records are locked.
+    """
+    def __init__(self):
+        self.durations = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            self.durations.setdefault(stage, []).append(seconds)
+
+    def wrap(self, stage: str, function):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.record(stage, time.perf_counter() - start)
+        return timed
+
+    def summary(self):
+        output = {}
+        with self._lock:
+            durations = dict(self.durations)
+        for stage, seconds in durations.items():
+            ms = np.array(seconds) * 1000
+            output[stage] = {
+                "calls": len(ms),
+                "total_ms": round(float(ms.sum()), 3),
+                "mean_ms": round(float(ms.mean()), 3),
+                "p50_ms": round(float(np.percentile(ms, 50)), 3),
+                "p95_ms": round(float(np.percentile(ms, 95)), 3),
+                "max_ms": round(float(ms.max()), 3),
+            }
+        return output
+
+
+@contextmanager
+def instrument(timer: StageTimer):
+    # Temporarily replaces the vision.py stages with timed versions
+    originals = {name: getattr(vision, name) for name in STAGES.values()}
+    try:
+        for stage, name in STAGES.items():
+            setattr(vision, name, timer.wrap(stage, originals[name]))
+        yield timer
+    finally:
+        for name, function in originals.items():
+            setattr(vision, name, function)
+
+
+class Accuracy:
+    def __init__(self):
+        self.counts = {}
+
+    def add(self, field: str, correct: bool):
+        counts = self.counts.setdefault(field, {"correct": 0, "total": 0})
+        counts["correct"] += int(correct)
+        counts["total"] += 1
+
+    def summary(self):
+        return {field: dict(counts, accuracy=round(counts["correct"] / counts["total"], 4)) for field, counts in self.counts.items()}
+
+
+def score_output(output, expected, accuracy: Accuracy):
+    """
+    Adds one result per field: each slot's room name and connections, each incursion option and the remaining count
+    """
+    for slot, expected_slot in expected["layout"].items():
+        slot_output = output["layout"].get(slot, {}) if output is not None else {}
+        accuracy.add("room_name", slot_output.get("Name") == expected_slot["Name"])
+        accuracy.add("connections", sorted(slot_output.get("Connections", [])) == sorted(expected_slot["Connections"]))
+    for key, value in expected["incursion"].items():
+        incursion_output = output["incursion"] if output is not None else {}
+        accuracy.add(f"incursion_{key}", incursion_output.get(key) == value)
+    accuracy.add("remaining", output is not None and output["remaining"] == expected["remaining"])
+
+
+def find_labeled_screenshots(folder: str):
+    screenshots = []
+    for filename in sorted(os.listdir(folder)):
+        name, extension = os.path.splitext(filename)
+        label_path = os.path.join(folder, name + ".json")
+        if extension.lower() in IMAGE_EXTENSIONS and os.path.exists(label_path):
+            screenshots.append((os.path.join(folder, filename), label_path))
+    return screenshots
+
+
+def reset_vision_state():
+    # Each screenshot is read from scratch, otherwise the caches and the templates enrolled by earlier runs hide the cost (and errors) of OCR
+    vision.OCR_CACHE.clear()
+    vision.FRAME_HISTORY.clear()
+    for classifier in vision.CLASSIFIERS.values():
+        classifier.clear()
+
+
+def run_benchmark(folder: str, warm: bool = True):
+    """
+    Processes every labeled screenshot in folder once with no calibration (cold) and, if warm, once more with the
+    ImageParams found by the first run. Returns the report as a dict.
+    """
+    report = {"folder": folder, "screenshots": 0, "failures": []}
+    vision.get_pixel_lut() # Built once per process, it would only be timed on the first screenshot
+    runs = {"cold": (StageTimer(), Accuracy())}
+    if warm:
+        runs["warm"] = (StageTimer(), Accuracy())
+    # The templates are cleared for every run, the ones already loaded in this process are put back afterwards
+    templates = {name: classifier.to_arrays(name) for name, classifier in vision.CLASSIFIERS.items()}
+
+    try:
+        for image_path, label_path in find_labeled_screenshots(folder):
+            report["screenshots"] += 1
+            screenshot = cv2.imread(image_path)
+            with open(label_path) as f:
+                expected = json.load(f)
+            previous = expected.get("previous")
+            image_params = ImageParams()
+            for run, (timer, accuracy) in runs.items():
+                reset_vision_state()
+                output = None
+                with instrument(timer):
+                    try:
+                        image_params, output = vision.process_screenshot(screenshot, image_params, previous=previous)
+                    except (ValueError, cv2.error) as error:
+                        report["failures"].append({"screenshot": os.path.basename(image_path), "run": run, "error": str(error)})
+                score_output(output, expected, accuracy)
+                if output is None:
+                    break # There are no parameters to reuse
+    finally:
+        for name, classifier in vision.CLASSIFIERS.items():
+            classifier.from_arrays(templates[name], name)
+
+    for run, (timer, accuracy) in runs.items():
+        report[run] = {"stages": timer.summary(), "accuracy": accuracy.summary()}
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vision accuracy and latency benchmark over labeled screenshots")
+    parser.add_argument("folder", help="Folder of screenshots, each with a json file of the expected vision output")
+    parser.add_argument("--report", default="benchmark.json", help="Where to write the json report")
+    parser.add_argument("--cold-only", action="store_true", help="Skip the second run with cached ImageParams")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.folder, warm=not args.cold_only)
+    with open(args.report, "w") as f:
+        json.dump(report, f, indent=4)
+
+    print(f"{report['screenshots']} screenshots, {len(report['failures'])} failures")
+    for run in ("cold", "warm"):
+        if run not in report:
+            continue
+        print(f"\n{run}")
+        for stage, stats in report[run]["stages"].items():
+            print(f"  {stage:<32} {stats['calls']:>5} calls  mean {stats['mean_ms']:>9.2f} ms  p95 {stats['p95_ms']:>9.2f} ms")
+        for field, counts in report[run]["accuracy"].items():
+            print(f"  {field:<32} {counts['correct']:>5}/{counts['total']:<5} {counts['accuracy']:.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import time
+from collections import deque
+from dataclasses import dataclass
+import numpy as np
+import mss
+
+
+RING_SIZE = 3 # Frames kept per size, the oldest one is overwritten by the next grab
+MAX_SIZES = 2 # Usually the capture rect and the full monitor, the least recently used size is dropped past this
+
+
+@dataclass
+class Frame:
+    image: np.ndarray # BGRA view of a ring buffer, only valid until RING_SIZE more frames of the same size are grabbed
+    region: dict # {"left", "top", "width", "height"} that was grabbed
+    sequence: int
+    timestamp: float
+
+
+class CaptureSession:
+    """
+    Long-lived screen capture. Each grab is copied once out of mss into the next buffer of a pre-allocated ring
+    and returned as a view of it, so no frame-sized numpy array is allocated per screenshot (mss still allocates
+    the bytes of each grab, which are dropped right after the copy).
+    The last frames stay available through recent_frames for diffing and debugging.
+    mss instances cannot be shared between threads, so a session must only grab from one thread.
+    """
+    def __init__(self, ring_size: int = RING_SIZE, max_sizes: int = MAX_SIZES):
+        self.ring_size = ring_size
+        self.max_sizes = max_sizes
+        self.sct = None
+        self.rings = {} # (height, width) -> buffers, least recently used size first
+        self.positions = {} # (height, width) -> index of the buffer the next grab writes to
+        self.recent = deque(maxlen=ring_size)
+        self.sequence = 0
+
+    def get_grabber(self):
+        if self.sct is None:
+            self.sct = mss.mss()
+        return self.sct
+
+    @property
+    def monitors(self):
+        return self.get_grabber().monitors
+
+    def reserve(self, height: int, width: int):
+        # Allocates the ring for a size ahead of the first grab of it
+        shape = (height, width)
+        if shape in self.rings:
+            self.rings[shape] = self.rings.pop(shape) # Most recently used
+            return
+        if len(self.rings) >= self.max_sizes:
+            oldest = next(iter(self.rings))
+            del self.rings[oldest], self.positions[oldest]
+        self.rings[shape] = [np.empty(shape + (4,), dtype=np.uint8) for _ in range(self.ring_size)]
+        self.positions[shape] = 0
+
+    def next_buffer(self, height: int, width: int):
+        self.reserve(height, width)
+        shape = (height, width)
+        position = self.positions[shape]
+        self.positions[shape] = (position + 1) % self.ring_size
+        return self.rings[shape][position]
+
+    def warm_up(self, region: dict):
+        """
+        Pays the first-grab costs of a region's size (mss' own setup and this size's ring) without writing to the ring,
+        so it can run while a frame of that size is still being read
+        """
+        shot = self.get_grabber().grab(region)
+        self.reserve(shot.height, shot.width)
+
+    def grab(self, region: dict):
+        shot = self.get_grabber().grab(region)
+        buffer = self.next_buffer(shot.height, shot.width)
+        np.copyto(buffer, np.frombuffer(shot.raw, dtype=np.uint8).reshape(buffer.shape))
+        self.sequence += 1
+        frame = Frame(buffer, dict(region), self.sequence, time.perf_counter())
+        self.recent.append(frame)
+        return frame
+
+    def recent_frames(self):
+        # Newest first, none of them has been overwritten yet
+        return list(reversed(self.recent))
+
+    def close(self):
+        if self.sct is not None:
+            self.sct.close()
+            self.sct = None
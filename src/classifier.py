@@ -0,0 +1,143 @@
+import os
+import threading
+import numpy as np
+import cv2
+
+
+FEATURE_SIZE = (96, 16) # (w, h) every text mask is scaled to before comparing
+MAX_ASPECT_DIFFERENCE = 0.15 # Templates whose width/height ratio differs more than this (in log space) are never matched
+
+
+def mask_features(text_mask, feature_size=FEATURE_SIZE):
+    """
+    Crops a text mask (black text on white, see get_text_mask) to its ink and scales it to feature_size.
+    Returns a zero-mean unit vector (so a dot product is the correlation) and the aspect ratio of the ink.
+    """
+    ink = text_mask < 128
+    ys, xs = np.nonzero(ink)
+    if len(ys) == 0:
+        return np.zeros(feature_size[0] * feature_size[1], dtype=np.float32), 0.0
+    ink = ink[ys.min():ys.max() + 1, xs.min():xs.max() + 1].astype(np.float32)
+    aspect = ink.shape[1] / ink.shape[0]
+    features = cv2.resize(ink, feature_size, interpolation=cv2.INTER_AREA).ravel()
+    features -= features.mean()
+    norm = np.linalg.norm(features)
+    if norm > 0:
+        features /= norm
+    return features, aspect
+
+
+class TemplateClassifier:
+    """
+    Nearest neighbour classifier over a closed vocabulary (room names) drawn in the game font.
+    Templates are the features of text masks that were confidently read by OCR (see enroll), so the
+    classifier learns the font at the user's resolution and only falls back to OCR when unsure.
+    """
+    def __init__(self, threshold: float = 0.9, margin: float = 0.05, max_templates_per_label: int = 4, feature_size: tuple = FEATURE_SIZE):
+        self.threshold = threshold # Minimum correlation with the best template
+        self.margin = margin # Minimum gap to the best template of any other label
+        self.max_templates_per_label = max_templates_per_label
+        self.feature_size = feature_size # Single glyphs are taller than they are wide, unlike words
+        self.labels = np.array([], dtype=object)
+        self.aspects = np.zeros(0, dtype=np.float32)
+        self.templates = np.zeros((0, feature_size[0] * feature_size[1]), dtype=np.float32)
+        self.dirty = False # Enrolled templates that have not been saved yet
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.labels)
+
+    def classify(self, text_mask, candidates=None):
+        """
+        Returns (label, confidence). label is None when the best match is not confident enough.
+        candidates optionally narrows the labels that are expected, the best candidate only needs the margin over the
+        other candidates. If it is not confident, or a label outside the candidates matches at least as well (like when
+        the tracked temple drifted), every label is considered instead.
+        """
+        features, aspect = mask_features(text_mask, self.feature_size)
+        with self._lock:
+            labels, aspects, templates = self.labels, self.aspects, self.templates
+        if len(labels) == 0 or aspect == 0:
+            return None, 0.0
+
+        scores = templates @ features
+        scores[np.abs(np.log(aspects / aspect)) > MAX_ASPECT_DIFFERENCE] = -1
+        if candidates is not None:
+            is_candidate = np.isin(labels, list(candidates))
+            if is_candidate.any():
+                candidate_scores = np.where(is_candidate, scores, -1)
+                label, confidence = self.pick(labels, candidate_scores, np.argmax(candidate_scores))
+                if label is not None and confidence > scores[~is_candidate].max(initial=-1):
+                    return label, confidence
+        return self.pick(labels, scores, np.argmax(scores))
+
+    def pick(self, labels, scores, best):
+        # The template at best is only trusted if it is close enough and clearly ahead of every other label in scores
+        confidence = float(scores[best])
+        other_labels = labels != labels[best]
+        runner_up = float(scores[other_labels].max()) if other_labels.any() else -1
+        if confidence < self.threshold or confidence - runner_up < self.margin:
+            return None, confidence
+        return labels[best], confidence
+
+    def enroll(self, text_mask, label: str):
+        features, aspect = mask_features(text_mask, self.feature_size)
+        if aspect == 0:
+            return False
+        with self._lock:
+            same_label = self.labels == label
+            if same_label.sum() >= self.max_templates_per_label:
+                return False
+            if same_label.any() and (self.templates[same_label] @ features).max() > 0.98:
+                return False # Nearly identical to an existing template
+            self.labels = np.append(self.labels, np.array([label], dtype=object))
+            self.aspects = np.append(self.aspects, np.float32(aspect))
+            self.templates = np.vstack([self.templates, features[np.newaxis]])
+            self.dirty = True
+        return True
+
+    def clear(self):
+        with self._lock:
+            self.labels = self.labels[:0]
+            self.aspects = self.aspects[:0]
+            self.templates = self.templates[:0]
+
+    def to_arrays(self, prefix: str):
+        with self._lock:
+            return {
+                f"{prefix}_labels": self.labels.astype(str),
+                f"{prefix}_aspects": self.aspects,
+                f"{prefix}_templates": self.templates,
+            }
+
+    def from_arrays(self, arrays, prefix: str):
+        if f"{prefix}_labels" not in arrays or arrays[f"{prefix}_templates"].shape[1] != self.templates.shape[1]:
+            return # Nothing saved, or saved with another feature size
+        with self._lock:
+            self.labels = arrays[f"{prefix}_labels"].astype(object)
+            self.aspects = arrays[f"{prefix}_aspects"]
+            self.templates = arrays[f"{prefix}_templates"]
+
+
+def save_classifiers(classifiers: dict, path: str):
+    """
+    Writes every classifier to one file, but only if one of them enrolled a template since the last save.
+    Returns whether the file was written.
+    """
+    if not any(classifier.dirty for classifier in classifiers.values()):
+        return False
+    arrays = {}
+    for name, classifier in classifiers.items():
+        classifier.dirty = False # Cleared first, so a template enrolled while saving is saved next time
+        arrays.update(classifier.to_arrays(name))
+    with open(path, "wb") as f:
+        np.savez_compressed(f, **arrays)
+    return True
+
+
+def load_classifiers(classifiers: dict, path: str):
+    if not os.path.exists(path):
+        return
+    with np.load(path) as arrays:
+        for name, classifier in classifiers.items():
+            classifier.from_arrays(arrays, name)
@@ -0,0 +1,89 @@
+import os
+import time
+
+
+MIN_POLL_INTERVAL = 0.05 # Seconds between checks right after a line was read
+MAX_POLL_INTERVAL = 0.5 # The interval doubles while nothing is written, up to this
+
+
+class ClientLogTail:
+    """
+    Follows client.txt like tail -f. The byte offset of the last complete line is kept, so each check only reads
+    what was appended since, however large the file has grown. A line that is still being written is held back
+    until its newline arrives. If the file is truncated or replaced, it is read again from the start.
+    """
+    def __init__(self, path: str, from_start: bool = False, min_interval: float = MIN_POLL_INTERVAL, max_interval: float = MAX_POLL_INTERVAL):
+        self.path = path
+        self.from_start = from_start # Otherwise the lines already in the file are skipped
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self.file = None
+        self.offset = 0
+        self.partial = b""
+
+    def open(self):
+        try:
+            self.file = open(self.path, "rb")
+        except FileNotFoundError:
+            self.file = None # The game has not created it yet, tried again on the next check
+            self.from_start = True
+            return
+        self.offset = 0 if self.from_start else os.fstat(self.file.fileno()).st_size
+        self.partial = b""
+        self.from_start = True # A file that shows up or replaces this one is read in full
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+    def was_replaced(self):
+        try:
+            return os.stat(self.path).st_ino != os.fstat(self.file.fileno()).st_ino
+        except FileNotFoundError:
+            return False # Deleted, keep reading the open file until a new one is created
+
+    def read_lines(self):
+        """
+        Returns the complete lines (decoded, without line endings) added since the last call
+        """
+        if self.file is None or self.was_replaced():
+            self.close()
+            self.open()
+            if self.file is None:
+                return []
+        size = os.fstat(self.file.fileno()).st_size
+        if size < self.offset: # Truncated
+            self.offset = 0
+            self.partial = b""
+        if size == self.offset:
+            return []
+
+        self.file.seek(self.offset)
+        data = self.partial + self.file.read(size - self.offset)
+        self.offset = size
+        lines = data.split(b"\n")
+        self.partial = lines.pop() # Empty if the data ended with a newline
+        return [line.rstrip(b"\r").decode("utf-8", errors="replace") for line in lines]
+
+    def poll(self):
+        """
+        Returns the new lines right away if there are any, otherwise waits for the current interval and returns none.
+        The interval grows while the file is quiet and resets as soon as a line is read.
+        """
+        lines = self.read_lines()
+        if len(lines) > 0:
+            self.interval = self.min_interval
+            return lines
+        time.sleep(self.interval)
+        self.interval = min(self.interval * 2, self.max_interval)
+        return []
@@ -1,292 +1,380 @@
-from dataclasses import dataclass, field
-import tkinter as tk
-import os
-import keyboard as kb
-
-from src.incursion import Incursion
-from src.temple import Temple
-
-@dataclass
-class Settings:
-    cached: bool = False
-    language: str = "english"
-    client_txt_path: str = ""
-    tesseract_exe_path: str = ""
-    show_tips: bool = True
-    screenshot_method_is_manual: bool = False
-    screenshot_keybind: str = "v"
-    immersive_ui: bool = True
-    show_settings_on_startup: bool = True
-    rooms: dict = field(default_factory=lambda: {
-            "Apex of Atzoatl": True,
-            "Locus of Corruption": True,
-            "Doryani's Institute": True,
-            "Apex of Ascension": False,
-            "Chamber of Iron": False,
-            "Glittering Halls": False,
-            "Hall of War": False,
-            "Hybridisation Chamber": False,
-            "Wealth of the Vaal": False,
-            "Sanctum of Immortality": False,
-            "Shrine of Unmaking": False,
-            "Factory": False,
-            "Museum Of Artefacts": False,
-            "Defense Research Lab": False,
-            "Hall of Legends": False,
-            "Crucible of Flame": False,
-            "Temple Nexus": False,
-            "Toxic Grove": False,
-            "Hall of Champions": False,
-            "Storm of Corruption": False,
-            "Sadist's Den": False,
-            "Atlas of Worlds": False,
-            "Throne of Atziri": False,
-            "Conduit of Lightning": False,
-            "Court of Sealed Death": False,
-            "House of the Others": False
-        })
-   
-    def from_dict(input_settings: dict):
-        cls = Settings(**input_settings)
-        # If it isn't cached, then invalid placeholder values can exist
-        if cls.cached is True:
-            cls.validate()
-        return cls
-   
-    def from_tk_vars(input_tk_vars: dict):
-        input_settings = iterate_through_dict(input_tk_vars, to_tk_vars=False)
-        cls = Settings(**input_settings)
-        cls.validate()
-        return cls
-   
-    def to_tk_vars(self):
-        return iterate_through_dict(self.__dict__, to_tk_vars=True)
-   
-    # Rewrite into a creator method that handles validation and put this in the main code
-    def validate(self):
-        # Check if the language was set
-        if self.language == "language":
-            raise ValueError(f"Language is not supported, got {self.language}")
-       
-        # Check if paths exist
-        if not os.path.exists(self.client_txt_path):
-            raise ValueError(f"client.txt was not found in path, got {repr(self.client_txt_path)}")
-       
-        if not os.path.exists(self.tesseract_exe_path):
-            raise ValueError(f"tesseract.exe was not found in path, got {repr(self.tesseract_exe_path)}")
-   
-        try: # Check if screenshot_keybind is valid
-            kb.parse_hotkey(self.screenshot_keybind)
-        except ValueError:
-            raise ValueError(f"Keybind was not recognized as valid, got {self.screenshot_keybind}")
-
-
-def iterate_through_dict(input_dict: dict, to_tk_vars: bool):
-    output = {}
-    var_types = {bool: tk.BooleanVar, str: tk.StringVar}
-    for key, value in input_dict.items():
-        if key == "rooms": # Another depth here
-            output["rooms"] = {}
-            for room, valuable in value.items():
-                if to_tk_vars:
-                    output["rooms"][room] = tk.BooleanVar(value=valuable)
-                else:
-                    output["rooms"][room] = valuable.get()
-            continue
-        if to_tk_vars:
-            output[key] = var_types[type(value)](value=value)
-        else:
-            output[key] = value.get()
-    return output
-
-
-@dataclass
-class ImageParams:
-    cached: bool = False
-    room_details: dict = field(default_factory=lambda: {
-        "room_width": 0,
-        "room_height": 0,
-        "horizontal_gap": 0,
-        "vertical_gap": 0
-    })
-    slots_to_xy: dict = field(default_factory=lambda: {
-        "0F1": {
-            "x": 0,
-            "y": 0
-        },
-        "0F2": {
-            "x": 0,
-            "y": 0
-        },
-        "0F3": {
-            "x": 0,
-            "y": 0
-        },
-        "1F0": {
-            "x": 0,
-            "y": 0
-        },
-        "1F1": {
-            "x": 0,
-            "y": 0
-        },
-        "1F2": {
-            "x": 0,
-            "y": 0
-        },
-        "1F3": {
-            "x": 0,
-            "y": 0
-        },
-        "2F0": {
-            "x": 0,
-            "y": 0
-        },
-        "2F1": {
-            "x": 0,
-            "y": 0
-        },
-        "2F2": {
-            "x": 0,
-            "y": 0
-        },
-        "3F0": {
-            "x": 0,
-            "y": 0
-        },
-        "3F1": {
-            "x": 0,
-            "y": 0
-        },
-        "4F0": {
-            "x": 0,
-            "y": 0
-        }
-    })
-    incursion_menu_rect: dict = field(default_factory=lambda: {
-        "x": 0,
-        "y": 0,
-        "w": 0,
-        "h": 0
-    })
-    incursions_remaining_rect: dict = field(default_factory=lambda: {
-        "x": 0,
-        "y": 0,
-        "w": 0,
-        "h": 0
-    })
-
-    def from_dict(input_dict: dict):
-        cls = ImageParams(**input_dict)
-        return cls
-
-
-@dataclass
-class Metrics:
-    total_incursion_time: int = 0
-    total_incursions: int = 0
-    average_incursion_time: float = 0
-    total_temples: int = 0
-    average_time_per_temple: float = 0
-    total_stones_used: int = 0
-    average_stones_per_temple: float = 0
-    resource_reallocation_tiers: int = 0
-    contested_development_tiers: int = 0
-    architect_appearances: dict = field(default_factory=lambda: {
-        "UN": 0,
-        "AR": 0,
-        "IR": 0,
-        "PS": 0,
-        "MN": 0,
-        "$$": 0,
-        "RG": 0,
-        "EX": 0,
-        "LF": 0,
-        "IT": 0,
-        "TR": 0,
-        "LG": 0,
-        "CR": 0,
-        "FR": 0,
-        "UP": 0,
-        "PP": 0,
-        "WP": 0,
-        "TM": 0,
-        "TS": 0,
-        "MP": 0,
-        "MM": 0,
-        "LN": 0,
-        "GM": 0,
-        "SB": 0,
-        "BR": 0
-    })
-    new_doors: int = 0
-    new_tier_1_rooms: int = 0
-
-    def from_dict(input_dict: dict):
-        cls = Metrics(**input_dict)
-        return cls
-
-    def record_incursion_time(self, time: int):
-        # Triggers when leaving an incursion
-        self.total_incursion_time += time
-        self.calc_average_time_per_incursion()
-        self.calc_average_time_per_temple()
-
-    def record_incursion(self, incursion: Incursion):
-        # Triggers when looking at a new incursion screen
-        self.total_incursions += 1
-
-        self.architect_appearances[incursion.left_option.architect] += 1
-        if incursion.room.tier == 0:
-            self.architect_appearances[incursion.right_option.architect] += 1
-   
-    def record_new_temple(self, temple: Temple):
-        # Triggers when looking at a new incursion screen and incursions_remaining = 12
-        # Need to count number of open doors and number of T1 rooms, and which architects appear
-        self.total_temples += 1
-        self.calc_average_stones_per_temple()
-        self.calc_average_time_per_temple()
-        self.new_doors = temple.layout.count_open_doors()
-        self.new_tier_1_rooms = temple.layout.count_tier_x_rooms(1)
-        for architect in temple.layout.get_architects():
-            self.architect_appearances[architect] += 1
-       
-    def record_temple_updates(self, doors_opened: int, was_swapped: bool, tiers_added: int):
-        self.total_stones_used += int(doors_opened)
-        self.calc_average_stones_per_temple()
-        if was_swapped:
-            self.contested_development_tiers += int(tiers_added) - 1
-        else:
-            self.resource_reallocation_tiers += int(tiers_added) - 1
-   
-    def calc_average_stones_per_temple(self):
-        self.average_stones_per_temple = self.total_stones_used / self.total_temples
-   
-    def calc_average_time_per_incursion(self):
-        self.average_incursion_time = self.total_incursion_time / self.total_incursions
-   
-    def calc_average_time_per_temple(self):
-        self.average_time_per_temple = self.total_incursion_time / self.total_temples
-    
-    def __str__(self):
-        output = ""
-        output += f"Total Incursion Time: {self.total_incursion_time}\n"
-        output += f"Total Incursions: {self.total_incursions}\n"
-        output += f"Average Time per Incursion: {self.average_incursion_time}\n"
-        output += f"Total Temples: {self.total_temples}\n"
-        output += f"Average Time per Temple: {self.average_time_per_temple}\n"
-        output += f"Total Stones of Passage Used: {self.total_stones_used}\n"
-        output += f"Average Stones Used per Temple: {self.average_stones_per_temple}\n"
-        output += f"Total Resource Reallocation Tiers: {self.resource_reallocation_tiers}\n"
-        output += f"Total Contested Development Tiers: {self.contested_development_tiers}\n"
-        return output
-
-
-if __name__ == "__main__":
-    import json
-    with open(r"Chronicler/src/config.json") as f:
-        data = json.load(f)
-        data = data["metrics"]
-   
-    data = Settings()
+from dataclasses import dataclass, field
+from copy import deepcopy
+import tkinter as tk
+import os
+import keyboard as kb
+
+from src.incursion import Incursion
+from src.temple import Temple
+
+@dataclass
+class Settings:
+    cached: bool = False
+    language: str = "english"
+    client_txt_path: str = ""
+    tesseract_exe_path: str = ""
+    ocr_backend: str = "auto" # "auto", "tesserocr" or "pytesseract", see src/ocr.py
+    ocr_workers: int = 4 # Number of regions OCRed at the same time
+    batch_room_ocr: bool = False # Read all rooms with a single OCR call
+    show_tips: bool = True
+    tracing: bool = False # Write a trace of each screenshot's stages, see src/tracing.py
+    trace_format: str = "chrome" # "chrome" (open in chrome://tracing or Perfetto) or "jsonl"
+    screenshot_method_is_manual: bool = False
+    detect_menu_automatically: bool = False # Read the menu as soon as it opens during an incursion, see src/menu_detector.py
+    menu_detector_fps: int = 4
+    screenshot_keybind: str = "v"
+    monitor: int = 1 # mss monitor index, 1 is the primary monitor
+    immersive_ui: bool = True
+    show_settings_on_startup: bool = True
+    rooms: dict = field(default_factory=lambda: {
+            "Apex of Atzoatl": True,
+            "Locus of Corruption": True,
+            "Doryani's Institute": True,
+            "Apex of Ascension": False,
+            "Chamber of Iron": False,
+            "Glittering Halls": False,
+            "Hall of War": False,
+            "Hybridisation Chamber": False,
+            "Wealth of the Vaal": False,
+            "Sanctum of Immortality": False,
+            "Shrine of Unmaking": False,
+            "Factory": False,
+            "Museum Of Artefacts": False,
+            "Defense Research Lab": False,
+            "Hall of Legends": False,
+            "Crucible of Flame": False,
+            "Temple Nexus": False,
+            "Toxic Grove": False,
+            "Hall of Champions": False,
+            "Storm of Corruption": False,
+            "Sadist's Den": False,
+            "Atlas of Worlds": False,
+            "Throne of Atziri": False,
+            "Conduit of Lightning": False,
+            "Court of Sealed Death": False,
+            "House of the Others": False
+        })
+   
+    def from_dict(input_settings: dict):
+        cls = Settings(**input_settings)
+        # If it isn't cached, then invalid placeholder values can exist
+        if cls.cached is True:
+            cls.validate()
+        return cls
+   
+    def from_tk_vars(input_tk_vars: dict):
+        input_settings = iterate_through_dict(input_tk_vars, to_tk_vars=False)
+        cls = Settings(**input_settings)
+        cls.validate()
+        return cls
+   
+    def to_tk_vars(self):
+        return iterate_through_dict(self.__dict__, to_tk_vars=True)
+   
+    # Rewrite into a creator method that handles validation and put this in the main code
+    def validate(self):
+        # Check if the language was set
+        if self.language == "language":
+            raise ValueError(f"Language is not supported, got {self.language}")
+       
+        # Check if paths exist
+        if not os.path.exists(self.client_txt_path):
+            raise ValueError(f"client.txt was not found in path, got {repr(self.client_txt_path)}")
+       
+        if not os.path.exists(self.tesseract_exe_path):
+            raise ValueError(f"tesseract.exe was not found in path, got {repr(self.tesseract_exe_path)}")
+   
+        try: # Check if screenshot_keybind is valid
+            kb.parse_hotkey(self.screenshot_keybind)
+        except ValueError:
+            raise ValueError(f"Keybind was not recognized as valid, got {self.screenshot_keybind}")
+
+
+def iterate_through_dict(input_dict: dict, to_tk_vars: bool):
+    output = {}
+    var_types = {bool: tk.BooleanVar, str: tk.StringVar, int: tk.IntVar}
+    for key, value in input_dict.items():
+        if key == "rooms": # Another depth here
+            output["rooms"] = {}
+            for room, valuable in value.items():
+                if to_tk_vars:
+                    output["rooms"][room] = tk.BooleanVar(value=valuable)
+                else:
+                    output["rooms"][room] = valuable.get()
+            continue
+        if to_tk_vars:
+            output[key] = var_types[type(value)](value=value)
+        else:
+            output[key] = value.get()
+    return output
+
+
+@dataclass
+class ImageParams:
+    cached: bool = False
+    room_details: dict = field(default_factory=lambda: {
+        "room_width": 0,
+        "room_height": 0,
+        "horizontal_gap": 0,
+        "vertical_gap": 0
+    })
+    slots_to_xy: dict = field(default_factory=lambda: {
+        "0F1": {
+            "x": 0,
+            "y": 0
+        },
+        "0F2": {
+            "x": 0,
+            "y": 0
+        },
+        "0F3": {
+            "x": 0,
+            "y": 0
+        },
+        "1F0": {
+            "x": 0,
+            "y": 0
+        },
+        "1F1": {
+            "x": 0,
+            "y": 0
+        },
+        "1F2": {
+            "x": 0,
+            "y": 0
+        },
+        "1F3": {
+            "x": 0,
+            "y": 0
+        },
+        "2F0": {
+            "x": 0,
+            "y": 0
+        },
+        "2F1": {
+            "x": 0,
+            "y": 0
+        },
+        "2F2": {
+            "x": 0,
+            "y": 0
+        },
+        "3F0": {
+            "x": 0,
+            "y": 0
+        },
+        "3F1": {
+            "x": 0,
+            "y": 0
+        },
+        "4F0": {
+            "x": 0,
+            "y": 0
+        }
+    })
+    incursion_menu_rect: dict = field(default_factory=lambda: {
+        "x": 0,
+        "y": 0,
+        "w": 0,
+        "h": 0
+    })
+    incursions_remaining_rect: dict = field(default_factory=lambda: {
+        "x": 0,
+        "y": 0,
+        "w": 0,
+        "h": 0
+    })
+
+    def from_dict(input_dict: dict):
+        cls = ImageParams(**input_dict)
+        return cls
+
+    def get_regions(self):
+        # (x, y, w, h) of every area that vision reads: the temple (including its doors), the submenu and the incursions remaining
+        room_w = self.room_details["room_width"]
+        room_h = self.room_details["room_height"]
+        gap_w = self.room_details["horizontal_gap"]
+        gap_h = self.room_details["vertical_gap"]
+        xs = [slot["x"] for slot in self.slots_to_xy.values()]
+        ys = [slot["y"] for slot in self.slots_to_xy.values()]
+        temple_x = min(xs) - gap_w
+        temple_y = min(ys) - gap_h
+        temple_rect = (temple_x, temple_y, max(xs) + room_w + gap_w - temple_x, max(ys) + room_h + gap_h - temple_y)
+        rects = [self.incursion_menu_rect, self.incursions_remaining_rect]
+        return [temple_rect] + [(rect["x"], rect["y"], rect["w"], rect["h"]) for rect in rects]
+
+    def get_read_rects(self):
+        # (x, y, w, h) of each region read separately, keyed like the vision results ("remaining", "incursion", "room:<slot>")
+        room_w = self.room_details["room_width"]
+        room_h = self.room_details["room_height"]
+        text_y = round(0.4 * room_h) # Room names are in the lower part of the room
+        rects = {
+            "remaining": tuple(self.incursions_remaining_rect[key] for key in "xywh"),
+            "incursion": tuple(self.incursion_menu_rect[key] for key in "xywh"),
+        }
+        for slot, xy in self.slots_to_xy.items():
+            rects[f"room:{slot}"] = (xy["x"], xy["y"] + text_y, room_w, room_h - text_y)
+        return rects
+
+    def get_capture_rect(self):
+        # Bounding box of all the regions, this is the only part of the screen that needs to be captured
+        regions = self.get_regions()
+        x = max(0, min(region[0] for region in regions))
+        y = max(0, min(region[1] for region in regions))
+        w = max(region[0] + region[2] for region in regions) - x
+        h = max(region[1] + region[3] for region in regions) - y
+        return {"x": x, "y": y, "w": w, "h": h}
+
+    def translated(self, dx: int, dy: int):
+        # Same parameters for an image whose origin is moved by (dx, dy), such as a cropped capture
+        output = ImageParams.from_dict(deepcopy(self.__dict__))
+        for slot in output.slots_to_xy.values():
+            slot["x"] += dx
+            slot["y"] += dy
+        for rect in [output.incursion_menu_rect, output.incursions_remaining_rect]:
+            rect["x"] += dx
+            rect["y"] += dy
+        return output
+
+
+def profile_key(width: int, height: int, monitor: int) -> str:
+    return f"{width}x{height}@{monitor}"
+
+
+@dataclass
+class ImageProfiles:
+    """
+    Calibrated ImageParams for every capture size and monitor the user has played on, so switching
+    between them does not need a recalibration. Stored as plain dicts to keep the config json-serializable.
+    """
+    profiles: dict = field(default_factory=dict)
+
+    def from_dict(input_dict: dict):
+        cls = ImageProfiles(**input_dict)
+        return cls
+
+    def __contains__(self, key: str):
+        return key in self.profiles
+
+    def get(self, key: str):
+        if key not in self.profiles:
+            return ImageParams() # Not cached, so it gets calibrated on the first screenshot
+        return ImageParams.from_dict(deepcopy(self.profiles[key]))
+
+    def put(self, key: str, image_params: ImageParams):
+        if image_params.cached:
+            self.profiles[key] = deepcopy(image_params.__dict__)
+
+    def invalidate(self, key: str):
+        self.profiles.pop(key, None)
+
+
+@dataclass
+class Metrics:
+    total_incursion_time: int = 0
+    total_incursions: int = 0
+    average_incursion_time: float = 0
+    total_temples: int = 0
+    average_time_per_temple: float = 0
+    total_stones_used: int = 0
+    average_stones_per_temple: float = 0
+    resource_reallocation_tiers: int = 0
+    contested_development_tiers: int = 0
+    architect_appearances: dict = field(default_factory=lambda: {
+        "UN": 0,
+        "AR": 0,
+        "IR": 0,
+        "PS": 0,
+        "MN": 0,
+        "$$": 0,
+        "RG": 0,
+        "EX": 0,
+        "LF": 0,
+        "IT": 0,
+        "TR": 0,
+        "LG": 0,
+        "CR": 0,
+        "FR": 0,
+        "UP": 0,
+        "PP": 0,
+        "WP": 0,
+        "TM": 0,
+        "TS": 0,
+        "MP": 0,
+        "MM": 0,
+        "LN": 0,
+        "GM": 0,
+        "SB": 0,
+        "BR": 0
+    })
+    new_doors: int = 0
+    new_tier_1_rooms: int = 0
+
+    def from_dict(input_dict: dict):
+        cls = Metrics(**input_dict)
+        return cls
+
+    def record_incursion_time(self, time: int):
+        # Triggers when leaving an incursion
+        self.total_incursion_time += time
+        self.calc_average_time_per_incursion()
+        self.calc_average_time_per_temple()
+
+    def record_incursion(self, incursion: Incursion):
+        # Triggers when looking at a new incursion screen
+        self.total_incursions += 1
+
+        self.architect_appearances[incursion.left_option.architect] += 1
+        if incursion.room.tier == 0:
+            self.architect_appearances[incursion.right_option.architect] += 1
+   
+    def record_new_temple(self, temple: Temple):
+        # Triggers when looking at a new incursion screen and incursions_remaining = 12
+        # Need to count number of open doors and number of T1 rooms, and which architects appear
+        self.total_temples += 1
+        self.calc_average_stones_per_temple()
+        self.calc_average_time_per_temple()
+        self.new_doors = temple.layout.count_open_doors()
+        self.new_tier_1_rooms = temple.layout.count_tier_x_rooms(1)
+        for architect in temple.layout.get_architects():
+            self.architect_appearances[architect] += 1
+       
+    def record_temple_updates(self, doors_opened: int, was_swapped: bool, tiers_added: int):
+        self.total_stones_used += int(doors_opened)
+        self.calc_average_stones_per_temple()
+        if was_swapped:
+            self.contested_development_tiers += int(tiers_added) - 1
+        else:
+            self.resource_reallocation_tiers += int(tiers_added) - 1
+   
+    def calc_average_stones_per_temple(self):
+        self.average_stones_per_temple = self.total_stones_used / self.total_temples
+   
+    def calc_average_time_per_incursion(self):
+        self.average_incursion_time = self.total_incursion_time / self.total_incursions
+   
+    def calc_average_time_per_temple(self):
+        self.average_time_per_temple = self.total_incursion_time / self.total_temples
+    
+    def __str__(self):
+        output = ""
+        output += f"Total Incursion Time: {self.total_incursion_time}\n"
+        output += f"Total Incursions: {self.total_incursions}\n"
+        output += f"Average Time per Incursion: {self.average_incursion_time}\n"
+        output += f"Total Temples: {self.total_temples}\n"
+        output += f"Average Time per Temple: {self.average_time_per_temple}\n"
+        output += f"Total Stones of Passage Used: {self.total_stones_used}\n"
+        output += f"Average Stones Used per Temple: {self.average_stones_per_temple}\n"
+        output += f"Total Resource Reallocation Tiers: {self.resource_reallocation_tiers}\n"
+        output += f"Total Contested Development Tiers: {self.contested_development_tiers}\n"
+        return output
+
+
+if __name__ == "__main__":
+    import json
+    with open(r"Chronicler/src/config.json") as f:
+        data = json.load(f)
+        data = data["metrics"]
+   
+    data = Settings()
     print(data)
\ No newline at end of file
@@ -0,0 +1,57 @@
+import threading
+import numpy as np
+
+
+MAX_CHANGED_PIXELS = 8 # Text pixels that may differ for a region to count as unchanged, fewer than any glyph has
+CHANGED_FRACTION = 0.005 # At most this fraction of the region's text pixels may differ either, for regions with little text
+
+
+def changed_pixels(old_mask, new_mask):
+    # Text pixels that appeared or disappeared between two text masks, None if they cannot be compared
+    if old_mask.shape != new_mask.shape:
+        return None
+    return np.count_nonzero((old_mask != 0) != (new_mask != 0))
+
+
+class FrameHistory:
+    """
+    Text masks and vision results of each region (slot, connections, submenu...) in the last processed frame.
+    A region whose text pixels are (nearly) the same as then reuses its previous result instead of being read again,
+    which covers reopening the menu, missed screenshots and pressing the keybind twice on the same state.
+    Only the text is compared, so the change is measured against what is read: a single digit always counts.
+    """
+    def __init__(self, max_changed: int = MAX_CHANGED_PIXELS, fraction: float = CHANGED_FRACTION):
+        self.max_changed = max_changed
+        self.fraction = fraction
+        self.masks = {}
+        self.results = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, key: str, text_mask):
+        """
+        text_mask is non-zero where the region has its text color. Returns the previous result for the region,
+        or None if its text changed (or it was never read)
+        """
+        with self._lock:
+            if key not in self.masks:
+                return None
+            old_mask = self.masks[key]
+            result = self.results[key]
+        changed = changed_pixels(old_mask, text_mask)
+        if changed is None:
+            return None
+        text_pixels = max(np.count_nonzero(old_mask), np.count_nonzero(text_mask))
+        if changed > min(self.max_changed, self.fraction * text_pixels):
+            return None
+        return result
+
+    def store(self, key: str, text_mask, result):
+        mask = np.array(text_mask, dtype=np.uint8) # Copied, so the history never holds on to a frame buffer
+        with self._lock:
+            self.masks[key] = mask
+            self.results[key] = result
+
+    def clear(self):
+        with self._lock:
+            self.masks.clear()
+            self.results.clear()
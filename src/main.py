@@ -1,418 +1,579 @@
-from os import listdir, path, stat
-import cv2
-from math import ceil
-import mss
-import numpy as np
-import pandas as pd
-import keyboard as kb
-import time
-import tkinter as tk
-import tkinter.filedialog as fd
-import threading
-import json
-import pygetwindow as gw
-import random
-import pytesseract
-import os
-from pathlib import Path
-
-from src.temple import Temple
-from src.vision import process_screenshot
-from src.constants import ROOM_DATA, ARCHITECTS
-from src.language import LANGUAGE_DATA
-from src.decisions import TIE_BREAKERS
-from src.slot import Slot
-from src.data import Settings, ImageParams, Metrics
-
-
-IMMERSIVE_BG = "#17120f"
-IMMERSIVE_FG = "#cc9053"
-CONTRAST_BG = "#f0f0f0"
-CONTRAST_FG = "#000000"
-BG_OPTIONS = {True: IMMERSIVE_BG, False: CONTRAST_BG}
-FG_OPTIONS = {True: IMMERSIVE_FG, False: CONTRAST_FG}
-
-if not os.path.exists(r"src\config.json"):
-    with open(r"src\config.json", "w") as f:
-        config = {
-            "settings": Settings().__dict__,
-            "image_params": ImageParams().__dict__,
-            "metrics": Metrics().__dict__, # TODO: Move rooms and program data to python files
-        }
-        json.dump(config, f, indent=4)
-
-SUPPORTED_LANGUAGES = list(LANGUAGE_DATA.keys())
-
-
-class IncursionApp():
-    def __init__(self):
-        # Need to read from a config file
-
-        with open(r"src\config.json") as f:
-            self.config = json.load(f)
-       
-        self.settings = Settings.from_dict(self.config["settings"])
-        self.image_params = ImageParams.from_dict(self.config["image_params"])
-        self.metrics = Metrics.from_dict(self.config["metrics"])
-       
-        # Get poe window info here
-        self.configure_root()
-        self.ui_vars = self.settings.to_tk_vars()
-
-        self.last_file_change = None
-        self.incursion_is_open = False
-        self.previous_incursion = None
-        self.show_settings_in_hideout = tk.BooleanVar(value=False)
-        self.thread_running = False
-
-        self.start = 0
-        self.end = 0
-
-        kb.add_hotkey(self.settings.screenshot_keybind, self.screenshot_keybind_pressed)
-        self.program_data = load_program_data(self.settings.language)
-        pytesseract.pytesseract.tesseract_cmd = self.settings.tesseract_exe_path
-       
-        if self.settings.show_settings_on_startup:
-            self.create_settings_frame()
-       
-    def run(self):
-        self.start_backend_thread()
-        self.root.mainloop()
-   
-    def start_backend_thread(self):
-        if self.settings.client_txt_path != "":
-            self.thread_running = True
-            self.backend_thread = threading.Thread(target=self.watch_client_txt)
-            self.backend_thread.start()
-   
-    def configure_root(self):
-        self.root = tk.Tk()
-        self.root.configure(bg="")
-        self.root.overrideredirect(True)
-        self.root.wm_attributes('-topmost', True)
-        self.root.withdraw()
-   
-    def create_settings_frame(self):
-        self.root.geometry("")
-
-        self.frame = tk.Frame(master=self.root) # TODO: IDK WHAT THE SIZE OF THIS SHOULD BE
-
-        room_frame = tk.Frame(master=self.frame)
-        room_frame.grid(row=0, column=1)
-
-        count = 0
-        col = 0
-        tk.Label(master=room_frame, text=self.program_data["ui_labels"]["room_settings_text"]).grid(row=0, columnspan=2)
-        for room in self.ui_vars["rooms"].keys():
-            tk.Checkbutton(master=room_frame, text=room, variable=self.ui_vars["rooms"][room], onvalue=1, offvalue=0).grid(row=(count % 13) + 1, column=col, sticky="w")
-            count += 1
-            if count == 13:
-                col += 1
-
-        config_frame = tk.Frame(master=self.frame)
-        config_frame.grid(row=0, column=0)
-
-        exit_button = tk.Button(master=config_frame, text="EXIT PROGRAM", command=self.exit_program)
-        exit_button.grid(row=0, column=0, sticky="w")
-
-        language_dropdown = tk.OptionMenu(config_frame, self.ui_vars["language"], *SUPPORTED_LANGUAGES)
-        language_dropdown.grid(row=1, columnspan=2)
-
-        path_to_client_txt_button = tk.Button(master=config_frame, text=self.program_data["ui_labels"]["path_to_client_txt_text"], command=self.select_client_txt_path)
-        path_to_client_txt_button.grid(row=2, column=0)
-
-        path_to_tesseract_button = tk.Button(master=config_frame, text=self.program_data["ui_labels"]["path_to_tesseract_text"], command=self.select_tesseract_exe_path)
-        path_to_tesseract_button.grid(row=2, column=1)
-
-        screenshot_method_checkbox = tk.Checkbutton(master=config_frame, text=self.program_data["ui_labels"]["screenshot_method_text"], variable=self.ui_vars["screenshot_method_is_manual"], onvalue=1, offvalue=0)
-        screenshot_method_checkbox.grid(row=3, columnspan=2)
-
-        screenshot_keybind_label = tk.Label(master=config_frame, text=self.program_data["ui_labels"]["screenshot_keybind_text"])
-        screenshot_keybind_label.grid(row=4, columnspan=2)
-
-        self.screenshot_keybind_button = tk.Button(master=config_frame, text=self.ui_vars["screenshot_keybind"].get(), command=self.set_keybind_label)
-        self.screenshot_keybind_button.grid(row=5, columnspan=2)
-
-        show_tips_checkbox = tk.Checkbutton(master=config_frame, text=self.program_data["ui_labels"]["show_tips_text"], variable=self.ui_vars["show_tips"], onvalue=1, offvalue=0)
-        show_tips_checkbox.grid(row=6, columnspan=2)
-
-        show_settings_checkbox = tk.Checkbutton(master=config_frame, text=self.program_data["ui_labels"]["settings_startup_text"], variable=self.ui_vars["show_settings_on_startup"], onvalue=1, offvalue=0)
-        show_settings_checkbox.grid(row=7, columnspan=2)
-
-        save_and_close_settings_button = tk.Button(master=config_frame, text=self.program_data["ui_labels"]["save_and_close_text"], command = self.save_and_close_settings_frame)
-        save_and_close_settings_button.grid(row=8, column=0)
-
-        close_settings_button = tk.Button(master=config_frame, text=self.program_data["ui_labels"]["close_text"], command = self.close_settings_frame)
-        close_settings_button.grid(row=8, column=1)
-
-        self.frame.pack()
-        self.root.deiconify()
-   
-    def save_and_close_settings_frame(self):
-        try:
-            old_keybind = self.settings.screenshot_keybind
-            self.settings = Settings.from_tk_vars(self.ui_vars)
-        except ValueError:
-            return
-       
-        self.settings.cached = True
-       
-        if self.thread_running is False:
-            self.start_backend_thread()
-       
-        kb.remove_hotkey(old_keybind)
-        kb.add_hotkey(self.settings.screenshot_keybind, self.screenshot_keybind_pressed)
-        pytesseract.pytesseract.tesseract_cmd = self.settings.tesseract_exe_path
-
-        room_settings = pd.Series(self.settings.rooms)
-        room_settings.index = room_settings.index.str.upper()
-        ROOM_DATA["Valuable"] = room_settings
-        with pd.option_context("future.no_silent_downcasting", True):
-            ROOM_DATA["Valuable"] = ROOM_DATA["Valuable"].fillna(False).astype(bool)
-            ARCHITECTS["Valuable"] = ROOM_DATA[["Theme", "Valuable"]][ROOM_DATA["Tier"] == 3].set_index("Theme")
-       
-        if TIE_BREAKERS[Slot(0, 4)] > 100 and self.settings.rooms["Apex of Atzoatl"]:
-            TIE_BREAKERS[Slot(0, 4)] -= 100
-        elif TIE_BREAKERS[Slot(0, 4)] < 100 and not self.settings.rooms["Apex of Atzoatl"]:
-            TIE_BREAKERS[Slot(0, 4)] += 100
-
-        self.save_config()
-        self.program_data = load_program_data(self.settings.language)
-        self.close_settings_frame()
-   
-    def close_settings_frame(self):
-        self.frame.forget()
-        self.root.withdraw()
-   
-    def select_client_txt_path(self):
-        self.ui_vars["client_txt_path"].set(fd.askdirectory(mustexist=True) + "/client.txt")
-   
-    def select_tesseract_exe_path(self):
-        self.ui_vars["tesseract_exe_path"].set(fd.askdirectory(mustexist=True) + "/tesseract.exe")
-   
-    def set_keybind_label(self):
-        keybind = kb.read_hotkey()
-        kb.stash_state()
-        self.screenshot_keybind_button.config(text=keybind)
-        self.ui_vars["screenshot_keybind"].set(keybind)
-   
-    def create_temple_frame(self, choose_left, choose_swap, leave_early, rooms_to_connect, map_area_level):
-        self.label_bg = BG_OPTIONS[self.settings.immersive_ui]
-        self.label_fg = FG_OPTIONS[self.settings.immersive_ui]
-
-        self.root.geometry("")
-        # need to add poe_window x, y, w, h to params. Need to use a library to get the window.
-        # May need to modify the way the screenshot is taken to only get the window and not the whole monitor
-        self.frame = tk.Frame(master=self.root, width=2560, height=1440, bg="", highlightbackground="white", highlightthickness=10)
-
-        self.frame.bind("<Button>", self.exit_temple_frame) # TODO: Figure out how to close the overlay upon any interaction that closes the V menu
-
-        self.add_incursion_choice_label(choose_left, choose_swap)
-        if self.settings.show_tips:
-            self.add_tip_label()
-        self.add_leave_door_label(leave_early, rooms_to_connect, map_area_level)
-        self.add_metrics_frame()
-
-        self.frame.pack()
-        self.root.deiconify()
-   
-    def add_incursion_choice_label(self, choose_left, choose_swap):
-        x_div = 7
-
-        text = self.program_data["ui_labels"]["swap_text"]
-        if choose_swap is False:
-            text = self.program_data["ui_labels"]["upgrade_text"]
-       
-        # How big should the font be?
-        self.choice_label = tk.Label(master=self.frame, text=text, font=("Arial", 25), bg=self.label_bg, fg=self.label_fg) # TODO: WSTNB?
-
-        label_y = self.image_params.incursion_menu_rect["y"] + self.image_params.incursion_menu_rect["h"] / 2 # TODO: WSTNB?
-        label_y -= self.choice_label.winfo_reqheight() / 2
-        label_y = ceil(label_y)
-
-        label_x = self.image_params.incursion_menu_rect["x"] + self.image_params.incursion_menu_rect["w"] / x_div
-        if choose_left is False:
-            label_x += (x_div - 2) * self.image_params.incursion_menu_rect["w"] / x_div
-        label_x -= self.choice_label.winfo_reqwidth() / 2
-        label_x = ceil(label_x)
-
-        self.choice_label.place(x=label_x, y=label_y)
-   
-    def add_tip_label(self):
-        text = random.choice(self.program_data["tips"])
-        # text = "This is a placeholder, but we will have a random set of tips in a list somewhere"
-        self.tip_label = tk.Label(master=self.frame, text=text, font=("Arial", 18), bg=self.label_bg, fg=self.label_fg)
-        label_x = self.image_params.incursions_remaining_rect["x"] + self.image_params.incursions_remaining_rect["w"] / 2
-        label_y = self.image_params.incursions_remaining_rect["y"] + self.image_params.incursions_remaining_rect["h"]
-        label_y = ceil(label_y)
-        label_x -= self.tip_label.winfo_reqwidth() / 2
-        label_x = ceil(label_x)
-        self.tip_label.place(x=label_x, y=label_y)
-   
-    def add_leave_door_label(self, leave_early, rooms_to_connect, map_area_level):
-        text = ""
-        if len(rooms_to_connect) == 0 and leave_early is False:
-            return
-
-        if leave_early:
-            text += self.program_data["ui_labels"]["skip_incursions_text"]
-       
-        if len(rooms_to_connect) > 0:
-            if text != "":
-                text += "\n\n"
-            text += self.program_data["ui_labels"]["door_order_text"]
-       
-            count = 1
-            for room in rooms_to_connect:
-                text += f"\n{count}: {room}"
-                count += 1
-       
-        text += f"\n\nIncursion Area Level must be >= {map_area_level}\n(to create a level 83 temple)"
-       
-        self.door_label = tk.Label(master=self.frame, text=text, font=("Arial", 14), bg=self.label_bg, fg=self.label_fg)
-        label_y = self.image_params.incursion_menu_rect["y"] + self.image_params.incursion_menu_rect["h"]
-        label_x = self.image_params.incursion_menu_rect["x"] + self.image_params.incursion_menu_rect["w"] / 2
-        label_x = ceil(label_x)
-        self.door_label.place(x=label_x, y=label_y)
-   
-    def add_metrics_frame(self):
-        metrics_frame = tk.Frame(self.frame, bg=self.label_bg)
-        label_y = self.image_params.incursion_menu_rect["y"]
-        label_x = self.image_params.incursion_menu_rect["x"] - 1.75 * self.image_params.incursion_menu_rect["w"]
-        label_x = ceil(label_x)
-        metrics_frame.place(x=label_x, y=label_y)
-
-        exit_button = tk.Button(master=metrics_frame, text="EXIT PROGRAM", font=("Arial", 14), command=self.exit_program, bg=self.label_bg, fg=self.label_fg)
-        exit_button.pack()
-
-        hideout_settings_checkbox = tk.Checkbutton(master=metrics_frame, text=self.program_data["ui_labels"]["settings_hideout_text"], variable=self.show_settings_in_hideout, onvalue=1, offvalue=0, font=("Arial", 14), bg=self.label_bg, fg=self.label_fg)
-        hideout_settings_checkbox.pack()
-
-        metrics_text = str(self.metrics)
-        metrics_label = tk.Label(master=metrics_frame, text=metrics_text, font=("Arial", 14), bg=self.label_bg, fg=self.label_fg)
-        metrics_label.pack()
-   
-    def exit_program(self):
-        if self.thread_running is True:
-            self.thread_running = False
-            self.backend_thread.join()
-        self.root.destroy()
-
-    def exit_temple_frame(self, event):
-        self.frame.forget()
-        self.root.withdraw()
-        win = gw.getWindowsWithTitle("Path of Exile")[0]
-        win.activate()
-   
-    def save_config(self):
-        self.config["settings"] = self.settings.__dict__
-        self.config["image_params"] = self.image_params.__dict__
-        self.config["metrics"] = self.metrics.__dict__
-        save_config(self.config)
-       
-    def watch_client_txt(self):
-        """
-        Monitoring client.txt for any changes
-        """
-        while self.thread_running:
-            latest_change = stat(self.settings.client_txt_path).st_mtime
-            if self.last_file_change != latest_change:
-                self.last_file_change = latest_change
-                self.read_client_txt()
-   
-    def read_client_txt(self):
-        """
-        Reading client.txt to check for Alva opening/finishing an Incursion.
-        """
-        with open(self.settings.client_txt_path, 'rb') as self.f:
-            last_line = str(self.f.readlines()[-1])
-            # May break if Client.txt does not track datetime with the setting turned off
-            if any(quote in last_line for quote in self.program_data["alva_opening_incursion_quotes"]) and last_line.count(':') == 3:
-                self.open_new_incursion()
-            elif any(quote in last_line for quote in self.program_data["alva_closing_incursion_quotes"]) and last_line.count(":") == 3:
-                self.close_active_incursion()
-            elif self.program_data["hideout_line"] in last_line and last_line.count(":") == 2 and self.show_settings_in_hideout.get() is True:
-                if self.incursion_is_open:
-                    self.close_active_incursion()
-                self.show_settings_in_hideout.set(False)
-                self.create_settings_frame()
-            self.f.close()
-        self.f = None # Does this need to be self?
-   
-    def open_new_incursion(self):
-        self.incursion_is_open = True
-        self.start = int(time.time())
-   
-    def close_active_incursion(self):
-        # TODO: Handle the player crashing or exiting the game, is this event logged in client.txt?
-        self.incursion_is_open = False
-        self.end = int(time.time())
-        self.metrics.record_incursion_time(self.end - self.start)
-        self.save_config()
-        self.start = 0
-        self.end = 0
-   
-    def screenshot_keybind_pressed(self):
-        if self.settings.screenshot_method_is_manual or self.incursion_is_open:
-            self.take_screenshot()
-   
-    def take_screenshot(self):
-        try:
-            self.sct = mss.mss()
-            monitor = self.sct.monitors[1]
-            self.image_params, image_output = process_screenshot(
-                np.array(self.sct.grab(monitor)),
-                self.image_params,
-                previous=self.previous_incursion
-            )
-
-            if self.previous_incursion is None:
-                self.temple = Temple.from_vision_output(image_output)
-                self.metrics.record_new_temple(self.temple)
-            else:
-                updates = self.temple.update_slot_from_vision_output(image_output)
-                self.metrics.record_temple_updates(*updates)
-
-            self.previous_incursion = self.temple.get_previous_incursion()
-            self.metrics.record_incursion(self.temple.incursion)
-           
-            choose_left, choose_swap, leave_early, priority_doors, map_area_level = self.temple.make_decisions()
-
-            self.save_config()
-
-            self.create_temple_frame(choose_left, choose_swap, leave_early, priority_doors, map_area_level)
-        except cv2.error:
-            # Assume temple screen is not open
-            pass
-
-
-def save_config(config):
-    with open(r'src\config.json', 'w') as f:
-        json.dump(config, f, indent=4)
-
-def load_program_data(language):
-    return LANGUAGE_DATA[language]
-
-
-if __name__ == '__main__':
-    client = IncursionApp()
-    client.run()
-    exit()
-
-    # import matplotlib.pyplot as plt
-    # image = cv2.imread(r"src\tests\Images\1440pNvidia\Path of Exile Screenshot 2023.12.20 - 18.03.00.67.png")
-    # plt.imshow(image[56:56+506, 1563:1563+648])
-    # plt.show()
-
-    # Batch testing
-    # count = 0
-    # folder_dir = r'Images\Spencer'
-    # for filename in listdir(folder_dir):
-    #     count += 1
-    #     print(filename, count)
-    #     path_to_image = path.join(folder_dir, filename)
-    #     image = cv2.imread(path_to_image)[..., ::-1] # RGB
-    #     hsv_image = cv2.cvtColor(image, cv2.COLOR_RGB2HSV)
-    #     test = Temple(hsv_image)
-    #     print(test)
-    #     print()
\ No newline at end of file
+from os import listdir, path
+import cv2
+from math import ceil
+import numpy as np
+import pandas as pd
+import keyboard as kb
+import time
+import tkinter as tk
+import tkinter.filedialog as fd
+import threading
+import json
+import pygetwindow as gw
+import random
+import pytesseract
+import os
+from pathlib import Path
+
+from src.temple import Temple
+from src.vision import process_screenshot, TempleNotVisibleError, LayoutChangedError, set_ocr_workers, set_batch_room_ocr, warm_up_ocr_workers, get_pixel_lut, OCR_CACHE, CLASSIFIERS, FRAME_HISTORY
+from src.constants import ROOM_DATA, ARCHITECTS
+from src.language import LANGUAGE_DATA
+from src.decisions import TIE_BREAKERS, clear_door_priority_cache
+from src.slot import Slot
+from src.data import Settings, ImageParams, ImageProfiles, Metrics, profile_key
+from src.prices import PriceStore, apply_prices
+from src.ocr import create_engine, set_engine
+from src.classifier import load_classifiers, save_classifiers
+from src.menu_detector import MenuDetector
+from src.pipeline import Pipeline
+from src.capture import CaptureSession
+from src.client_log import ClientLogTail
+from src.tracing import span, enable_tracing, disable_tracing, tracing_enabled
+
+
+IMMERSIVE_BG = "#17120f"
+IMMERSIVE_FG = "#cc9053"
+CONTRAST_BG = "#f0f0f0"
+CONTRAST_FG = "#000000"
+BG_OPTIONS = {True: IMMERSIVE_BG, False: CONTRAST_BG}
+FG_OPTIONS = {True: IMMERSIVE_FG, False: CONTRAST_FG}
+
+if not os.path.exists(r"src\config.json"):
+    with open(r"src\config.json", "w") as f:
+        config = {
+            "settings": Settings().__dict__,
+            "image_params": ImageParams().__dict__,
+            "image_profiles": ImageProfiles().__dict__,
+            "metrics": Metrics().__dict__, # TODO: Move rooms and program data to python files
+        }
+        json.dump(config, f, indent=4)
+
+SUPPORTED_LANGUAGES = list(LANGUAGE_DATA.keys())
+PRICE_SNAPSHOT_DIR = r"src\prices" # Local price snapshots (JSON/CSV), stand-in for the trade API
+OCR_CACHE_PATH = r"src\ocr_cache.json"
+TEMPLATES_PATH = r"src\templates.npz" # Text mask templates learned from OCR, see src/classifier.py
+TRACE_DIR = r"src\traces" # One trace file per session when tracing is on, see src/tracing.py
+
+
+class IncursionApp():
+    def __init__(self):
+        # Need to read from a config file
+
+        with open(r"src\config.json") as f:
+            self.config = json.load(f)
+       
+        self.settings = Settings.from_dict(self.config["settings"])
+        self.image_params = ImageParams.from_dict(self.config["image_params"])
+        self.image_profiles = ImageProfiles.from_dict(self.config.get("image_profiles", {}))
+        self.profile_key = None # Key of the profile image_params came from, see capture_stage
+        self.window_size = None # (width, height) of the game window, (0, 0) if it was not found, see get_window_size
+        self.metrics = Metrics.from_dict(self.config["metrics"])
+       
+        # Get poe window info here
+        self.configure_root()
+        self.ui_vars = self.settings.to_tk_vars()
+
+        self.incursion_is_open = False
+        self.previous_incursion = None
+        self.show_settings_in_hideout = tk.BooleanVar(value=False)
+        self.thread_running = False
+
+        self.start = 0
+        self.end = 0
+
+        kb.add_hotkey(self.settings.screenshot_keybind, self.screenshot_keybind_pressed)
+        self.program_data = load_program_data(self.settings.language)
+        pytesseract.pytesseract.tesseract_cmd = self.settings.tesseract_exe_path
+        set_engine(create_engine(self.settings.ocr_backend, self.settings.tesseract_exe_path))
+        set_ocr_workers(self.settings.ocr_workers)
+        set_batch_room_ocr(self.settings.batch_room_ocr)
+        OCR_CACHE.load(OCR_CACHE_PATH)
+        load_classifiers(CLASSIFIERS, TEMPLATES_PATH)
+
+        if self.settings.tracing:
+            enable_tracing(TRACE_DIR, self.settings.trace_format)
+
+        self.price_store = PriceStore(PRICE_SNAPSHOT_DIR)
+        self.capture = CaptureSession() # Grabs from the capture thread only, see capture_stage
+        # Keypresses and the menu detector only queue a screenshot, see take_screenshot
+        self.pipeline = Pipeline([("capture", self.capture_stage), ("vision", self.vision_stage), ("render", self.render_stage)])
+        self.menu_detector = MenuDetector(self.take_screenshot, self.get_menu_detector_region, self.menu_detection_enabled, self.settings.menu_detector_fps)
+        self.refresh_prices()
+       
+        if self.settings.show_settings_on_startup:
+            self.create_settings_frame()
+       
+    def run(self):
+        self.start_backend_thread()
+        self.pipeline.start()
+        self.menu_detector.start()
+        self.root.mainloop()
+   
+    def start_backend_thread(self):
+        if self.settings.client_txt_path != "":
+            self.thread_running = True
+            self.backend_thread = threading.Thread(target=self.watch_client_txt)
+            self.backend_thread.start()
+   
+    def configure_root(self):
+        self.root = tk.Tk()
+        self.root.configure(bg="")
+        self.root.overrideredirect(True)
+        self.root.wm_attributes('-topmost', True)
+        self.root.withdraw()
+   
+    def create_settings_frame(self):
+        self.root.geometry("")
+
+        self.frame = tk.Frame(master=self.root) # TODO: IDK WHAT THE SIZE OF THIS SHOULD BE
+
+        room_frame = tk.Frame(master=self.frame)
+        room_frame.grid(row=0, column=1)
+
+        count = 0
+        col = 0
+        tk.Label(master=room_frame, text=self.program_data["ui_labels"]["room_settings_text"]).grid(row=0, columnspan=2)
+        for room in self.ui_vars["rooms"].keys():
+            tk.Checkbutton(master=room_frame, text=room, variable=self.ui_vars["rooms"][room], onvalue=1, offvalue=0).grid(row=(count % 13) + 1, column=col, sticky="w")
+            count += 1
+            if count == 13:
+                col += 1
+
+        config_frame = tk.Frame(master=self.frame)
+        config_frame.grid(row=0, column=0)
+
+        exit_button = tk.Button(master=config_frame, text="EXIT PROGRAM", command=self.exit_program)
+        exit_button.grid(row=0, column=0, sticky="w")
+
+        language_dropdown = tk.OptionMenu(config_frame, self.ui_vars["language"], *SUPPORTED_LANGUAGES)
+        language_dropdown.grid(row=1, columnspan=2)
+
+        path_to_client_txt_button = tk.Button(master=config_frame, text=self.program_data["ui_labels"]["path_to_client_txt_text"], command=self.select_client_txt_path)
+        path_to_client_txt_button.grid(row=2, column=0)
+
+        path_to_tesseract_button = tk.Button(master=config_frame, text=self.program_data["ui_labels"]["path_to_tesseract_text"], command=self.select_tesseract_exe_path)
+        path_to_tesseract_button.grid(row=2, column=1)
+
+        screenshot_method_checkbox = tk.Checkbutton(master=config_frame, text=self.program_data["ui_labels"]["screenshot_method_text"], variable=self.ui_vars["screenshot_method_is_manual"], onvalue=1, offvalue=0)
+        screenshot_method_checkbox.grid(row=3, columnspan=2)
+
+        screenshot_keybind_label = tk.Label(master=config_frame, text=self.program_data["ui_labels"]["screenshot_keybind_text"])
+        screenshot_keybind_label.grid(row=4, columnspan=2)
+
+        self.screenshot_keybind_button = tk.Button(master=config_frame, text=self.ui_vars["screenshot_keybind"].get(), command=self.set_keybind_label)
+        self.screenshot_keybind_button.grid(row=5, columnspan=2)
+
+        show_tips_checkbox = tk.Checkbutton(master=config_frame, text=self.program_data["ui_labels"]["show_tips_text"], variable=self.ui_vars["show_tips"], onvalue=1, offvalue=0)
+        show_tips_checkbox.grid(row=6, columnspan=2)
+
+        show_settings_checkbox = tk.Checkbutton(master=config_frame, text=self.program_data["ui_labels"]["settings_startup_text"], variable=self.ui_vars["show_settings_on_startup"], onvalue=1, offvalue=0)
+        show_settings_checkbox.grid(row=7, columnspan=2)
+
+        save_and_close_settings_button = tk.Button(master=config_frame, text=self.program_data["ui_labels"]["save_and_close_text"], command = self.save_and_close_settings_frame)
+        save_and_close_settings_button.grid(row=8, column=0)
+
+        close_settings_button = tk.Button(master=config_frame, text=self.program_data["ui_labels"]["close_text"], command = self.close_settings_frame)
+        close_settings_button.grid(row=8, column=1)
+
+        self.frame.pack()
+        self.root.deiconify()
+   
+    def save_and_close_settings_frame(self):
+        try:
+            old_keybind = self.settings.screenshot_keybind
+            self.settings = Settings.from_tk_vars(self.ui_vars)
+        except ValueError:
+            return
+       
+        self.settings.cached = True
+       
+        if self.thread_running is False:
+            self.start_backend_thread()
+       
+        kb.remove_hotkey(old_keybind)
+        kb.add_hotkey(self.settings.screenshot_keybind, self.screenshot_keybind_pressed)
+        pytesseract.pytesseract.tesseract_cmd = self.settings.tesseract_exe_path
+        set_engine(create_engine(self.settings.ocr_backend, self.settings.tesseract_exe_path))
+        set_ocr_workers(self.settings.ocr_workers)
+        set_batch_room_ocr(self.settings.batch_room_ocr)
+        self.menu_detector.interval = 1 / max(self.settings.menu_detector_fps, 0.1)
+        if self.settings.tracing and not tracing_enabled():
+            enable_tracing(TRACE_DIR, self.settings.trace_format)
+        elif not self.settings.tracing:
+            disable_tracing()
+
+        room_settings = pd.Series(self.settings.rooms)
+        room_settings.index = room_settings.index.str.upper()
+        ROOM_DATA["Valuable"] = room_settings
+        with pd.option_context("future.no_silent_downcasting", True):
+            ROOM_DATA["Valuable"] = ROOM_DATA["Valuable"].fillna(False).astype(bool)
+            ARCHITECTS["Valuable"] = ROOM_DATA[["Theme", "Valuable"]][ROOM_DATA["Tier"] == 3].set_index("Theme")
+       
+        if TIE_BREAKERS[Slot(0, 4)] > 100 and self.settings.rooms["Apex of Atzoatl"]:
+            TIE_BREAKERS[Slot(0, 4)] -= 100
+        elif TIE_BREAKERS[Slot(0, 4)] < 100 and not self.settings.rooms["Apex of Atzoatl"]:
+            TIE_BREAKERS[Slot(0, 4)] += 100
+        clear_door_priority_cache() # The tie breakers are part of every priority
+
+        self.save_config()
+        self.program_data = load_program_data(self.settings.language)
+        self.close_settings_frame()
+   
+    def close_settings_frame(self):
+        self.frame.forget()
+        self.root.withdraw()
+   
+    def select_client_txt_path(self):
+        self.ui_vars["client_txt_path"].set(fd.askdirectory(mustexist=True) + "/client.txt")
+   
+    def select_tesseract_exe_path(self):
+        self.ui_vars["tesseract_exe_path"].set(fd.askdirectory(mustexist=True) + "/tesseract.exe")
+   
+    def set_keybind_label(self):
+        keybind = kb.read_hotkey()
+        kb.stash_state()
+        self.screenshot_keybind_button.config(text=keybind)
+        self.ui_vars["screenshot_keybind"].set(keybind)
+   
+    def create_temple_frame(self, choose_left, choose_swap, leave_early, rooms_to_connect, map_area_level):
+        self.label_bg = BG_OPTIONS[self.settings.immersive_ui]
+        self.label_fg = FG_OPTIONS[self.settings.immersive_ui]
+
+        self.root.geometry("")
+        # need to add poe_window x, y, w, h to params. Need to use a library to get the window.
+        # May need to modify the way the screenshot is taken to only get the window and not the whole monitor
+        self.frame = tk.Frame(master=self.root, width=2560, height=1440, bg="", highlightbackground="white", highlightthickness=10)
+
+        self.frame.bind("<Button>", self.exit_temple_frame) # TODO: Figure out how to close the overlay upon any interaction that closes the V menu
+
+        self.add_incursion_choice_label(choose_left, choose_swap)
+        if self.settings.show_tips:
+            self.add_tip_label()
+        self.add_leave_door_label(leave_early, rooms_to_connect, map_area_level)
+        self.add_metrics_frame()
+
+        self.frame.pack()
+        self.root.deiconify()
+   
+    def add_incursion_choice_label(self, choose_left, choose_swap):
+        x_div = 7
+
+        text = self.program_data["ui_labels"]["swap_text"]
+        if choose_swap is False:
+            text = self.program_data["ui_labels"]["upgrade_text"]
+       
+        # How big should the font be?
+        self.choice_label = tk.Label(master=self.frame, text=text, font=("Arial", 25), bg=self.label_bg, fg=self.label_fg) # TODO: WSTNB?
+
+        label_y = self.image_params.incursion_menu_rect["y"] + self.image_params.incursion_menu_rect["h"] / 2 # TODO: WSTNB?
+        label_y -= self.choice_label.winfo_reqheight() / 2
+        label_y = ceil(label_y)
+
+        label_x = self.image_params.incursion_menu_rect["x"] + self.image_params.incursion_menu_rect["w"] / x_div
+        if choose_left is False:
+            label_x += (x_div - 2) * self.image_params.incursion_menu_rect["w"] / x_div
+        label_x -= self.choice_label.winfo_reqwidth() / 2
+        label_x = ceil(label_x)
+
+        self.choice_label.place(x=label_x, y=label_y)
+   
+    def add_tip_label(self):
+        text = random.choice(self.program_data["tips"])
+        # text = "This is a placeholder, but we will have a random set of tips in a list somewhere"
+        self.tip_label = tk.Label(master=self.frame, text=text, font=("Arial", 18), bg=self.label_bg, fg=self.label_fg)
+        label_x = self.image_params.incursions_remaining_rect["x"] + self.image_params.incursions_remaining_rect["w"] / 2
+        label_y = self.image_params.incursions_remaining_rect["y"] + self.image_params.incursions_remaining_rect["h"]
+        label_y = ceil(label_y)
+        label_x -= self.tip_label.winfo_reqwidth() / 2
+        label_x = ceil(label_x)
+        self.tip_label.place(x=label_x, y=label_y)
+   
+    def add_leave_door_label(self, leave_early, rooms_to_connect, map_area_level):
+        text = ""
+        if len(rooms_to_connect) == 0 and leave_early is False:
+            return
+
+        if leave_early:
+            text += self.program_data["ui_labels"]["skip_incursions_text"]
+       
+        if len(rooms_to_connect) > 0:
+            if text != "":
+                text += "\n\n"
+            text += self.program_data["ui_labels"]["door_order_text"]
+       
+            count = 1
+            for room in rooms_to_connect:
+                text += f"\n{count}: {room}"
+                count += 1
+       
+        text += f"\n\nIncursion Area Level must be >= {map_area_level}\n(to create a level 83 temple)"
+       
+        self.door_label = tk.Label(master=self.frame, text=text, font=("Arial", 14), bg=self.label_bg, fg=self.label_fg)
+        label_y = self.image_params.incursion_menu_rect["y"] + self.image_params.incursion_menu_rect["h"]
+        label_x = self.image_params.incursion_menu_rect["x"] + self.image_params.incursion_menu_rect["w"] / 2
+        label_x = ceil(label_x)
+        self.door_label.place(x=label_x, y=label_y)
+   
+    def add_metrics_frame(self):
+        metrics_frame = tk.Frame(self.frame, bg=self.label_bg)
+        label_y = self.image_params.incursion_menu_rect["y"]
+        label_x = self.image_params.incursion_menu_rect["x"] - 1.75 * self.image_params.incursion_menu_rect["w"]
+        label_x = ceil(label_x)
+        metrics_frame.place(x=label_x, y=label_y)
+
+        exit_button = tk.Button(master=metrics_frame, text="EXIT PROGRAM", font=("Arial", 14), command=self.exit_program, bg=self.label_bg, fg=self.label_fg)
+        exit_button.pack()
+
+        hideout_settings_checkbox = tk.Checkbutton(master=metrics_frame, text=self.program_data["ui_labels"]["settings_hideout_text"], variable=self.show_settings_in_hideout, onvalue=1, offvalue=0, font=("Arial", 14), bg=self.label_bg, fg=self.label_fg)
+        hideout_settings_checkbox.pack()
+
+        metrics_text = str(self.metrics)
+        metrics_label = tk.Label(master=metrics_frame, text=metrics_text, font=("Arial", 14), bg=self.label_bg, fg=self.label_fg)
+        metrics_label.pack()
+   
+    def exit_program(self):
+        if self.thread_running is True:
+            self.thread_running = False
+            self.backend_thread.join()
+        self.menu_detector.stop()
+        self.pipeline.stop()
+        disable_tracing()
+        self.root.destroy()
+
+    def exit_temple_frame(self, event):
+        self.frame.forget()
+        self.root.withdraw()
+        win = gw.getWindowsWithTitle("Path of Exile")[0]
+        win.activate()
+   
+    def save_config(self):
+        self.config["settings"] = self.settings.__dict__
+        self.config["image_params"] = self.image_params.__dict__
+        self.config["image_profiles"] = self.image_profiles.__dict__
+        self.config["metrics"] = self.metrics.__dict__
+        save_config(self.config)
+        OCR_CACHE.save(OCR_CACHE_PATH)
+        save_classifiers(CLASSIFIERS, TEMPLATES_PATH)
+       
+    def watch_client_txt(self):
+        """
+        Following client.txt, only the lines added since the last check are read (see src/client_log.py)
+        """
+        with ClientLogTail(self.settings.client_txt_path) as client_txt:
+            while self.thread_running:
+                for line in client_txt.poll():
+                    self.read_client_txt_line(line)
+   
+    def read_client_txt_line(self, line):
+        """
+        Checking a line of client.txt for Alva opening/finishing an Incursion.
+        """
+        # May break if Client.txt does not track datetime with the setting turned off
+        if any(quote in line for quote in self.program_data["alva_opening_incursion_quotes"]) and line.count(':') == 3:
+            self.open_new_incursion()
+        elif any(quote in line for quote in self.program_data["alva_closing_incursion_quotes"]) and line.count(":") == 3:
+            self.close_active_incursion()
+        elif self.program_data["hideout_line"] in line and line.count(":") == 2 and self.show_settings_in_hideout.get() is True:
+            if self.incursion_is_open:
+                self.close_active_incursion()
+            self.show_settings_in_hideout.set(False)
+            self.create_settings_frame()
+   
+    def refresh_prices(self):
+        # Only rebuilds the price columns once the snapshot ttl has expired
+        if self.price_store.refresh():
+            apply_prices(self.price_store)
+   
+    def open_new_incursion(self):
+        self.incursion_is_open = True
+        self.start = int(time.time())
+        self.warm_up()
+
+    def warm_up(self):
+        # Alva speaks well before the menu is opened, so the cold start costs are paid now on the pipeline threads.
+        # It uses the current generation, so it never replaces a screenshot that is already queued.
+        self.pipeline.submit({"warm_up": True, "full_frame": False}, generation=self.pipeline.generation)
+   
+    def close_active_incursion(self):
+        # TODO: Handle the player crashing or exiting the game, is this event logged in client.txt?
+        self.incursion_is_open = False
+        self.end = int(time.time())
+        self.metrics.record_incursion_time(self.end - self.start)
+        self.save_config()
+        self.start = 0
+        self.end = 0
+   
+    def screenshot_keybind_pressed(self):
+        if self.settings.screenshot_method_is_manual or self.incursion_is_open:
+            self.take_screenshot()
+   
+    def menu_detection_enabled(self):
+        return self.settings.detect_menu_automatically and not self.settings.screenshot_method_is_manual and self.incursion_is_open
+
+    def get_menu_detector_region(self, sct):
+        # Only the temple is watched, so nothing is polled until its position is known from a screenshot
+        monitor = self.get_monitor(sct)[1]
+        if not self.image_params.cached:
+            return None
+        x, y, w, h = self.image_params.get_regions()[0]
+        x, y = max(x, 0), max(y, 0)
+        w, h = min(w, monitor["width"] - x), min(h, monitor["height"] - y)
+        if w <= 0 or h <= 0:
+            return None
+        return {"left": monitor["left"] + x, "top": monitor["top"] + y, "width": w, "height": h}
+
+    def get_monitor(self, sct):
+        monitor_idx = self.settings.monitor
+        if monitor_idx < 1 or monitor_idx >= len(sct.monitors):
+            monitor_idx = 1
+        return monitor_idx, sct.monitors[monitor_idx]
+
+    def get_window_size(self, refresh=False):
+        # Enumerating the windows is too slow for every capture, so the size is kept until a refresh (see capture_stage)
+        if refresh or self.window_size is None:
+            windows = gw.getWindowsWithTitle("Path of Exile")
+            self.window_size = (0, 0)
+            if len(windows) > 0 and windows[0].width > 0 and windows[0].height > 0:
+                self.window_size = (windows[0].width, windows[0].height)
+        return self.window_size
+
+    def get_profile_key(self, monitor_idx, monitor, refresh=False):
+        # The menu layout follows the game window, which only differs from the monitor in windowed mode
+        width, height = self.get_window_size(refresh)
+        if width == 0:
+            width, height = monitor["width"], monitor["height"]
+        return profile_key(width, height, monitor_idx)
+
+    def take_screenshot(self):
+        # Called from the keyboard hook and the menu detector, the work is done on the pipeline threads
+        self.pipeline.submit({"full_frame": False})
+
+    def capture_stage(self, request):
+        monitor_idx, monitor = self.get_monitor(self.capture)
+        # The window is looked up again when calibration is due or failed (full frame), at warm-up, and for unknown profiles
+        refresh = request["full_frame"] or request.get("warm_up", False)
+        key = self.get_profile_key(monitor_idx, monitor, refresh)
+        if key not in self.image_profiles and not refresh:
+            key = self.get_profile_key(monitor_idx, monitor, refresh=True)
+        if key != self.profile_key:
+            # Resolution or monitor changed, reuse its calibration if it was seen before
+            if key in self.image_profiles or self.profile_key is not None:
+                self.image_params = self.image_profiles.get(key)
+                FRAME_HISTORY.clear()
+            self.profile_key = key
+        request["key"] = key
+
+        if request.get("warm_up"):
+            # The first grab of a size allocates its buffers, in mss and in the capture ring. Frames in the ring are left alone
+            if self.image_params.cached:
+                rect = self.image_params.get_capture_rect()
+                width = min(rect["w"], monitor["width"] - rect["x"])
+                height = min(rect["h"], monitor["height"] - rect["y"])
+                if width > 0 and height > 0:
+                    self.capture.warm_up({"left": monitor["left"] + rect["x"], "top": monitor["top"] + rect["y"], "width": width, "height": height})
+            return request
+
+        if self.image_params.cached and not request["full_frame"]:
+            # Only grab the part of the screen the cached parameters read
+            rect = self.image_params.get_capture_rect()
+            width = min(rect["w"], monitor["width"] - rect["x"])
+            height = min(rect["h"], monitor["height"] - rect["y"])
+            if width > 0 and height > 0:
+                region = {"left": monitor["left"] + rect["x"], "top": monitor["top"] + rect["y"], "width": width, "height": height}
+                request["screenshot"] = self.capture.grab(region).image
+                request["origin"] = (rect["x"], rect["y"])
+                return request
+            # The profile does not fit this screen (UI scale, moved window), reading the full screen recalibrates it
+        request["screenshot"] = self.capture.grab(monitor).image
+        request["origin"] = None
+        return request
+
+    def vision_stage(self, request):
+        if request.get("warm_up"):
+            with span("warm_up"):
+                warm_up_ocr_workers()
+                get_pixel_lut()
+                self.refresh_prices()
+            return None
+
+        try:
+            image_params, image_output = process_screenshot(
+                request["screenshot"],
+                self.image_params,
+                previous=self.previous_incursion,
+                origin=request["origin"]
+            )
+        except (cv2.error, TempleNotVisibleError):
+            # Assume temple screen is not open
+            if request["origin"] is None:
+                self.window_size = None # Calibration failed, the window may have been resized
+            return None
+        except LayoutChangedError:
+            if self.pipeline.is_stale():
+                return None # Newer captures may have reused this frame's buffer
+            # The rooms moved, recalibrate from a full screenshot. The old parameters are kept until that succeeds
+            self.image_profiles.invalidate(request["key"])
+            self.pipeline.submit({"full_frame": True})
+            return None
+        except ValueError as error:
+            # A region could not be read with the rooms still in place (like a tooltip over the count), try again on the next screenshot
+            if not self.pipeline.is_stale():
+                print(error)
+            return None
+        self.image_params = image_params
+        self.image_profiles.put(request["key"], image_params)
+        if self.pipeline.is_stale():
+            return None # A newer screenshot is on its way, the temple is only updated with the latest state
+
+        if self.previous_incursion is None:
+            with span("from_vision_output"):
+                self.temple = Temple.from_vision_output(image_output)
+            self.metrics.record_new_temple(self.temple)
+        else:
+            with span("update_slot_from_vision_output"):
+                updates = self.temple.update_slot_from_vision_output(image_output)
+            self.metrics.record_temple_updates(*updates)
+
+        self.previous_incursion = self.temple.get_previous_incursion()
+        self.metrics.record_incursion(self.temple.incursion)
+        self.refresh_prices()
+       
+        with span("make_decisions"):
+            decisions = self.temple.make_decisions()
+
+        with span("save_config"):
+            self.save_config()
+        return decisions
+
+    def render_stage(self, decisions):
+        # tkinter can only be used from the main thread
+        self.root.after(0, self.show_decisions, decisions)
+        return None
+
+    def show_decisions(self, decisions):
+        choose_left, choose_swap, leave_early, priority_doors, map_area_level = decisions
+        with span("create_temple_frame"):
+            self.create_temple_frame(choose_left, choose_swap, leave_early, priority_doors, map_area_level)
+
+
+def save_config(config):
+    with open(r'src\config.json', 'w') as f:
+        json.dump(config, f, indent=4)
+
+def load_program_data(language):
+    return LANGUAGE_DATA[language]
+
+
+if __name__ == '__main__':
+    client = IncursionApp()
+    client.run()
+    exit()
+
+    # import matplotlib.pyplot as plt
+    # image = cv2.imread(r"src\tests\Images\1440pNvidia\Path of Exile Screenshot 2023.12.20 - 18.03.00.67.png")
+    # plt.imshow(image[56:56+506, 1563:1563+648])
+    # plt.show()
+
+    # Batch testing, see src/benchmark.py
+    # python -m src.benchmark <screenshot folder>
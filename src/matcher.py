@@ -0,0 +1,68 @@
+import difflib
+from collections import defaultdict
+from functools import lru_cache
+
+
+def trigrams(text: str):
+    # Padding lets short words (like the digits) and word boundaries produce trigrams
+    text = f"  {text} "
+    return {text[idx:idx + 3] for idx in range(len(text) - 2)}
+
+
+class FuzzyMatcher:
+    """
+    Spellchecker for OCR output over a fixed vocabulary.
+    A trigram index shortlists the words sharing the most trigrams with the input. The shortlist is scored with difflib
+    first, and its best ratio lets the rest of the words be skipped with cheap upper bounds, so the result is the
+    same as get_close_matches at a fraction of the cost.
+    Results are cached per (text, candidates), since the same OCR strings come up again and again.
+    """
+    def __init__(self, words, shortlist_size: int = 8, cutoff: float = 0.6, cache_size: int = 4096):
+        self.words = list(dict.fromkeys(words))
+        self.shortlist_size = shortlist_size
+        self.cutoff = cutoff
+        self.index = defaultdict(set)
+        for word in self.words:
+            for gram in trigrams(word):
+                self.index[gram].add(word)
+        self._match = lru_cache(maxsize=cache_size)(self._uncached_match)
+
+    def match(self, text: str, candidates=None):
+        """
+        Returns (word, score). word is None if no word (out of the candidates, if given) scores at least the cutoff.
+        """
+        if candidates is not None:
+            candidates = frozenset(candidates)
+        return self._match(text, candidates)
+
+    def _uncached_match(self, text: str, candidates: frozenset):
+        overlap = defaultdict(int)
+        for gram in trigrams(text):
+            for word in self.index.get(gram, ()):
+                if candidates is None or word in candidates:
+                    overlap[word] += 1
+        shortlist = sorted(overlap, key=lambda word: overlap[word], reverse=True)[:self.shortlist_size]
+        words = self.words if candidates is None else [word for word in self.words if word in candidates]
+        # The shortlist is scored first so its best ratio prunes the rest, which usually only get the cheap bounds.
+        # Every word is still considered, so a word the trigrams missed is found just like get_close_matches would.
+        shortlisted = set(shortlist)
+        ordered = shortlist + [word for word in words if word not in shortlisted]
+
+        best_word = None
+        best_score = 0.0
+        sequence_matcher = difflib.SequenceMatcher()
+        sequence_matcher.set_seq2(text)
+        for word in ordered:
+            sequence_matcher.set_seq1(word)
+            # Same cheap upper bounds get_close_matches uses before computing the full ratio
+            if sequence_matcher.real_quick_ratio() < best_score or sequence_matcher.quick_ratio() < best_score:
+                continue
+            score = sequence_matcher.ratio()
+            # Ties go to the larger word, like the heap in get_close_matches
+            if score > best_score or (score == best_score and best_word is not None and word > best_word):
+                best_word = word
+                best_score = score
+
+        if best_score < self.cutoff:
+            return None, best_score
+        return best_word, best_score
@@ -0,0 +1,104 @@
+import threading
+import time
+import numpy as np
+import cv2
+import mss
+
+from src.vision import ROOM_BORDER_RANGES
+
+
+SAMPLE_STEP = 4 # Only every SAMPLE_STEP-th pixel in each direction is looked at
+MIN_BORDER_FRACTION = 0.002 # Fraction of sampled pixels that have to be room border colors for the menu to count as open
+THUMBNAIL_SIZE = (48, 27) # (w, h) of the thumbnail used to tell when the open menu has changed
+CHANGE_THRESHOLD = 6 # Mean absolute difference (0-255) between thumbnails for the menu to count as changed
+
+
+def border_fraction(hsv_sample):
+    """
+    Fraction of pixels with one of the room border colors, the signature of the temple menu
+    """
+    in_range = np.zeros(hsv_sample.shape[:2], dtype=bool)
+    for lower, upper in ROOM_BORDER_RANGES.values():
+        in_range |= cv2.inRange(hsv_sample, lower, upper) > 0
+    return np.count_nonzero(in_range) / max(in_range.size, 1)
+
+
+class MenuDetector:
+    """
+    Background loop that grabs a small part of the screen a few times a second and calls on_menu
+    when the temple menu opens, or when it changes while open. The frame is subsampled before any
+    color conversion, so the loop is cheap enough to run for the whole session.
+    Only triggers once the menu has stopped changing, so animations and fades are not read.
+    Nothing is grabbed while get_region returns None, e.g. before the temple's position is known.
+    """
+    def __init__(self, on_menu, get_region, is_enabled=lambda: True, fps: float = 4):
+        self.on_menu = on_menu
+        self.get_region = get_region # Called with the mss instance, returns the region (left, top, width, height) to watch or None
+        self.is_enabled = is_enabled
+        self.interval = 1 / max(fps, 0.1)
+        self.menu_open = False
+        self.last_thumbnail = None
+        self.triggered_thumbnail = None
+        self.running = False
+        self.thread = None
+
+    def process_frame(self, frame):
+        """
+        Takes a BGR(A) frame, returns True if on_menu should be called for it
+        """
+        sample = np.ascontiguousarray(frame[::SAMPLE_STEP, ::SAMPLE_STEP, :3])
+        hsv_sample = cv2.cvtColor(sample, cv2.COLOR_BGR2HSV)
+        thumbnail = cv2.resize(hsv_sample[..., 2], THUMBNAIL_SIZE, interpolation=cv2.INTER_AREA).astype(np.int16)
+        previous_thumbnail = self.last_thumbnail
+        self.last_thumbnail = thumbnail
+
+        self.menu_open = bool(border_fraction(hsv_sample) >= MIN_BORDER_FRACTION)
+        if not self.menu_open:
+            self.triggered_thumbnail = None
+            return False
+        if previous_thumbnail is None or np.abs(thumbnail - previous_thumbnail).mean() > CHANGE_THRESHOLD:
+            return False # Still opening or animating
+        if self.triggered_thumbnail is not None and np.abs(thumbnail - self.triggered_thumbnail).mean() <= CHANGE_THRESHOLD:
+            return False # Already read this state
+        self.triggered_thumbnail = thumbnail
+        return True
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def reset(self):
+        self.menu_open = False
+        self.last_thumbnail = None
+        self.triggered_thumbnail = None
+
+    def poll(self, sct):
+        """
+        One tick of the loop, grabs the region (if there is one) and calls on_menu if the menu is ready to be read
+        """
+        region = self.get_region(sct) if self.is_enabled() else None
+        if region is None:
+            self.reset()
+            return
+        shot = sct.grab(region)
+        # A view of mss' buffer, only the subsample taken by process_frame is copied
+        frame = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+        if self.process_frame(frame):
+            self.on_menu()
+
+    def run(self):
+        # mss instances cannot be shared between threads, so the detector has its own
+        with mss.mss() as sct:
+            while self.running:
+                started = time.perf_counter()
+                self.poll(sct)
+                time.sleep(max(0, self.interval - (time.perf_counter() - started)))
@@ -0,0 +1,183 @@
+import os
+import shlex
+import threading
+import numpy as np
+import pytesseract
+
+try: # Optional, keeps a Tesseract instance alive in-process instead of starting tesseract.exe per call
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+
+def parse_config(config: str):
+    """
+    Splits a pytesseract config string into the page segmentation mode, runtime variables (-c) and
+    variables that Tesseract only reads on init (user words/patterns).
+    """
+    psm = None
+    variables = {}
+    init_variables = {}
+    tokens = shlex.split(config)
+    idx = 0
+    while idx < len(tokens):
+        token = tokens[idx]
+        if token == "-c" and idx + 1 < len(tokens):
+            name, value = tokens[idx + 1].split("=", 1)
+            variables[name] = value
+            idx += 1
+        elif token == "--psm" and idx + 1 < len(tokens):
+            psm = int(tokens[idx + 1])
+            idx += 1
+        elif token == "--user-words" and idx + 1 < len(tokens):
+            init_variables["user_words_file"] = tokens[idx + 1]
+            idx += 1
+        elif token == "--user-patterns" and idx + 1 < len(tokens):
+            init_variables["user_patterns_file"] = tokens[idx + 1]
+            idx += 1
+        idx += 1
+    return psm, variables, init_variables
+
+
+class OCREngine:
+    """
+    Interface used by vision.py for all text recognition
+    """
+    name = "base"
+
+    def image_to_string(self, image, config: str = "") -> str:
+        raise NotImplementedError
+
+    def image_to_data(self, image, config: str = "") -> list:
+        """
+        Recognized words in reading order, as dicts of text, conf, left, top, width and height
+        """
+        raise NotImplementedError
+
+    def warm_up(self, configs=("",)):
+        # Pays any startup cost ahead of the first screenshot, once per config the engine will be used with
+        for config in configs:
+            self.image_to_string(np.full((32, 32), 255, dtype=np.uint8), config=config)
+
+    def close(self):
+        pass
+
+
+class PytesseractEngine(OCREngine):
+    """
+    Fallback engine, writes a temp image and starts a new tesseract process for every call
+    """
+    name = "pytesseract"
+
+    def image_to_string(self, image, config: str = "") -> str:
+        return pytesseract.image_to_string(image, config=config)
+
+    def image_to_data(self, image, config: str = "") -> list:
+        data = pytesseract.image_to_data(image, config=config, output_type=pytesseract.Output.DICT)
+        words = []
+        for idx in range(len(data["text"])):
+            if data["text"][idx].strip() == "":
+                continue
+            words.append({key: data[key][idx] for key in ("text", "conf", "left", "top", "width", "height")})
+        return words
+
+
+class TesserocrEngine(OCREngine):
+    """
+    Long-lived in-process Tesseract engine (requires tesserocr).
+    Tesseract APIs are not thread-safe, so each thread gets its own set of APIs, one per set of init variables.
+    """
+    name = "tesserocr"
+
+    def __init__(self, tessdata_path: str = None, language: str = "eng"):
+        if tesserocr is None:
+            raise ImportError("tesserocr is not installed")
+        self.tessdata_path = tessdata_path
+        self.language = language
+        self._local = threading.local()
+        self._all_apis = []
+        self._lock = threading.Lock()
+
+    def get_api(self, init_variables: dict):
+        apis = self._local.__dict__.setdefault("apis", {})
+        key = tuple(sorted(init_variables.items()))
+        if key not in apis:
+            kwargs = {"lang": self.language, "init": True, "variables": dict(init_variables)}
+            if self.tessdata_path is not None:
+                kwargs["path"] = self.tessdata_path
+            apis[key] = tesserocr.PyTessBaseAPI(**kwargs)
+            with self._lock:
+                self._all_apis.append(apis[key])
+        return apis[key]
+
+    def prepare(self, image, config: str):
+        psm, variables, init_variables = parse_config(config)
+        api = self.get_api(init_variables)
+        api.Clear()
+        api.SetPageSegMode(tesserocr.PSM.AUTO if psm is None else psm) # Same default as the tesseract CLI
+        # The whitelist has to be reset, otherwise the previous call's whitelist is kept
+        api.SetVariable("tessedit_char_whitelist", "")
+        for name, value in variables.items():
+            api.SetVariable(name, value)
+        image = np.ascontiguousarray(image)
+        channels = 1 if image.ndim == 2 else image.shape[2]
+        api.SetImageBytes(image.tobytes(), image.shape[1], image.shape[0], channels, channels * image.shape[1])
+        return api
+
+    def image_to_string(self, image, config: str = "") -> str:
+        return self.prepare(image, config).GetUTF8Text()
+
+    def image_to_data(self, image, config: str = "") -> list:
+        api = self.prepare(image, config)
+        api.Recognize()
+        words = []
+        iterator = api.GetIterator()
+        level = tesserocr.RIL.WORD
+        for word in tesserocr.iterate_level(iterator, level):
+            text = word.GetUTF8Text(level)
+            box = word.BoundingBox(level)
+            if text is None or text.strip() == "" or box is None:
+                continue
+            left, top, right, bottom = box
+            words.append({"text": text, "conf": word.Confidence(level), "left": left, "top": top, "width": right - left, "height": bottom - top})
+        return words
+
+    def close(self):
+        with self._lock:
+            for api in self._all_apis:
+                api.End()
+            self._all_apis = []
+        self._local = threading.local()
+
+
+def create_engine(backend: str = "auto", tesseract_exe_path: str = ""):
+    """
+    backend is one of "auto", "tesserocr" or "pytesseract". "auto" falls back to pytesseract if tesserocr is unavailable.
+    """
+    if backend == "pytesseract":
+        return PytesseractEngine()
+    tessdata_path = None
+    if tesseract_exe_path != "":
+        tessdata_path = os.path.join(os.path.dirname(tesseract_exe_path), "tessdata")
+    try:
+        engine = TesserocrEngine(tessdata_path)
+        engine.warm_up() # Tesseract only fails to initialize once it is first used
+        return engine
+    except (ImportError, RuntimeError):
+        if backend == "tesserocr":
+            raise
+        return PytesseractEngine()
+
+
+OCR_ENGINE = PytesseractEngine()
+
+
+def get_engine():
+    return OCR_ENGINE
+
+
+def set_engine(engine: OCREngine):
+    global OCR_ENGINE
+    if OCR_ENGINE is not engine:
+        OCR_ENGINE.close()
+    OCR_ENGINE = engine
@@ -0,0 +1,85 @@
+import json
+import os
+import zlib
+import threading
+from collections import OrderedDict
+import numpy as np
+import cv2
+
+
+HASH_SIZE = (64, 16) # (w, h) of the downscaled mask, room names are much wider than they are tall
+
+
+def perceptual_hash(text_mask):
+    """
+    Average hash of a binarized text mask (the output of get_text_mask).
+    Small shifts and noise in the crop map to the same hash, so the same room text can skip OCR.
+    """
+    small = cv2.resize(text_mask, HASH_SIZE, interpolation=cv2.INTER_AREA)
+    bits = small < 128 # Text is black on a white background
+    # The aspect ratio separates short and long names that downscale to similar blobs
+    aspect = round(text_mask.shape[1] / max(text_mask.shape[0], 1), 1)
+    return f"{aspect}:{np.packbits(bits).tobytes().hex()}"
+
+
+class OCRCache:
+    """
+    Bounded LRU of OCR results keyed by the perceptual hash of the text mask.
+    Can be saved to and loaded from a json file so repeat temples skip Tesseract across sessions.
+    Shared by the OCR worker threads, so all access goes through a lock.
+    """
+    def __init__(self, max_size: int = 2048):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False # Entries added since the last load or save
+        self._lock = threading.Lock()
+
+    def key(self, text_mask, config: str):
+        # Different Tesseract configs can read the same mask differently
+        return f"{zlib.crc32(config.encode()):08x}:{perceptual_hash(text_mask)}"
+
+    def get(self, key: str):
+        with self._lock:
+            if key not in self.entries:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+    def put(self, key: str, value: str):
+        with self._lock:
+            if self.entries.get(key) != value:
+                self.dirty = True
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+
+    def load(self, path: str):
+        if not os.path.exists(path):
+            return
+        with open(path) as f:
+            entries = json.load(f)
+        for key, value in entries.items():
+            self.put(key, value)
+        self.dirty = False
+
+    def save(self, path: str):
+        """
+        Only writes the file if entries were added since the last load or save. Returns whether it was written.
+        """
+        with self._lock:
+            if not self.dirty:
+                return False
+            entries = dict(self.entries)
+            self.dirty = False
+        with open(path, "w") as f:
+            json.dump(entries, f)
+        return True
@@ -0,0 +1,100 @@
+import queue
+import threading
+import time
+import traceback
+
+from src.tracing import record_span
+
+
+class Pipeline:
+    """
+    Chain of stages, each running on its own thread with a queue in front of it.
+    A stage is a function that takes an item and returns the item for the next stage, or None to drop it.
+    submit() only puts the item on the first queue, so callers (like the keyboard hook) return immediately.
+    Every stage records a span of the time the item waited in its queue and the time it took to run.
+
+    Requests are coalesced: each new request gets a higher generation, a stage only takes the newest item
+    waiting in its queue, and items from older generations are dropped at the next stage boundary.
+    A stage can also call is_stale() to give up on its item early.
+    """
+    def __init__(self, stages: list):
+        self.names = [name for name, _ in stages]
+        self.functions = [function for _, function in stages]
+        self.queues = [queue.Queue() for _ in stages]
+        self.threads = []
+        self.running = False
+        self.generation = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.threads = [threading.Thread(target=self.run_stage, args=(idx,), name=f"pipeline-{name}", daemon=True) for idx, name in enumerate(self.names)]
+        for thread in self.threads:
+            thread.start()
+
+    def stop(self):
+        if not self.running:
+            return
+        self.running = False
+        for stage_queue in self.queues:
+            stage_queue.put(None) # Wakes up the stage so it can exit
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
+
+    def submit(self, item, stage: int = 0, generation: int = None):
+        """
+        Without a generation, item is a new request and everything older is now stale.
+        Passing the current generation queues background work that never replaces a request.
+        """
+        if generation is None:
+            with self._lock:
+                self.generation += 1
+                generation = self.generation
+        self.queues[stage].put((time.perf_counter_ns(), generation, item))
+
+    def is_stale(self):
+        # True if a newer request was submitted after the item the calling stage is working on
+        return self._local.generation < self.generation
+
+    def take_newest(self, stage_queue):
+        # Blocks for an item, then skips ahead to the newest generation waiting (the first item of it, if there are several)
+        entry = stage_queue.get()
+        while entry is not None:
+            try:
+                newer = stage_queue.get_nowait()
+            except queue.Empty:
+                break
+            if newer is None:
+                return None
+            if newer[1] > entry[1]:
+                entry, newer = newer, entry
+            record_span("coalesced", newer[0], time.perf_counter_ns() - newer[0])
+        return entry
+
+    def run_stage(self, idx: int):
+        name = self.names[idx]
+        function = self.functions[idx]
+        stage_queue = self.queues[idx]
+        while self.running:
+            entry = self.take_newest(stage_queue)
+            if entry is None:
+                break
+            queued, generation, item = entry
+            started = time.perf_counter_ns()
+            record_span(f"{name}_queue_wait", queued, started - queued)
+            self._local.generation = generation
+            if self.is_stale():
+                record_span(f"{name}_dropped", started, 0)
+                continue
+            try:
+                item = function(item)
+            except Exception:
+                traceback.print_exc() # A bad item should not stop the stage
+                item = None
+            record_span(name, started, time.perf_counter_ns() - started)
+            if item is not None and idx + 1 < len(self.functions):
+                self.submit(item, idx + 1, generation)
@@ -0,0 +1,125 @@
+import csv
+import json
+import os
+import time
+from datetime import datetime
+import numpy as np
+
+from src.constants import ROOM_DATA, ROOM_INDEX, ARCHITECTS, SCARABS
+
+
+class PriceStore:
+    """
+    Local stand-in for the trade API. Reads timestamped price snapshots from a folder of JSON/CSV files.
+    Snapshots are kept in memory and the folder is only re-scanned once the ttl (in seconds) has expired.
+
+    JSON snapshots look like {"timestamp": "2024-01-01T12:00:00", "prices": {"LOCUS OF CORRUPTION": 150}}
+    CSV snapshots have the columns timestamp,name,price (a single file can hold several snapshots)
+    """
+    def __init__(self, snapshot_dir: str, ttl: float = 300):
+        self.snapshot_dir = snapshot_dir
+        self.ttl = ttl
+        self.prices = {}
+        self.timestamp = None
+        self.loaded_at = None
+        self._files = {} # path -> (mtime, snapshots), avoids re-parsing unchanged files
+
+    def refresh(self):
+        # Returns True if the snapshots were reloaded
+        if self.loaded_at is not None and time.monotonic() - self.loaded_at < self.ttl:
+            return False
+        self.reload()
+        return True
+
+    def reload(self):
+        snapshots = []
+        files = {}
+        if os.path.isdir(self.snapshot_dir):
+            for filename in sorted(os.listdir(self.snapshot_dir)):
+                path = os.path.join(self.snapshot_dir, filename)
+                extension = os.path.splitext(filename)[1].lower()
+                if extension not in (".json", ".csv"):
+                    continue
+                mtime = os.stat(path).st_mtime
+                if path in self._files and self._files[path][0] == mtime:
+                    files[path] = self._files[path]
+                elif extension == ".json":
+                    files[path] = (mtime, read_json_snapshots(path))
+                else:
+                    files[path] = (mtime, read_csv_snapshots(path))
+                snapshots += files[path][1]
+        self._files = files
+
+        # Newer snapshots overwrite older ones, so items missing from the latest snapshot keep their last known price
+        self.prices = {}
+        self.timestamp = None
+        for timestamp, prices in sorted(snapshots, key=lambda snapshot: snapshot[0]):
+            self.prices.update(prices)
+            self.timestamp = timestamp
+        self.loaded_at = time.monotonic()
+
+    def get(self, name: str, default: float = 0.0):
+        self.refresh()
+        return self.prices.get(name.upper(), default)
+
+    def room_price_vector(self):
+        # Prices aligned with ROOM_DATA.index, so a vector of room counts can be priced with a dot product
+        self.refresh()
+        return np.array([self.prices.get(room, 0.0) for room in ROOM_DATA.index], dtype=np.float64)
+
+
+def parse_timestamp(timestamp):
+    if isinstance(timestamp, (int, float)):
+        return float(timestamp)
+    try:
+        return float(timestamp)
+    except ValueError:
+        return datetime.fromisoformat(timestamp).timestamp()
+
+
+def read_json_snapshots(path):
+    with open(path) as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = [data]
+    return [(parse_timestamp(snapshot["timestamp"]), {name.upper(): float(price) for name, price in snapshot["prices"].items()}) for snapshot in data]
+
+
+def read_csv_snapshots(path):
+    snapshots = {}
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            timestamp = parse_timestamp(row["timestamp"])
+            snapshots.setdefault(timestamp, {})[row["name"].upper()] = float(row["price"])
+    return list(snapshots.items())
+
+
+def apply_prices(store: PriceStore):
+    """
+    Copies the latest snapshot into ROOM_DATA["Price"], ARCHITECTS["Price"] and SCARABS
+    """
+    prices = store.room_price_vector()
+    ROOM_DATA["Price"] = prices
+    tier_3 = ROOM_DATA[ROOM_DATA["Tier"] == 3]
+    ARCHITECTS["Price"] = tier_3.set_index("Theme")["Price"]
+    for scarab in SCARABS:
+        SCARABS[scarab] = store.get(scarab, SCARABS[scarab])
+
+
+def room_vector(rooms):
+    # Counts how many times each room in ROOM_DATA appears, rooms can be any iterable of Room objects
+    output = np.zeros(len(ROOM_DATA), dtype=np.float64)
+    for room in rooms:
+        output[ROOM_INDEX[(room.architect, room.tier)]] += 1
+    return output
+
+
+def expected_value(room_vectors, prices=None):
+    """
+    Expected value over many chronicles. room_vectors is either a single room_vector or a (chronicles x rooms) matrix.
+    Pricing every chronicle is a single matrix-vector product.
+    """
+    if prices is None:
+        prices = ROOM_DATA["Price"].values
+    values = np.asarray(room_vectors) @ prices
+    return float(np.mean(values))
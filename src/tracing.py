@@ -0,0 +1,123 @@
+import json
+import os
+import threading
+import time
+
+
+MAX_TRACE_BYTES = 10 * 1024 * 1024 # The trace file is rolled over to <name>.1 once it is this large
+TRACE_FORMATS = {"chrome": ".json", "jsonl": ".jsonl"}
+
+
+class Span:
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer, name: str, args: dict):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.tracer.emit(self.name, self.start, time.perf_counter_ns() - self.start, self.args)
+        return False
+
+
+class NullSpan:
+    # Returned while tracing is off, so a span costs a single global lookup
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NULL_SPAN = NullSpan()
+
+
+class Tracer:
+    """
+    Writes complete ("X") events of the Chrome trace format, either as a json array that chrome://tracing and
+    Perfetto can open ("chrome"), or one event per line ("jsonl"). Events are written as soon as each span ends.
+    """
+    def __init__(self, path: str, trace_format: str = "chrome", max_bytes: int = MAX_TRACE_BYTES):
+        if trace_format not in TRACE_FORMATS:
+            raise ValueError(f"Trace format must be one of {list(TRACE_FORMATS)}, got {trace_format}")
+        self.path = path
+        self.trace_format = trace_format
+        self.max_bytes = max_bytes
+        self.pid = os.getpid()
+        self._lock = threading.Lock()
+        self.file = None
+        self.open()
+
+    def open(self):
+        self.file = open(self.path, "w", buffering=1)
+        if self.trace_format == "chrome":
+            # The closing bracket is optional in the trace format, so the file stays valid if the program crashes
+            self.file.write("[\n")
+
+    def emit(self, name: str, start_ns: int, duration_ns: int, args: dict):
+        event = {"name": name, "ph": "X", "ts": start_ns // 1000, "dur": duration_ns // 1000, "pid": self.pid, "tid": threading.get_ident()}
+        if args:
+            event["args"] = args
+        line = json.dumps(event, default=str)
+        line += ",\n" if self.trace_format == "chrome" else "\n"
+        with self._lock:
+            if self.file is None:
+                return
+            self.file.write(line)
+            if self.file.tell() > self.max_bytes:
+                self.roll_over()
+
+    def roll_over(self):
+        self.file.close()
+        os.replace(self.path, self.path + ".1")
+        self.open()
+
+    def close(self):
+        with self._lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+
+_TRACER = None
+
+
+def span(name: str, **args):
+    """
+    with span("make_decisions"): ... records how long the block took, if tracing is enabled
+    """
+    if _TRACER is None:
+        return NULL_SPAN
+    return Span(_TRACER, name, args)
+
+
+def record_span(name: str, start_ns: int, duration_ns: int, **args):
+    # For spans that do not fit a with block, like the time an item waited in a queue
+    if _TRACER is not None:
+        _TRACER.emit(name, start_ns, duration_ns, args)
+
+
+def enable_tracing(folder: str, trace_format: str = "chrome", max_bytes: int = MAX_TRACE_BYTES):
+    # One trace file per session
+    global _TRACER
+    disable_tracing()
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, time.strftime("trace-%Y%m%d-%H%M%S") + TRACE_FORMATS[trace_format])
+    _TRACER = Tracer(path, trace_format, max_bytes)
+    return _TRACER
+
+
+def disable_tracing():
+    global _TRACER
+    if _TRACER is not None:
+        _TRACER.close()
+        _TRACER = None
+
+
+def tracing_enabled():
+    return _TRACER is not None
@@ -1,471 +1,1122 @@
-import numpy as np
-import cv2
-from math import floor, ceil
-import pytesseract
-from pathlib import Path
-import matplotlib.pyplot as plt
-import difflib
-import json
-
-from src.temple_layout import ROOMS_PER_LAYER
-from src.constants import ROOM_DATA
-from src.data import ImageParams
-
-
-# Assumes a fixed range of colors for each of the room borders in the temple layout
-ROOM_BORDER_RANGES = {
-    # Old Obstructed (15, 167, 99), (15, 167, 99)
-    'Obstructed': ((15, 167, 99), (15, 167, 99)), # Min / Max for each in HSV
-    # Old Open ((15, 151, 204), (15, 151, 204))
-    # New Open ((9, 45, 157), (66, 151, 206)), Steam screenshot compression causing issues
-    'Open': ((15, 151, 204), (15, 151, 204)),
-    'Chosen': ((17, 126, 240), (27, 166, 255))
-}
-
-# HSV ranges for isolating other elements in the menu
-SUBMENU_OPTION_TEXT_RANGE = ((0, 0, 53), (30, 17, 127))
-SUBMENU_CHOSEN_TEXT_RANGE = ((71, 81, 112), (73, 88, 228))
-INC_REM_TEXT_RANGE = ((0, 0, 104), (0, 4, 254))
-ROOM_TEXT_RANGE = ((58, 64, 41), (74, 112, 228))
-CONNECTION_RANGE = ((30, 43, 120), (30, 140, 255))
-
-TESS_CONFIG = '-c tessedit_char_whitelist="01234567890ABCDEFGHIJKLMNOPQRSTUVWXYZ abcdefghijklmnopqrstuvwxyz"'
-
-WORDS = [
-    '1', '2', '3', '4', '5', '6', '7', '8', '9', '10', '11', '12',
-    'ANTECHAMBER', 'APEX OF ATZOATL', 'BANQUET HALL', 'CELLAR', 'CHASM', 'CLOISTER',
-    'ENTRANCE', 'HALLS', 'PASSAGEWAYS', 'PITS', 'TOMBS', 'TUNNELS', 'SACRIFICIAL CHAMBER',
-    'HALL OF OFFERINGS', 'APEX OF ASCENSION', "ARMOURER'S WORKSHOP", 'ARMOURY', 'CHAMBER OF IRON',
-    "JEWELLER'S WORKSHOP", 'JEWELLERY FORGE', 'GLITTERING HALLS', 'GUARDHOUSE', 'BARRACKS', 'HALL OF WAR',
-    'HATCHERY', 'AUTOMATON LAB', 'HYBRIDISATION CHAMBER', 'VAULT', 'TREASURY', 'WEALTH OF THE VAAL',
-    'POOLS OF RESTORATION', 'SANCTUM OF VITALITY', 'SANCTUM OF IMMORTALITY', 'EXPLOSIVES ROOM',
-    'DEMOLITION LAB', 'SHRINE OF UNMAKING', 'WORKSHOP', 'ENGINEERING DEPARTMENT', 'FACTORY',
-    'STORAGE ROOM', 'WAREHOUSES', 'MUSEUM OF ARTEFACTS', 'TRAP WORKSHOP', 'TEMPLE DEFENSE WORKSHOP',
-    'DEFENSE RESEARCH LAB', 'HALL OF METTLE', 'HALL OF HEROES', 'HALL OF LEGENDS', 'CORRUPTION CHAMBER',
-    'CATALYST OF CORRUPTION', 'LOCUS OF CORRUPTION', 'FLAME WORKSHOP', 'OMNITECT FORGE', 'CRUCIBLE OF FLAME',
-    'SHRINE OF EMPOWERMENT', 'SANCTUM OF UNITY', 'TEMPLE NEXUS', 'POISON GARDEN', 'CULTIVAR CHAMBER',
-    'TOXIC GROVE', 'SPARRING ROOM', 'ARENA OF VALOUR', 'HALL OF CHAMPIONS', 'TEMPEST GENERATOR',
-    'HURRICANE ENGINE', 'STORM OF CORRUPTION', 'TORMENT CELLS', 'TORTURE CAGES', "SADIST'S DEN",
-    "SURVEYOR'S STUDY", 'OFFICE OF CARTOGRAPHY', 'ATLAS OF WORLDS', 'ROYAL MEETING ROOM', 'HALL OF LORDS',
-    'THRONE OF ATZIRI', 'LIGHTNING WORKSHOP', 'OMNITECT REACTOR PLANT', 'CONDUIT OF LIGHTNING',
-    "GEMCUTTER'S WORKSHOP", 'DEPARTMENT OF THAUMATURGY', "DORYANI'S INSTITUTE", 'STRONGBOX CHAMBER',
-    'HALL OF LOCKS', 'COURT OF SEALED DEATH', 'SPLINTER RESEARCH LAB', 'BREACH CONTAINMENT CENTER', 'HOUSE OF THE OTHERS']
-
-
-def post_ocr_correction(raw_ocr):
-    """
-    Treating OCR output as raw data, requires some simple corrections
-    """
-    output = raw_ocr.upper()
-    output = output.replace('\n', ' ') # Removing newlines between room words
-    output = output.replace(')', '') # Removing closing ) from incursion submenu
-    output = difflib.get_close_matches(output, WORDS, n=1)[0] # Spellcheck, may want to cache results?
-    return output
-
-
-def process_screenshot(screenshot, image_params, previous = None, attempts = 0):
-    if screenshot.shape[-1] == 4: # Alpha channel present
-        screenshot = np.array(screenshot)[..., :-1] # Removing alpha channel
-    hsv_image = screenshot[..., ::-1] # BGR to RGB
-    # screenshot = crop_to_incursion_menu(screenshot) # Don't think this is needed anymore
-    hsv_image = cv2.cvtColor(hsv_image, cv2.COLOR_RGB2HSV)
-    if image_params.cached is False or attempts == 1:
-        image_params = get_image_parameters(hsv_image)
-    try: # If the cache fails for some reason
-        return image_params, read_image_using_saved_params(hsv_image, image_params, previous)
-    except ValueError: # Try from scratch
-        if attempts == 1:
-            raise ValueError("Failed to process screenshot.")
-        return process_screenshot(screenshot, image_params, attempts = attempts + 1)
-
-
-def get_room_boxes(hsv_menu_image):
-    """
-    Function assumes that the room border color is fixed with respect to its status (Open/Obstructed/Chosen).
-    Identifies the room boundaries in the temple by checking if the colors are within range for each room status.
-    Using contours, filters out boxes that are too small, or that are children of another box.
-    Remaining boxes are kept and stored in a list.
-    """
-    mask = np.full((hsv_menu_image.shape[0], hsv_menu_image.shape[1]), 0, dtype=np.uint8)
-    for room_status, border_range in ROOM_BORDER_RANGES.items():
-        mask = cv2.add(mask, cv2.inRange(hsv_menu_image, border_range[0], border_range[1]))
-
-    contours, hierarchy = cv2.findContours(mask, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
-    boundingBoxes = [cv2.boundingRect(contour) for contour in contours]
-    
-    room_boxes = []
-    idx = -1
-    # Assuming no contour will be larger than the rooms, we use the max
-    room_w_cutoff = 0.8 * max(box[2] for box in boundingBoxes)
-    room_h_cuttof = 0.8 * max(box[3] for box in boundingBoxes)
-    for bounding_box in boundingBoxes:
-        idx += 1
-        if bounding_box[2] < room_w_cutoff or bounding_box[3] < room_h_cuttof or hierarchy[0, idx, 3] != -1:
-            continue
-        room_boxes.append(bounding_box)
-
-    if len(room_boxes) != 13:
-        # Add error logging stuff here
-        raise ValueError(f"Expected 13 room boxes, got {len(room_boxes)}")
-    
-    return room_boxes
-
-
-def get_image_parameters(hsv_image):
-    output = {
-        "room_details": {},
-        "slots_to_xy": {},
-        "incursion_menu_rect": {},
-        "incursions_remaining_rect": {}
-    }
-
-    # Rectangles that define the outlines of each room
-    room_boxes = get_room_boxes(hsv_image) # A list of (x, y, w, h) tuples
-    
-    # Average room dimensions (excluding the chosen room)
-    average_room_height = ceil((sum(room[3] for room in room_boxes) - min(room[3] for room in room_boxes)) / (len(room_boxes) - 1))
-    average_room_width = ceil((sum(room[2] for room in room_boxes) - min(room[2] for room in room_boxes)) / (len(room_boxes) - 1))
-
-    # Average gap between normal (non-chosen) rooms
-    horizontal_gap = abs(room_boxes[-3][0] - room_boxes[-2][0]) - average_room_width
-    if average_room_height - room_boxes[-3][3] > 1 or average_room_height - room_boxes[-2][3] > 1: # Checking if either room in layer 3 is chosen
-        horizontal_gap = abs(room_boxes[-5][0] - room_boxes[-4][0]) - average_room_width # Using rooms 2F0 and 2F1 instead of 3F0 and 3F1 for accurate gap
-    vertical_gap = min(room_boxes[-2][1], room_boxes[-3][1]) - room_boxes[-1][1] - average_room_height # Provides consistency if 3F0 or 3F1 are chosen
-
-    output["room_details"]["room_width"] = average_room_width
-    output["room_details"]["room_height"] = average_room_height
-    output["room_details"]["horizontal_gap"] = horizontal_gap
-    output["room_details"]["vertical_gap"] = vertical_gap
-    
-    # Important reference points/lengths for the temple
-    temple_layer_h = average_room_height + vertical_gap
-    temple_apex_y = min(room[1] for room in room_boxes) - floor(vertical_gap / 2) # Apex y is the minumum y for the temple
-    layer_room_w = average_room_width + horizontal_gap
-    temple_leftmost_x = min(room[0] for room in room_boxes) - floor(horizontal_gap / 2) # x value of furthest left room
-    layer_leftmost_x = temple_leftmost_x
-    
-    prev_layer = -1
-    for room in room_boxes:
-        x, y, w, h = room
-        room_layer = 4 - round((y - temple_apex_y) / temple_layer_h)
-        if room_layer == prev_layer + 1:
-            prev_layer = room_layer
-            layer_leftmost_x = temple_leftmost_x + (4 - ROOMS_PER_LAYER[room_layer]) * (1 / 2) * (average_room_width + horizontal_gap)
-
-        room_diag = ROOMS_PER_LAYER[room_layer] - round((x - layer_leftmost_x) / layer_room_w) - 1 + (room_layer == 0)
-        room_slot = f"{room_layer}F{room_diag}"
-        
-        # The chosen room has a smaller box than the typical room, so it is easy to catch here
-        if average_room_height - h > 1:
-            y -= ceil((average_room_height - h) / 2)
-            # x -= ceil((average_room_width - w) / 2) # Assume this is not needed
-        
-        output["slots_to_xy"][room_slot] = {}
-        output["slots_to_xy"][room_slot]["x"] = x
-        output["slots_to_xy"][room_slot]["y"] = y 
-
-    # Reference points/lengths for the incursion submenu (top right corner of Temple screen)
-    output["incursion_menu_rect"]["x"] = floor(room_boxes[-1][0] + (3 / 2) * average_room_width + horizontal_gap) # Fixed distance from Apex x
-    output["incursion_menu_rect"]["y"] = ceil(average_room_height / 2)
-    output["incursion_menu_rect"]["w"] = floor(0.65 * (len(hsv_image[0]) - output["incursion_menu_rect"]["x"])) # Difference from max x and submenu x
-    output["incursion_menu_rect"]["h"] = room_boxes[-1][1] + ceil((3 / 2) * average_room_height) + vertical_gap # Fixed distance from Apex y, since this starts at y = 0
-
-    # Reference points/lengths for the incursions remaining (near the bottom of the Temple screen)
-    output["incursions_remaining_rect"]["x"] = room_boxes[-1][0] - horizontal_gap
-    output["incursions_remaining_rect"]["y"] = room_boxes[-1][1] + 5 * (average_room_height + vertical_gap)
-    output["incursions_remaining_rect"]["w"] = 2 * horizontal_gap + average_room_width
-    output["incursions_remaining_rect"]["h"] = average_room_height
-
-    output["cached"] = True
-
-    return ImageParams.from_dict(output)
-
-
-def read_image_using_saved_params(hsv_image, cache, previous = None):
-    # TODO: Image may not contain this, what to do then?
-    remaining_x = cache.incursions_remaining_rect["x"]
-    remaining_y = cache.incursions_remaining_rect["y"]
-    remaining_w = cache.incursions_remaining_rect["w"]
-    remaining_h = cache.incursions_remaining_rect["h"]
-    incursions_remaining_hsv = hsv_image[remaining_y:remaining_y + remaining_h, remaining_x:remaining_x + remaining_w]
-    incursions_remaining = read_incursions_remaining(incursions_remaining_hsv)
-    
-    continuous = False
-    if previous is not None:
-        continuous = (previous["remaining"] - incursions_remaining) == 1
-
-    # TODO: What if the image doesn't have these?
-    incursion_x = cache.incursion_menu_rect["x"]
-    incursion_y = cache.incursion_menu_rect["y"]
-    incursion_w = cache.incursion_menu_rect["w"]
-    incursion_h = cache.incursion_menu_rect["h"]
-    incursion_menu_hsv = hsv_image[incursion_y:incursion_y + incursion_h, incursion_x:incursion_x + incursion_w]
-    incursion_data = read_incursion_submenu(incursion_menu_hsv)
-
-    average_room_width = cache.room_details["room_width"]
-    average_room_height = cache.room_details["room_height"]
-    horizontal_gap = cache.room_details["horizontal_gap"]
-    vertical_gap = cache.room_details["vertical_gap"]
-    directions = {-1: "/", 0: "—", 1: "\\"}
-    
-    layout_data = {}
-    for slot in cache.slots_to_xy:
-        if continuous and slot != str(previous["slot"]):
-            continue
-        layout_data[slot] = {"Name": None, "Connections": []}
-        layer = int(slot[0])
-        diag = int(slot[-1])
-        x = cache.slots_to_xy[slot]["x"]
-        y = cache.slots_to_xy[slot]["y"]
-        room_image = hsv_image[y + round(0.4 * average_room_height):y + average_room_height, x:x + average_room_width]
-        layout_data[slot]["Name"] = read_room_text(room_image)
-        
-        # Only checks for connections on the left-side of the room. This ensures each connection is only read once.
-        left_connection_hsv = hsv_image[y - vertical_gap:y + average_room_height + vertical_gap, x - horizontal_gap:x + round(average_room_width / 2)]
-        left_connection_hsv[vertical_gap:average_room_height + vertical_gap, horizontal_gap:round(average_room_width / 2) + horizontal_gap] = (0, 0, 0)
-        connection_ys = [0, vertical_gap, average_room_height + vertical_gap, average_room_height + 2 * vertical_gap]
-        direction = -2
-        for region_idx in range(len(connection_ys) - 1):
-            region_idx = len(connection_ys) - region_idx - 1
-            direction += 1
-            if connection_present(left_connection_hsv[connection_ys[region_idx - 1]:connection_ys[region_idx]]):
-                layout_data[slot]["Connections"].append(directions[direction])
-        
-        # Need to check the right side if only reading one slot
-        if continuous:
-            right_connection_hsv = hsv_image[y - vertical_gap:y + average_room_height + vertical_gap, x + round(average_room_width / 2):x + average_room_width + horizontal_gap]
-            right_connection_hsv[vertical_gap:average_room_height + vertical_gap, horizontal_gap:round(average_room_width / 2) + horizontal_gap] = (0, 0, 0)
-            connection_ys = [0, vertical_gap, average_room_height + vertical_gap, average_room_height + 2 * vertical_gap]
-            direction = -2
-            for region_idx in range(len(connection_ys) - 1):
-                region_idx = len(connection_ys) - region_idx - 1
-                direction += 1
-                if connection_present(right_connection_hsv[connection_ys[region_idx - 1]:connection_ys[region_idx]]):
-                    layout_data[slot]["Connections"].append("r" + directions[direction])
-
-    output = {"layout": layout_data, "incursion": incursion_data, "remaining": incursions_remaining}
-    
-    return output
-
-
-def get_text_mask(hsv_image, text_hsv_range, reduce_noise=False, debug=False):
-    """
-    Using a text_hsv_range, isolates text in the image. Performs morphological operations to enhance readability and reduce noise.
-    """
-    
-    font_mask = cv2.inRange(hsv_image, text_hsv_range[0], text_hsv_range[1])
-    x, y, w, h = cv2.boundingRect(font_mask)
-    font_mask = font_mask[y:y+h, x:x+w]
-    # Some rooms have the font colors in their art, which appear as noise
-    # Opening reduces the severity of that noise
-    opening_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (2, 2))
-    opening = cv2.morphologyEx(font_mask, cv2.MORPH_OPEN, opening_kernel)
-    
-    # Dilation along this kernel blends the text together into blobs
-    dilation_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 3))
-    dilation = cv2.dilate(opening, dilation_kernel, iterations=2)
-
-    # For debugging / testing
-    # fig, axs = plt.subplots(2, 2, figsize=(10, 6), layout='constrained')
-    # axs[0, 1].imshow(dilation, cmap='gray')
-
-    # Trimming some blobs that are obviously too small for any text
-    # May not ultimately be needed with the following step
-    if reduce_noise is True:
-        cnts, H = cv2.findContours(dilation, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        for c in cnts:
-            box_x, box_y, box_w, box_h = cv2.boundingRect(c)
-            ar = box_w / float(box_h)
-            # Could also do an aspect ratio check (smallest acceptable would be PITS)
-            if box_h < 0.2 * h:
-                cv2.drawContours(dilation, [c], -1, (0, 0, 0), -1)
-    
-    # Scanning from the bottom of the region until a cutoff is reached
-    # Scanning will stop after both conditions are met:
-    # 1) Reaching an empty row (This assumes noise blobs do not touch the text blob)
-    # 2) Accounting for 70% of the white pixels in the region (This assumes the text is primarily at the bottom)
-    running_total = 0
-    all_pixels = np.sum(dilation / 255)
-    for row_cutoff in range(len(dilation)):
-        row_cutoff = len(dilation) - row_cutoff - 1
-        row_sum = np.sum(dilation[row_cutoff] / 255)
-        running_total += row_sum
-        if row_sum == 0 and running_total >= 0.7 * all_pixels:
-            break
-    
-    # Only keep original text within the blobs in the cutoff region
-    result = 255 - cv2.bitwise_and(dilation[row_cutoff:], font_mask[row_cutoff:])
-    
-    # Padding the text with empty space helps remove some edge-errors
-    border_size = 10
-    result = cv2.copyMakeBorder(
-        result,
-        top=border_size,
-        bottom=border_size,
-        left=border_size,
-        right=border_size,
-        borderType=cv2.BORDER_CONSTANT,
-        value=[255, 255, 255]
-    )
-
-    result = cv2.resize(result, None, fx=2, fy=2, interpolation=cv2.INTER_NEAREST)
-
-    # For debugging / testing
-    if debug:
-        fig, axs = plt.subplots(2, 2, figsize=(10, 6), layout='constrained')
-        axs[0, 0].imshow(hsv_image)
-        axs[0, 1].imshow(opening, cmap='gray')
-        axs[1, 0].imshow(dilation, cmap='gray')
-        axs[1, 1].imshow(result, cmap='gray')
-        plt.show()
-    return result
-
-
-def read_incursion_submenu(hsv_incursion_submenu):
-    """
-    The incursion submenu is the upper-right corner of the temple menu, which details the different room options for that incursion.
-    Typically, going right (up) will upgrade the current room (if possible), while going left will swap to a tier 1 room of a different theme.
-    """
-    left_region = get_text_mask(hsv_incursion_submenu[:, :floor(len(hsv_incursion_submenu[0]) / 2)], SUBMENU_OPTION_TEXT_RANGE)
-    right_region = get_text_mask(hsv_incursion_submenu[:, floor(len(hsv_incursion_submenu[0]) / 2):], SUBMENU_OPTION_TEXT_RANGE)
-    top_region = get_text_mask(hsv_incursion_submenu[:floor(len(hsv_incursion_submenu) / 5), :], SUBMENU_CHOSEN_TEXT_RANGE)
-
-    # Split by 'E TO ' to capture both 'CHANGE TO ' and 'UPGRADE TO '
-    left_ocr = pytesseract.image_to_string(left_region, config='-c tessedit_char_whitelist="ABCDEFGHIJKLMNOPQRSTUVWXYZ abcdefghijklmnopqrstuvwxyz()\'" --psm 6')
-    left_ocr = left_ocr.strip().replace('\n', ' ').split('E TO ')[1]
-    left_output = post_ocr_correction(left_ocr)
-
-    right_ocr = pytesseract.image_to_string(right_region, config='-c tessedit_char_whitelist="ABCDEFGHIJKLMNOPQRSTUVWXYZ abcdefghijklmnopqrstuvwxyz()\'"--psm 6')
-    right_ocr = right_ocr.strip().replace('\n', ' ').split('E TO ')[1]
-    right_output = post_ocr_correction(right_ocr)
-
-    top_ocr = pytesseract.image_to_string(top_region, config='-c tessedit_char_whitelist="ABCDEFGHIJKLMNOPQRSTUVWXYZ abcdefghijklmnopqrstuvwxyz()\'"--psm 6')
-    top_ocr = top_ocr.strip().replace('\n', ' ')
-    top_output = post_ocr_correction(top_ocr)
-
-    return  {"room": top_output, "left_option": left_output, "right_option": right_output}
-
-
-def read_incursions_remaining(hsv_incursions_remaining):
-    """
-    Reading X from "X Incursions Remaining"
-    """
-    text_mask = get_text_mask(hsv_incursions_remaining, INC_REM_TEXT_RANGE)
-    inc_rem = pytesseract.image_to_string(text_mask, config='-c tessedit_char_whitelist="0123456789ACEGIMNORSU acegimnorsu" --psm 7').split(' ')[0]
-    
-    inc_rem = post_ocr_correction(inc_rem)
-    
-    try:
-        return int(inc_rem)
-    except ValueError:
-        # Add logging here
-        raise ValueError(f"Incursions remaining was not an integer, got {inc_rem}")
-
-
-def read_room_text(hsv_room, debug=False):
-    text_mask = get_text_mask(hsv_room, ROOM_TEXT_RANGE, reduce_noise=True, debug=False)
-
-    ocr = pytesseract.image_to_string(text_mask, config='-c tessedit_char_whitelist="ABCDEFGHIJKLMNOPQRSTUVWXYZ abcdefghijklmnopqrstuvwxyz()\'" --psm 6 --user-words "C:\\Users\\andyw\\Documents\\Python Scripts\\IncursionReader\\TessConfig\\eng.user-words" --user-patterns "C:\\Users\\andyw\\Documents\\Python Scripts\\IncursionReader\\TessConfig\\eng.user-patterns"').strip()
-    output = post_ocr_correction(ocr)
-
-    if output == '':
-        plt.imshow(text_mask)
-        plt.show()
-    
-    if output not in ROOM_DATA.index:
-        # read_room_text(hsv_room, debug=True)
-        # Add logging here
-        raise ValueError(f"Room not found, got {output} instead")
-
-    return output
-
-
-def connection_present(connection_hsv):
-    connection_mask = cv2.inRange(connection_hsv, CONNECTION_RANGE[0], CONNECTION_RANGE[1])
-    return 255 in connection_mask
-
-
-# def shortcut(screenshot, slot):
-#     with open(r"src\image_params.json") as f:
-#         cache = json.load(f)
-    
-#     slot_data = {"Name": "", "Connections": []}
-#     layer = int(slot[0])
-#     diag = int(slot[-1])
-#     directions = {-1: "/", 0: "—", 1: "\\"}
-    
-#     if screenshot.shape[-1] == 4: # Alpha channel present
-#         screenshot = np.array(screenshot)[..., :-1] # Removing alpha channel
-#     screenshot = screenshot[..., ::-1] # BGR to RGB
-#     # screenshot = crop_to_incursion_menu(screenshot) # Don't think this is needed anymore
-#     hsv_image = cv2.cvtColor(screenshot, cv2.COLOR_RGB2HSV)
-#     # Need to make it read the room text and check connections twice and read the submenu and remaining
-#     average_room_width = cache["room_details"]["room_width"]
-#     average_room_height = cache["room_details"]["room_height"]
-#     horizontal_gap = cache["room_details"]["horizontal_gap"]
-#     vertical_gap = cache["room_details"]["vertical_gap"]
-#     x = cache["slots_to_xy"][slot]["x"]
-#     y = cache["slots_to_xy"][slot]["y"]
-#     room_image = hsv_image[y + round(0.4 * average_room_height):y + average_room_height, x:x + average_room_width]
-#     slot_data["Name"] = read_room_text(room_image)
-
-#     room_connection_hsv = hsv_image[y - vertical_gap:y + average_room_height + vertical_gap, x - horizontal_gap:x + round(average_room_width / 2)]
-#     room_connection_hsv[vertical_gap:average_room_height + vertical_gap, horizontal_gap:round(average_room_width / 2) + horizontal_gap] = (0, 0, 0)
-#     connection_ys = [0, vertical_gap, average_room_height + vertical_gap, average_room_height + 2 * vertical_gap]
-#     direction = -2
-#     for region_idx in range(len(connection_ys) - 1):
-#         region_idx = len(connection_ys) - region_idx - 1
-#         direction += 1
-#         # Only checks for a connection if there is another room to connect to in that direction from the current room
-#         # Ex: There cannot be rooms below the lowest layer, so that direction is not checked for layer 0
-#         if ((direction == -1 and layer > 0 and diag < 3) or \
-#             (direction == 0 and diag < ROOMS_PER_LAYER[layer] - 1 + (layer == 0)) or \
-#             (direction == 1 and (layer == 0 or diag < ROOMS_PER_LAYER[layer] - 1))) and \
-#             connection_present(room_connection_hsv[connection_ys[region_idx - 1]:connection_ys[region_idx]]):
-#                 slot_data["Connections"].append(directions[direction])
-
-#     for region_idx in range(len(connection_ys) - 1):
-#         region_idx = len(connection_ys) - region_idx - 1
-#         direction += 1
-#         # Only checks for a connection if there is another room to connect to in that direction from the current room
-#         # Ex: There cannot be rooms below the lowest layer, so that direction is not checked for layer 0
-#         if ((direction == -1 and layer > 0 and diag < 3) or \
-#             (direction == 0 and diag < ROOMS_PER_LAYER[layer] - 1 + (layer == 0)) or \
-#             (direction == 1 and (layer == 0 or diag < ROOMS_PER_LAYER[layer] - 1))) and \
-#             connection_present(room_connection_hsv[connection_ys[region_idx - 1]:connection_ys[region_idx]]):
-#                 slot_data["Connections"].append(directions[direction])
-    
-#     # TODO: What if the image doesn't have these?
-#     incursion_x = cache["incursion_menu_rect"]["x"]
-#     incursion_y = cache["incursion_menu_rect"]["y"]
-#     incursion_w = cache["incursion_menu_rect"]["w"]
-#     incursion_h = cache["incursion_menu_rect"]["h"]
-#     incursion_menu_hsv = hsv_image[incursion_y:incursion_y + incursion_h, incursion_x:incursion_x + incursion_w]
-#     incursion_data = read_incursion_submenu(incursion_menu_hsv)
-
-#     # TODO: Or these?
-#     remaining_x = cache["incursions_remaining_rect"]["x"]
-#     remaining_y = cache["incursions_remaining_rect"]["y"]
-#     remaining_w = cache["incursions_remaining_rect"]["w"]
-#     remaining_h = cache["incursions_remaining_rect"]["h"]
-#     incursions_remaining_hsv = hsv_image[remaining_y:remaining_y + remaining_h, remaining_x:remaining_x + remaining_w]
-#     incursions_remaining = read_incursions_remaining(incursions_remaining_hsv)
-
-#     output = {"slot": slot_data, "incursion": incursion_data, "remaining": incursions_remaining}
-
-
-if __name__ == "__main__":
-    # reset_saved_params()
-    import time
-    image = cv2.imread(r"tests\Images\CompleteTemple.png")
-    start = time.time()
-    output = process_screenshot(image)
-    end = time.time()
-    print(end - start)
-    print(output)
-    start = time.time()
-    slot = "0F1"
-    output = process_screenshot(image, {"slot": "0F1", "remaining": 2})
-    end = time.time()
-    print(end - start)
-    print(output)
+import numpy as np
+import cv2
+from math import floor, ceil
+import pytesseract
+from pathlib import Path
+import matplotlib.pyplot as plt
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+
+from src.temple_layout import ROOMS_PER_LAYER, ALL_SLOTS
+from src.constants import ROOM_DATA
+from src.data import ImageParams
+from src.ocr_cache import OCRCache
+from src.ocr import get_engine
+from src.classifier import TemplateClassifier
+from src.matcher import FuzzyMatcher
+from src.frame_diff import FrameHistory
+from src.tracing import span
+
+
+# Assumes a fixed range of colors for each of the room borders in the temple layout
+ROOM_BORDER_RANGES = {
+    # Old Obstructed (15, 167, 99), (15, 167, 99)
+    'Obstructed': ((15, 167, 99), (15, 167, 99)), # Min / Max for each in HSV
+    # Old Open ((15, 151, 204), (15, 151, 204))
+    # New Open ((9, 45, 157), (66, 151, 206)), Steam screenshot compression causing issues
+    'Open': ((15, 151, 204), (15, 151, 204)),
+    'Chosen': ((17, 126, 240), (27, 166, 255))
+}
+
+# HSV ranges for isolating other elements in the menu
+SUBMENU_OPTION_TEXT_RANGE = ((0, 0, 53), (30, 17, 127))
+SUBMENU_CHOSEN_TEXT_RANGE = ((71, 81, 112), (73, 88, 228))
+INC_REM_TEXT_RANGE = ((0, 0, 104), (0, 4, 254))
+ROOM_TEXT_RANGE = ((58, 64, 41), (74, 112, 228))
+CONNECTION_RANGE = ((30, 43, 120), (30, 140, 255))
+
+# Every range gets one bit of the pixel class image (see classify_pixels), so there can be at most 8
+PIXEL_CLASS_RANGES = list(ROOM_BORDER_RANGES.values()) + [SUBMENU_OPTION_TEXT_RANGE, SUBMENU_CHOSEN_TEXT_RANGE, INC_REM_TEXT_RANGE, ROOM_TEXT_RANGE, CONNECTION_RANGE]
+PIXEL_CLASS_BITS = {hsv_range: 1 << idx for idx, hsv_range in enumerate(PIXEL_CLASS_RANGES)}
+_PIXEL_LUT = None
+_PIXEL_LUT_LOCK = threading.Lock()
+
+TESS_CONFIG = '-c tessedit_char_whitelist="01234567890ABCDEFGHIJKLMNOPQRSTUVWXYZ abcdefghijklmnopqrstuvwxyz"'
+ROOM_TESS_CONFIG = '-c tessedit_char_whitelist="ABCDEFGHIJKLMNOPQRSTUVWXYZ abcdefghijklmnopqrstuvwxyz()\'" --psm 6 --user-words "C:\\Users\\andyw\\Documents\\Python Scripts\\IncursionReader\\TessConfig\\eng.user-words" --user-patterns "C:\\Users\\andyw\\Documents\\Python Scripts\\IncursionReader\\TessConfig\\eng.user-patterns"'
+SUBMENU_TESS_CONFIG = '-c tessedit_char_whitelist="ABCDEFGHIJKLMNOPQRSTUVWXYZ abcdefghijklmnopqrstuvwxyz()\'" --psm 6'
+REMAINING_TESS_CONFIG = '-c tessedit_char_whitelist="0123456789ACEGIMNORSU acegimnorsu" --psm 7'
+# tesserocr keeps one API per thread for each set of init variables (ROOM_TESS_CONFIG has its own), warm_up_ocr_workers creates all of them
+WARM_UP_TESS_CONFIGS = [ROOM_TESS_CONFIG, SUBMENU_TESS_CONFIG, REMAINING_TESS_CONFIG]
+
+# Blank rows between text masks when stitching them into one page for batch OCR
+BATCH_SEPARATOR = 20
+# Empty rows between crops stacked by get_text_masks, more than the morphology in get_text_mask can reach
+TEXT_MASK_STACK_GAP = 8
+
+WORDS = [
+    '1', '2', '3', '4', '5', '6', '7', '8', '9', '10', '11', '12',
+    'ANTECHAMBER', 'APEX OF ATZOATL', 'BANQUET HALL', 'CELLAR', 'CHASM', 'CLOISTER',
+    'ENTRANCE', 'HALLS', 'PASSAGEWAYS', 'PITS', 'TOMBS', 'TUNNELS', 'SACRIFICIAL CHAMBER',
+    'HALL OF OFFERINGS', 'APEX OF ASCENSION', "ARMOURER'S WORKSHOP", 'ARMOURY', 'CHAMBER OF IRON',
+    "JEWELLER'S WORKSHOP", 'JEWELLERY FORGE', 'GLITTERING HALLS', 'GUARDHOUSE', 'BARRACKS', 'HALL OF WAR',
+    'HATCHERY', 'AUTOMATON LAB', 'HYBRIDISATION CHAMBER', 'VAULT', 'TREASURY', 'WEALTH OF THE VAAL',
+    'POOLS OF RESTORATION', 'SANCTUM OF VITALITY', 'SANCTUM OF IMMORTALITY', 'EXPLOSIVES ROOM',
+    'DEMOLITION LAB', 'SHRINE OF UNMAKING', 'WORKSHOP', 'ENGINEERING DEPARTMENT', 'FACTORY',
+    'STORAGE ROOM', 'WAREHOUSES', 'MUSEUM OF ARTEFACTS', 'TRAP WORKSHOP', 'TEMPLE DEFENSE WORKSHOP',
+    'DEFENSE RESEARCH LAB', 'HALL OF METTLE', 'HALL OF HEROES', 'HALL OF LEGENDS', 'CORRUPTION CHAMBER',
+    'CATALYST OF CORRUPTION', 'LOCUS OF CORRUPTION', 'FLAME WORKSHOP', 'OMNITECT FORGE', 'CRUCIBLE OF FLAME',
+    'SHRINE OF EMPOWERMENT', 'SANCTUM OF UNITY', 'TEMPLE NEXUS', 'POISON GARDEN', 'CULTIVAR CHAMBER',
+    'TOXIC GROVE', 'SPARRING ROOM', 'ARENA OF VALOUR', 'HALL OF CHAMPIONS', 'TEMPEST GENERATOR',
+    'HURRICANE ENGINE', 'STORM OF CORRUPTION', 'TORMENT CELLS', 'TORTURE CAGES', "SADIST'S DEN",
+    "SURVEYOR'S STUDY", 'OFFICE OF CARTOGRAPHY', 'ATLAS OF WORLDS', 'ROYAL MEETING ROOM', 'HALL OF LORDS',
+    'THRONE OF ATZIRI', 'LIGHTNING WORKSHOP', 'OMNITECT REACTOR PLANT', 'CONDUIT OF LIGHTNING',
+    "GEMCUTTER'S WORKSHOP", 'DEPARTMENT OF THAUMATURGY', "DORYANI'S INSTITUTE", 'STRONGBOX CHAMBER',
+    'HALL OF LOCKS', 'COURT OF SEALED DEATH', 'SPLINTER RESEARCH LAB', 'BREACH CONTAINMENT CENTER', 'HOUSE OF THE OTHERS']
+
+# Subsets of WORDS that can appear in each part of the menu
+DIGIT_WORDS = frozenset(WORDS[:12])
+ROOM_WORDS = frozenset(WORDS[12:])
+OPTION_WORDS = frozenset(ROOM_DATA.index[ROOM_DATA["Tier"] > 0]) # Incursion options are always tiered rooms
+
+MATCHER = FuzzyMatcher(WORDS)
+
+# Recognized text for previously seen text masks, shared by all OCR calls
+OCR_CACHE = OCRCache()
+
+# Closed-vocabulary recognizers for the text masks, OCR is only used when these are not confident
+ROOM_CLASSIFIER = TemplateClassifier()
+SUBMENU_OPTION_CLASSIFIER = TemplateClassifier()
+SUBMENU_ROOM_CLASSIFIER = TemplateClassifier()
+DIGIT_CLASSIFIER = TemplateClassifier(feature_size=(16, 24)) # Single digits of the incursions remaining
+CLASSIFIERS = {"room": ROOM_CLASSIFIER, "submenu_option": SUBMENU_OPTION_CLASSIFIER, "submenu_room": SUBMENU_ROOM_CLASSIFIER, "digit": DIGIT_CLASSIFIER}
+ENROLL_SIMILARITY = 0.9 # How closely the raw OCR has to match the corrected word to be used as a template
+CANDIDATE_MIN_SCORE = 0.75 # Spellchecking against the candidates from the tracked temple has to score this, or every word is tried
+WORD_GAP = 0.25 # A gap between glyphs wider than this fraction of the text height separates two words
+
+# Every door in the temple, keyed by (slot, neighbour) where neighbour is to the left of slot, with the direction from slot
+DOORS = {}
+for _slot in ALL_SLOTS:
+    for _direction in ["/", "—", "\\"]:
+        if _slot.get_adjacent_slot(_direction) in ALL_SLOTS:
+            DOORS[(str(_slot), str(_slot.get_adjacent_slot(_direction)))] = _direction
+DOOR_LIST = list(DOORS) # Bit order of the door bitmask
+# The same door seen from the neighbour, which has it on its right side
+RIGHT_SIDE_DIRECTIONS = {"/": "\\", "—": "—", "\\": "/"}
+_DOOR_SAMPLERS = {}
+
+# Results of the last frame, regions whose text has not changed since are not read again
+FRAME_HISTORY = FrameHistory()
+# Text colors FRAME_HISTORY compares for each kind of region (the part of the key before ":")
+HISTORY_TEXT_RANGES = {
+    "remaining": [INC_REM_TEXT_RANGE],
+    "incursion": [SUBMENU_OPTION_TEXT_RANGE, SUBMENU_CHOSEN_TEXT_RANGE],
+    "room": [ROOM_TEXT_RANGE],
+}
+
+# Regions are OCRed concurrently, Tesseract and OpenCV release the GIL while working
+OCR_WORKERS = 4
+_OCR_POOL = None
+
+# Reads all room crops with a single OCR call instead of one call per room, see read_room_texts_batched
+BATCH_ROOM_OCR = False
+
+
+def get_ocr_pool():
+    global _OCR_POOL
+    if _OCR_POOL is None:
+        _OCR_POOL = ThreadPoolExecutor(max_workers=OCR_WORKERS, thread_name_prefix="ocr")
+    return _OCR_POOL
+
+
+def set_ocr_workers(workers: int):
+    global OCR_WORKERS, _OCR_POOL
+    workers = max(1, workers)
+    if workers == OCR_WORKERS:
+        return
+    if _OCR_POOL is not None:
+        _OCR_POOL.shutdown(wait=False)
+        _OCR_POOL = None
+    OCR_WORKERS = workers
+
+
+def warm_up_ocr_workers(timeout: float = 10):
+    """
+    Starts every OCR worker thread and has each of them pay the engine's startup cost for every config in WARM_UP_TESS_CONFIGS.
+    The barrier makes sure each worker takes exactly one of the warm-up tasks.
+    """
+    pool = get_ocr_pool()
+    engine = get_engine()
+    barrier = threading.Barrier(OCR_WORKERS)
+
+    def warm_up():
+        engine.warm_up(WARM_UP_TESS_CONFIGS)
+        try:
+            barrier.wait(timeout)
+        except threading.BrokenBarrierError:
+            pass # A worker was busy, it warms up on its first real task instead
+    
+    futures = [pool.submit(warm_up) for _ in range(OCR_WORKERS)]
+    for future in futures:
+        future.result()
+
+
+def set_batch_room_ocr(enabled: bool):
+    global BATCH_ROOM_OCR
+    BATCH_ROOM_OCR = enabled
+
+
+def image_to_string(text_mask, config):
+    """
+    Runs the active OCR engine (see src/ocr.py), skipped if a similar text mask has been read before
+    """
+    key = OCR_CACHE.key(text_mask, config)
+    output = OCR_CACHE.get(key)
+    if output is None:
+        with span("ocr", shape=text_mask.shape):
+            output = get_engine().image_to_string(text_mask, config=config)
+        OCR_CACHE.put(key, output)
+    return output
+
+
+def normalize_ocr(raw_ocr):
+    output = raw_ocr.upper()
+    output = output.replace('\n', ' ') # Removing newlines between room words
+    output = output.replace(')', '') # Removing closing ) from incursion submenu
+    return output
+
+
+def post_ocr_correction(raw_ocr, candidates=None):
+    """
+    Treating OCR output as raw data, requires some simple corrections
+    """
+    return match_ocr(raw_ocr, candidates)[0]
+
+
+def match_ocr(raw_ocr, candidates=None):
+    """
+    Spellchecks the OCR output against WORDS (or a subset of it). Returns the word and its match score (0 to 1).
+    """
+    output = normalize_ocr(raw_ocr)
+    word, score = MATCHER.match(output, candidates)
+    if word is None:
+        raise ValueError(f"OCR output did not match any word, got {output}")
+    return word, score
+
+
+def match_candidates(raw_ocr, candidates, words):
+    """
+    match_ocr against the candidates expected from the tracked temple (see Temple.get_recognition_candidates),
+    falling back to all of words when none of the candidates fits well
+    """
+    if candidates:
+        word, score = MATCHER.match(normalize_ocr(raw_ocr), candidates)
+        if word is not None and score >= CANDIDATE_MIN_SCORE:
+            return word, score
+    return match_ocr(raw_ocr, words)
+
+
+def classify_or_ocr(text_mask, classifier, read_with_ocr, candidates=None):
+    """
+    Matches the text mask against the classifier's templates, only running read_with_ocr when the match is not confident.
+    read_with_ocr(text_mask, candidates) returns (raw_ocr, corrected_output). Clean OCR reads are enrolled as new templates.
+    With candidates, the templates only have to tell the candidates apart.
+    """
+    label, _ = classifier.classify(text_mask, candidates)
+    if label is not None:
+        return label
+    raw_ocr, output = read_with_ocr(text_mask, candidates)
+    if MATCHER.match(normalize_ocr(raw_ocr).strip(), [output])[1] >= ENROLL_SIMILARITY:
+        classifier.enroll(text_mask, output)
+    return output
+
+
+class RegionReadError(ValueError):
+    """
+    Raised by read_image_using_saved_params when some regions could not be read.
+    results holds the regions that were read, keyed like ImageParams.get_read_rects, and failed the keys of the rest.
+    """
+    def __init__(self, results: dict, failed: list):
+        super().__init__(f"Failed to read {', '.join(failed)}")
+        self.results = results
+        self.failed = failed
+
+
+class TempleNotVisibleError(ValueError):
+    """
+    Raised by process_screenshot when there are no room borders to read or calibrate from, usually because the temple menu is not open
+    """
+
+
+class LayoutChangedError(ValueError):
+    """
+    Raised by process_screenshot when the rooms of a partial capture are no longer where image_params says they are.
+    Only a full screenshot can be recalibrated.
+    """
+
+
+def process_screenshot(screenshot, image_params, previous = None, origin = None, history = FRAME_HISTORY):
+    """
+    screenshot is a BGR(A) image. origin is the (x, y) of the screenshot's top-left corner when only part of the screen
+    was captured (see ImageParams.get_capture_rect).
+    If some regions fail to read, the screenshot is only recalibrated when the rooms are no longer where image_params
+    says they are, and then only the failed regions and the regions that moved are read again.
+    A failed read with the rooms still in place raises ValueError, no rooms at all raises TempleNotVisibleError,
+    and moved rooms in a partial capture raise LayoutChangedError.
+    history is the FrameHistory unchanged regions are reused from, None reads every region.
+    """
+    calibrated = image_params.cached is False
+    if calibrated:
+        hsv_image, image_params = calibrate(screenshot, history)
+        read_params = image_params
+    else:
+        read_params = image_params
+        if origin is not None:
+            read_params = image_params.translated(-origin[0], -origin[1])
+        # Only the areas that are read need to be classified
+        with span("pixel_classification", full_frame=False):
+            hsv_image = classify_pixels(screenshot, read_params.get_regions())
+    try:
+        with span("read_image_using_saved_params", continuous=previous is not None):
+            return image_params, read_image_using_saved_params(hsv_image, read_params, previous, history=history)
+    except RegionReadError as error:
+        if calibrated or geometry_matches(hsv_image, read_params):
+            # The same pixels read with the same parameters give the same result
+            raise ValueError(f"Failed to process screenshot, {error}")
+        if not temple_visible(hsv_image, read_params):
+            raise TempleNotVisibleError(f"No room borders where the temple should be, {error}")
+        if origin is not None:
+            raise LayoutChangedError(f"The temple moved, {error}")
+        results = error.results
+
+    # The temple moved, the results of regions that are in the same place are still valid
+    old_rects = read_params.get_read_rects()
+    hsv_image, image_params = calibrate(screenshot, history)
+    new_rects = image_params.get_read_rects()
+    known = {key: result for key, result in results.items() if old_rects[key] == new_rects.get(key)}
+    try:
+        with span("read_image_using_saved_params", continuous=previous is not None, known=len(known)):
+            return image_params, read_image_using_saved_params(hsv_image, image_params, previous, known, history)
+    except RegionReadError as error:
+        raise ValueError(f"Failed to process screenshot, {error}")
+
+
+def calibrate(screenshot, history = FRAME_HISTORY):
+    with span("pixel_classification", full_frame=True):
+        hsv_image = classify_pixels(screenshot)
+    with span("get_image_parameters"):
+        image_params = get_image_parameters(hsv_image)
+    if history is not None:
+        history.clear() # Regions may have moved
+    return hsv_image, image_params
+
+
+def geometry_matches(hsv_image, cache, tolerance = 2, max_missing = 1):
+    """
+    Checks that the room borders are still at the left edge of each saved room box, which is much cheaper than get_room_boxes.
+    Up to max_missing rooms may be missed, in case one is covered by the mouse or a tooltip.
+    """
+    room_h = cache.room_details["room_height"]
+    missing = 0
+    for xy in cache.slots_to_xy.values():
+        x, y = xy["x"], xy["y"]
+        edge = hsv_image[max(y + room_h // 4, 0):max(y + 3 * room_h // 4, 0), max(x - tolerance, 0):max(x + tolerance + 1, 0)]
+        if edge.size == 0 or not in_range(edge, *ROOM_BORDER_RANGES.values()).any():
+            missing += 1
+    return missing <= max_missing
+
+
+def temple_visible(hsv_image, cache):
+    """
+    Whether the temple's region has at least as many room border pixels as the outline of one room.
+    Without them the menu is closed or covered, which is no reason to recalibrate.
+    """
+    x, y, w, h = cache.get_regions()[0]
+    x, y = max(x, 0), max(y, 0)
+    temple = hsv_image[y:y + h, x:x + w]
+    if temple.size == 0:
+        return False
+    border = in_range(temple, *ROOM_BORDER_RANGES.values())
+    room_outline = 2 * (cache.room_details["room_width"] + cache.room_details["room_height"])
+    return np.count_nonzero(border) >= room_outline
+
+
+def get_pixel_lut():
+    """
+    The class bits of every BGR color, indexed by B + (G << 8) + (R << 16). Built once (16 MB) by converting all colors to HSV.
+    """
+    global _PIXEL_LUT
+    with _PIXEL_LUT_LOCK:
+        if _PIXEL_LUT is None:
+            values = np.arange(256, dtype=np.uint8)
+            colors = np.empty((256, 256, 256, 3), dtype=np.uint8) # Indexed [R][G][B], each color stored as B, G, R for cvtColor
+            colors[..., 0] = values[None, None, :]
+            colors[..., 1] = values[None, :, None]
+            colors[..., 2] = values[:, None, None]
+            hsv_colors = cv2.cvtColor(colors.reshape(4096, 4096, 3), cv2.COLOR_BGR2HSV)
+            lut = np.zeros((4096, 4096), dtype=np.uint8)
+            for hsv_range, bit in PIXEL_CLASS_BITS.items():
+                lut |= cv2.inRange(hsv_colors, hsv_range[0], hsv_range[1]) & bit
+            _PIXEL_LUT = lut.ravel()
+        return _PIXEL_LUT
+
+
+def classify_pixels(screenshot, regions = None):
+    """
+    Maps a BGR(A) screenshot to a single channel image of class bits, with bit PIXEL_CLASS_BITS[range] set where the pixel's
+    HSV color is in range. Replaces the HSV conversion and every cv2.inRange with one table lookup per pixel.
+    Everything that reads an hsv_image also accepts this image, see in_range. If regions (x, y, w, h) are given, only they are
+    classified and the rest is left 0. The lookup itself is slower than cv2.cvtColor (a full 1440p frame takes about
+    35 ms against 8 ms), the savings are in the thresholds after it and in warm frames only classifying their regions.
+    """
+    if regions is None:
+        return lookup_pixel_classes(screenshot)
+    classes = np.zeros(screenshot.shape[:2], dtype=np.uint8)
+    for x, y, w, h in regions:
+        x, y = max(x, 0), max(y, 0)
+        region = screenshot[y:y + h, x:x + w]
+        if region.size > 0:
+            classes[y:y + h, x:x + w] = lookup_pixel_classes(region)
+    return classes
+
+
+def lookup_pixel_classes(screenshot):
+    if screenshot.shape[-1] == 3:
+        screenshot = cv2.cvtColor(screenshot, cv2.COLOR_BGR2BGRA)
+    # Each BGRA pixel read as one little-endian integer is B + (G << 8) + (R << 16) + (A << 24)
+    colors = np.bitwise_and(screenshot.view(np.uint32)[..., 0], 0xFFFFFF)
+    return np.take(get_pixel_lut(), colors)
+
+
+def in_range(image, *hsv_ranges):
+    """
+    cv2.inRange for an HSV image, or the same mask taken from a pixel class image. Several ranges are combined into one mask.
+    """
+    if image.ndim == 2:
+        if image.size == 0:
+            return np.zeros(image.shape, dtype=np.uint8)
+        bits = 0
+        for hsv_range in hsv_ranges:
+            bits |= PIXEL_CLASS_BITS[hsv_range]
+        return cv2.compare(cv2.bitwise_and(image, bits), 0, cv2.CMP_NE)
+    mask = cv2.inRange(image, hsv_ranges[0][0], hsv_ranges[0][1])
+    for lower, upper in hsv_ranges[1:]:
+        mask = cv2.bitwise_or(mask, cv2.inRange(image, lower, upper))
+    return mask
+
+
+def get_room_boxes(hsv_menu_image):
+    """
+    Function assumes that the room border color is fixed with respect to its status (Open/Obstructed/Chosen).
+    Identifies the room boundaries in the temple by checking if the colors are within range for each room status.
+    Using contours, filters out boxes that are too small, or that are children of another box.
+    Remaining boxes are kept and stored in a list.
+    """
+    mask = in_range(hsv_menu_image, *ROOM_BORDER_RANGES.values())
+
+    contours, hierarchy = cv2.findContours(mask, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+    boundingBoxes = [cv2.boundingRect(contour) for contour in contours]
+    if len(boundingBoxes) == 0:
+        raise TempleNotVisibleError("No room borders found")
+    
+    room_boxes = []
+    idx = -1
+    # Assuming no contour will be larger than the rooms, we use the max
+    room_w_cutoff = 0.8 * max(box[2] for box in boundingBoxes)
+    room_h_cuttof = 0.8 * max(box[3] for box in boundingBoxes)
+    for bounding_box in boundingBoxes:
+        idx += 1
+        if bounding_box[2] < room_w_cutoff or bounding_box[3] < room_h_cuttof or hierarchy[0, idx, 3] != -1:
+            continue
+        room_boxes.append(bounding_box)
+
+    if len(room_boxes) != 13:
+        # Add error logging stuff here
+        raise ValueError(f"Expected 13 room boxes, got {len(room_boxes)}")
+    
+    return room_boxes
+
+
+def get_image_parameters(hsv_image):
+    output = {
+        "room_details": {},
+        "slots_to_xy": {},
+        "incursion_menu_rect": {},
+        "incursions_remaining_rect": {}
+    }
+
+    # Rectangles that define the outlines of each room
+    room_boxes = get_room_boxes(hsv_image) # A list of (x, y, w, h) tuples
+    
+    # Average room dimensions (excluding the chosen room)
+    average_room_height = ceil((sum(room[3] for room in room_boxes) - min(room[3] for room in room_boxes)) / (len(room_boxes) - 1))
+    average_room_width = ceil((sum(room[2] for room in room_boxes) - min(room[2] for room in room_boxes)) / (len(room_boxes) - 1))
+
+    # Average gap between normal (non-chosen) rooms
+    horizontal_gap = abs(room_boxes[-3][0] - room_boxes[-2][0]) - average_room_width
+    if average_room_height - room_boxes[-3][3] > 1 or average_room_height - room_boxes[-2][3] > 1: # Checking if either room in layer 3 is chosen
+        horizontal_gap = abs(room_boxes[-5][0] - room_boxes[-4][0]) - average_room_width # Using rooms 2F0 and 2F1 instead of 3F0 and 3F1 for accurate gap
+    vertical_gap = min(room_boxes[-2][1], room_boxes[-3][1]) - room_boxes[-1][1] - average_room_height # Provides consistency if 3F0 or 3F1 are chosen
+
+    output["room_details"]["room_width"] = average_room_width
+    output["room_details"]["room_height"] = average_room_height
+    output["room_details"]["horizontal_gap"] = horizontal_gap
+    output["room_details"]["vertical_gap"] = vertical_gap
+    
+    # Important reference points/lengths for the temple
+    temple_layer_h = average_room_height + vertical_gap
+    temple_apex_y = min(room[1] for room in room_boxes) - floor(vertical_gap / 2) # Apex y is the minumum y for the temple
+    layer_room_w = average_room_width + horizontal_gap
+    temple_leftmost_x = min(room[0] for room in room_boxes) - floor(horizontal_gap / 2) # x value of furthest left room
+    layer_leftmost_x = temple_leftmost_x
+    
+    prev_layer = -1
+    for room in room_boxes:
+        x, y, w, h = room
+        room_layer = 4 - round((y - temple_apex_y) / temple_layer_h)
+        if room_layer == prev_layer + 1:
+            prev_layer = room_layer
+            layer_leftmost_x = temple_leftmost_x + (4 - ROOMS_PER_LAYER[room_layer]) * (1 / 2) * (average_room_width + horizontal_gap)
+
+        room_diag = ROOMS_PER_LAYER[room_layer] - round((x - layer_leftmost_x) / layer_room_w) - 1 + (room_layer == 0)
+        room_slot = f"{room_layer}F{room_diag}"
+        
+        # The chosen room has a smaller box than the typical room, so it is easy to catch here
+        if average_room_height - h > 1:
+            y -= ceil((average_room_height - h) / 2)
+            # x -= ceil((average_room_width - w) / 2) # Assume this is not needed
+        
+        output["slots_to_xy"][room_slot] = {}
+        output["slots_to_xy"][room_slot]["x"] = x
+        output["slots_to_xy"][room_slot]["y"] = y 
+
+    # Reference points/lengths for the incursion submenu (top right corner of Temple screen)
+    output["incursion_menu_rect"]["x"] = floor(room_boxes[-1][0] + (3 / 2) * average_room_width + horizontal_gap) # Fixed distance from Apex x
+    output["incursion_menu_rect"]["y"] = ceil(average_room_height / 2)
+    output["incursion_menu_rect"]["w"] = floor(0.65 * (len(hsv_image[0]) - output["incursion_menu_rect"]["x"])) # Difference from max x and submenu x
+    output["incursion_menu_rect"]["h"] = room_boxes[-1][1] + ceil((3 / 2) * average_room_height) + vertical_gap # Fixed distance from Apex y, since this starts at y = 0
+
+    # Reference points/lengths for the incursions remaining (near the bottom of the Temple screen)
+    output["incursions_remaining_rect"]["x"] = room_boxes[-1][0] - horizontal_gap
+    output["incursions_remaining_rect"]["y"] = room_boxes[-1][1] + 5 * (average_room_height + vertical_gap)
+    output["incursions_remaining_rect"]["w"] = 2 * horizontal_gap + average_room_width
+    output["incursions_remaining_rect"]["h"] = average_room_height
+
+    output["cached"] = True
+
+    return ImageParams.from_dict(output)
+
+
+def read_image_using_saved_params(hsv_image, cache, previous = None, known = None, history = FRAME_HISTORY):
+    """
+    Reads every region of the temple menu. known holds results (keyed like ImageParams.get_read_rects) that are reused
+    instead of being read again, like the regions history says are unchanged (if history is not None).
+    Regions that fail are collected and raised together as a RegionReadError.
+    previous may hold the "candidates" of the tracked temple, which narrow down the names that are read.
+    """
+    pool = get_ocr_pool()
+    known = known or {}
+    candidates = (previous or {}).get("candidates") or {}
+    rects = cache.get_read_rects()
+
+    def crop(key):
+        # TODO: Image may not contain this, what to do then?
+        x, y, w, h = rects[key]
+        return hsv_image[y:y + h, x:x + w]
+
+    def submit(key, read):
+        if key in known:
+            future = Future()
+            future.set_result(known[key])
+            return future
+        return submit_if_changed(pool, key, crop(key), read, history)
+
+    results = {}
+    failed = []
+
+    def collect(key, future):
+        try:
+            results[key] = future.result()
+        except ValueError:
+            failed.append(key)
+
+    remaining_future = submit("remaining", read_incursions_remaining)
+    incursion_future = submit("incursion", lambda hsv_incursion_submenu: read_incursion_submenu(hsv_incursion_submenu, candidates))
+
+    # Without a previous incursion every room is read, so there is no need to wait for the remaining count
+    continuous = False
+    if previous is not None:
+        collect("remaining", remaining_future)
+        # If the count could not be read, every room is read so the layout is still complete
+        continuous = "remaining" in results and (previous["remaining"] - results["remaining"]) == 1
+
+    slots = [slot for slot in cache.slots_to_xy if not continuous or slot == str(previous["slot"])]
+    room_images = {}
+    room_history_masks = {}
+    room_names = {}
+    for slot in slots:
+        key = f"room:{slot}"
+        room_image = crop(key)
+        room_names[slot] = known.get(key)
+        if room_names[slot] is None and history is not None:
+            room_history_masks[slot] = history_mask(key, room_image)
+            room_names[slot] = history.lookup(key, room_history_masks[slot])
+        if room_names[slot] is None: # Only rooms that changed since the last frame are read
+            room_images[slot] = room_image
+    
+    # Every room crop is the same size, so their text masks are made in one batch
+    with span("get_text_masks", rooms=len(room_images)):
+        text_masks = dict(zip(room_images, get_text_masks(list(room_images.values()), ROOM_TEXT_RANGE, reduce_noise=True)))
+    # Rooms without text fail right away instead of going through OCR
+    text_masks = {slot: text_mask for slot, text_mask in text_masks.items() if text_mask is not None}
+    if BATCH_ROOM_OCR and len(text_masks) > 1:
+        batch_future = pool.submit(read_room_texts_batched, text_masks)
+    else:
+        # Only the incursion's slot is read when continuous, and it can only have become one of the incursion's rooms
+        slot_candidates = candidates.get("slot") if continuous else None
+        room_futures = {slot: pool.submit(recognize_room_text, text_mask, slot_candidates) for slot, text_mask in text_masks.items()}
+    
+    # Every door is read in one pass, each one is the left-side connection of the room to its right
+    with span("connection_detection"):
+        door_bitmask = read_door_bitmask(hsv_image, cache)
+    layout_data = {}
+    for slot in slots:
+        layout_data[slot] = {"Name": None, "Connections": get_slot_connections(door_bitmask, slot, right_side=continuous)}
+
+    if BATCH_ROOM_OCR and len(text_masks) > 1:
+        new_names = batch_future.result() # Rooms that could not be read are left out
+    else:
+        new_names = {}
+        with span("wait_for_room_ocr", rooms=len(room_futures)):
+            for slot, future in room_futures.items():
+                try:
+                    new_names[slot] = future.result()
+                except ValueError:
+                    pass
+    for slot in room_images:
+        if slot in new_names:
+            if history is not None:
+                history.store(f"room:{slot}", room_history_masks[slot], new_names[slot])
+            room_names[slot] = new_names[slot]
+    for slot in slots:
+        layout_data[slot]["Name"] = room_names[slot]
+        if room_names[slot] is None:
+            failed.append(f"room:{slot}")
+        else:
+            results[f"room:{slot}"] = room_names[slot]
+
+    if previous is None:
+        collect("remaining", remaining_future)
+    collect("incursion", incursion_future)
+    if failed:
+        raise RegionReadError(results, failed)
+
+    output = {"layout": layout_data, "incursion": results["incursion"], "remaining": results["remaining"]}
+    
+    return output
+
+
+def submit_if_changed(pool, key, hsv_region, read, history = FRAME_HISTORY):
+    """
+    Submits read(hsv_region) to the pool, unless the region's text is unchanged since the last frame (see FrameHistory).
+    Either way returns a future of the result.
+    """
+    if history is None:
+        return pool.submit(read, hsv_region)
+    text_mask = history_mask(key, hsv_region)
+    result = history.lookup(key, text_mask)
+    if result is not None:
+        future = Future()
+        future.set_result(result)
+        return future
+    
+    def read_and_store(region):
+        result = read(region)
+        history.store(key, text_mask, result)
+        return result
+    return pool.submit(read_and_store, hsv_region)
+
+
+def history_mask(key, hsv_region):
+    # The pixels of the region's text colors, what FRAME_HISTORY compares between frames
+    return in_range(hsv_region, *HISTORY_TEXT_RANGES[key.split(":")[0]])
+
+
+def get_door_regions(cache):
+    """
+    (x, y, w, h) boxes sampled for every door, keyed by (slot, direction) on the left side of slot.
+    A door is the gap above, beside or below the left half of the room, not the room itself.
+    """
+    room_w = cache.room_details["room_width"]
+    room_h = cache.room_details["room_height"]
+    gap_w = cache.room_details["horizontal_gap"]
+    gap_h = cache.room_details["vertical_gap"]
+    half_w = round(room_w / 2)
+    regions = {}
+    for slot, neighbour in DOORS:
+        x = cache.slots_to_xy[slot]["x"]
+        y = cache.slots_to_xy[slot]["y"]
+        direction = DOORS[(slot, neighbour)]
+        if direction == "\\": # Above
+            regions[(slot, direction)] = (x - gap_w, y - gap_h, gap_w + half_w, gap_h)
+        elif direction == "—": # Beside
+            regions[(slot, direction)] = (x - gap_w, y, gap_w, room_h)
+        else: # Below
+            regions[(slot, direction)] = (x - gap_w, y + room_h, gap_w + half_w, gap_h)
+    return regions
+
+
+def get_door_sampler(cache, shape):
+    """
+    Flat pixel indices of every door region (concatenated) and where each door starts, computed once per ImageParams and image size
+    """
+    key = (shape, json.dumps([cache.room_details, cache.slots_to_xy], sort_keys=True))
+    if key in _DOOR_SAMPLERS:
+        return _DOOR_SAMPLERS[key]
+    
+    indices = []
+    starts = []
+    count = 0
+    for door, (x, y, w, h) in get_door_regions(cache).items():
+        x0, y0 = min(max(x, 0), shape[1]), min(max(y, 0), shape[0])
+        x1, y1 = min(max(x + w, 0), shape[1]), min(max(y + h, 0), shape[0])
+        ys, xs = np.mgrid[y0:y1, x0:x1]
+        indices.append((ys * shape[1] + xs).ravel())
+        starts.append(count)
+        count += indices[-1].size
+    sampler = (np.concatenate(indices), np.array(starts), np.array([index.size for index in indices]))
+    _DOOR_SAMPLERS[key] = sampler
+    return sampler
+
+
+def read_door_bitmask(hsv_image, cache):
+    """
+    Bit i is set if door DOOR_LIST[i] is open, found with a single vectorized threshold and count over all doors
+    """
+    indices, starts, sizes = get_door_sampler(cache, hsv_image.shape[:2])
+    if hsv_image.ndim == 2: # Pixel classes
+        open_pixels = (hsv_image.reshape(-1)[indices] & PIXEL_CLASS_BITS[CONNECTION_RANGE]) > 0
+    else:
+        pixels = hsv_image.reshape(-1, 3)[indices]
+        open_pixels = ((pixels >= CONNECTION_RANGE[0]) & (pixels <= CONNECTION_RANGE[1])).all(axis=1)
+    # reduceat needs valid start indices, empty doors (off screen) are never open
+    counts = np.add.reduceat(np.append(open_pixels, False).astype(np.int32), np.minimum(starts, len(open_pixels)))
+    present = (counts > 0) & (sizes > 0)
+    return int((present.astype(np.int64) << np.arange(len(present), dtype=np.int64)).sum())
+
+
+def get_slot_connections(door_bitmask, slot, right_side=False):
+    """
+    Connections of slot in the vision output format (left side directions, then "r" + direction for the right side)
+    """
+    connections = []
+    for idx, (door_slot, neighbour) in enumerate(DOOR_LIST):
+        if door_bitmask >> idx & 1 and door_slot == slot:
+            connections.append(DOORS[(door_slot, neighbour)])
+    if right_side:
+        for idx, (door_slot, neighbour) in enumerate(DOOR_LIST):
+            if door_bitmask >> idx & 1 and neighbour == slot:
+                connections.append("r" + RIGHT_SIDE_DIRECTIONS[DOORS[(door_slot, neighbour)]])
+    return connections
+
+
+def get_text_mask(hsv_image, text_hsv_range, reduce_noise=False, debug=False):
+    """
+    Using a text_hsv_range, isolates text in the image. Performs morphological operations to enhance readability and reduce noise.
+    Raises ValueError if the image has no text, so an empty region is never OCRed.
+    """
+    result = get_text_masks([hsv_image], text_hsv_range, reduce_noise)[0]
+    if result is None:
+        raise ValueError("No text found")
+
+    # For debugging / testing, matplotlib is not thread-safe so this is skipped on the OCR workers
+    if debug and threading.current_thread() is threading.main_thread():
+        fig, axs = plt.subplots(1, 2, figsize=(10, 6), layout='constrained')
+        axs[0].imshow(hsv_image)
+        axs[1].imshow(result, cmap='gray')
+        plt.show()
+    return result
+
+
+def get_text_masks(hsv_images, text_hsv_range, reduce_noise=False):
+    """
+    get_text_mask for several crops at once. Crops of the same size (like the rooms) are stacked into one array,
+    so the thresholding, morphology and noise removal run once for all of them instead of once per crop.
+    Crops without any text get None instead of a mask.
+    """
+    results = [None] * len(hsv_images)
+    shapes = {}
+    for idx, hsv_image in enumerate(hsv_images):
+        shapes.setdefault(hsv_image.shape, []).append(idx)
+    for indices in shapes.values():
+        for idx, result in zip(indices, get_stacked_text_masks([hsv_images[idx] for idx in indices], text_hsv_range, reduce_noise)):
+            results[idx] = result
+    return results
+
+
+def get_stacked_text_masks(hsv_images, text_hsv_range, reduce_noise=False):
+    """
+    hsv_images must all have the same shape. They are stacked vertically with empty rows in between,
+    which keeps the morphology and connected components of one crop from reaching the next.
+    """
+    count = len(hsv_images)
+    h, w = hsv_images[0].shape[:2]
+    channels = hsv_images[0].shape[2:] # Pixel class images have no channel axis
+    pitch = h + TEXT_MASK_STACK_GAP
+    stack = np.zeros((count, pitch, w) + channels, dtype=np.uint8)
+    for idx, hsv_image in enumerate(hsv_images):
+        stack[idx, :h] = hsv_image
+    font_masks = in_range(stack.reshape((count * pitch, w) + channels), text_hsv_range)
+
+    # Some rooms have the font colors in their art, which appear as noise
+    # Opening reduces the severity of that noise
+    opening_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (2, 2))
+    opening = cv2.morphologyEx(font_masks, cv2.MORPH_OPEN, opening_kernel)
+    
+    # Dilation along this kernel blends the text together into blobs
+    dilation_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 3))
+    dilation = cv2.dilate(opening, dilation_kernel, iterations=2)
+
+    font_masks = font_masks.reshape(count, pitch, w)[:, :h]
+    # Bounding box of the text color in each crop
+    rows = font_masks.any(axis=2)
+    cols = font_masks.any(axis=1)
+    has_text = rows.any(axis=1)
+    tops = np.argmax(rows, axis=1)
+    bottoms = h - np.argmax(rows[:, ::-1], axis=1)
+    lefts = np.argmax(cols, axis=1)
+    rights = w - np.argmax(cols[:, ::-1], axis=1)
+
+    # Trimming some blobs that are obviously too small for any text
+    if reduce_noise is True:
+        _, labels, stats, _ = cv2.connectedComponentsWithStats(dilation, connectivity=8, ltype=cv2.CV_16U)
+        crop_idx = stats[:, cv2.CC_STAT_TOP] // pitch
+        too_small = stats[:, cv2.CC_STAT_HEIGHT] < 0.2 * (bottoms - tops)[np.minimum(crop_idx, count - 1)]
+        too_small[0] = False # Background
+        # Only erasing inside each small blob's box, there are usually few of them
+        for label in np.nonzero(too_small)[0]:
+            x, y, box_w, box_h = stats[label, :4]
+            box = (slice(y, y + box_h), slice(x, x + box_w))
+            dilation[box][labels[box] == label] = 0
+    dilation = dilation.reshape(count, pitch, w)[:, :h]
+
+    results = []
+    for idx in range(count):
+        if not has_text[idx]:
+            results.append(None) # Nothing to read, like the menu being closed
+            continue
+        box = (idx, slice(tops[idx], bottoms[idx]), slice(lefts[idx], rights[idx]))
+        blobs = dilation[box]
+        
+        # Scanning from the bottom of the region until a cutoff is reached
+        # Scanning will stop after both conditions are met:
+        # 1) Reaching an empty row (This assumes noise blobs do not touch the text blob)
+        # 2) Accounting for 70% of the white pixels in the region (This assumes the text is primarily at the bottom)
+        row_sums = np.count_nonzero(blobs, axis=1)
+        pixels_below = np.cumsum(row_sums[::-1])[::-1] # Pixels in each row and every row under it
+        cutoffs = np.nonzero((row_sums == 0) & (pixels_below >= 0.7 * row_sums.sum()))[0]
+        row_cutoff = cutoffs[-1] if len(cutoffs) > 0 else 0
+        
+        # Only keep original text within the blobs in the cutoff region
+        results.append(finish_text_mask(255 - cv2.bitwise_and(blobs[row_cutoff:], font_masks[box][row_cutoff:])))
+    return results
+
+
+def finish_text_mask(result):
+    # Padding the text with empty space helps remove some edge-errors
+    border_size = 10
+    result = cv2.copyMakeBorder(
+        result,
+        top=border_size,
+        bottom=border_size,
+        left=border_size,
+        right=border_size,
+        borderType=cv2.BORDER_CONSTANT,
+        value=[255, 255, 255]
+    )
+
+    return cv2.resize(result, None, fx=2, fy=2, interpolation=cv2.INTER_NEAREST)
+
+
+def read_incursion_submenu(hsv_incursion_submenu, candidates=None):
+    """
+    The incursion submenu is the upper-right corner of the temple menu, which details the different room options for that incursion.
+    Typically, going right (up) will upgrade the current room (if possible), while going left will swap to a tier 1 room of a different theme.
+    candidates optionally maps "room", "left_option" and "right_option" to the names expected from the tracked temple.
+    """
+    candidates = candidates or {}
+    left_region = get_text_mask(hsv_incursion_submenu[:, :floor(len(hsv_incursion_submenu[0]) / 2)], SUBMENU_OPTION_TEXT_RANGE)
+    right_region = get_text_mask(hsv_incursion_submenu[:, floor(len(hsv_incursion_submenu[0]) / 2):], SUBMENU_OPTION_TEXT_RANGE)
+    top_region = get_text_mask(hsv_incursion_submenu[:floor(len(hsv_incursion_submenu) / 5), :], SUBMENU_CHOSEN_TEXT_RANGE)
+
+    left_output = classify_or_ocr(left_region, SUBMENU_OPTION_CLASSIFIER, read_submenu_option, candidates.get("left_option"))
+    right_output = classify_or_ocr(right_region, SUBMENU_OPTION_CLASSIFIER, read_submenu_option, candidates.get("right_option"))
+    top_output = classify_or_ocr(top_region, SUBMENU_ROOM_CLASSIFIER, read_submenu_room, candidates.get("room"))
+
+    return  {"room": top_output, "left_option": left_output, "right_option": right_output}
+
+
+def read_submenu_option(text_mask, candidates=None):
+    # Split by 'E TO ' to capture both 'CHANGE TO ' and 'UPGRADE TO '
+    ocr = image_to_string(text_mask, SUBMENU_TESS_CONFIG)
+    ocr = ocr.strip().replace('\n', ' ')
+    if 'E TO ' not in ocr:
+        raise ValueError(f"Submenu option is missing 'CHANGE TO' or 'UPGRADE TO', got {ocr}")
+    ocr = ocr.split('E TO ')[1]
+    return ocr, match_candidates(ocr, candidates, OPTION_WORDS)[0]
+
+
+def read_submenu_room(text_mask, candidates=None):
+    ocr = image_to_string(text_mask, SUBMENU_TESS_CONFIG)
+    ocr = ocr.strip().replace('\n', ' ')
+    return ocr, match_candidates(ocr, candidates, ROOM_WORDS)[0]
+
+
+def read_incursions_remaining(hsv_incursions_remaining):
+    """
+    Reading X from "X Incursions Remaining". The digits are matched against DIGIT_CLASSIFIER first,
+    OCR only runs when they are not recognized and its clean reads are enrolled digit by digit.
+    """
+    text_mask = get_text_mask(hsv_incursions_remaining, INC_REM_TEXT_RANGE)
+    remaining, _ = read_remaining_digits(text_mask)
+    if remaining is not None:
+        return remaining
+
+    raw_inc_rem = image_to_string(text_mask, REMAINING_TESS_CONFIG).split(' ')[0]
+    inc_rem, score = match_ocr(raw_inc_rem, DIGIT_WORDS)
+    
+    try:
+        remaining = int(inc_rem)
+    except ValueError:
+        # Add logging here
+        raise ValueError(f"Incursions remaining was not an integer, got {inc_rem}")
+
+    glyphs = split_number_glyphs(text_mask)
+    if score >= ENROLL_SIMILARITY and len(glyphs) == len(inc_rem):
+        for glyph, digit in zip(glyphs, inc_rem):
+            DIGIT_CLASSIFIER.enroll(glyph, digit)
+    return remaining
+
+
+def read_remaining_digits(text_mask, classifier = None):
+    """
+    Reads the number at the start of the text mask glyph by glyph with the digit templates.
+    Returns (number, confidence), where confidence is the lowest of the digits. number is None if any digit is unsure.
+    """
+    classifier = classifier or DIGIT_CLASSIFIER
+    glyphs = split_number_glyphs(text_mask)
+    if len(glyphs) == 0 or len(glyphs) > 2: # 1 to 12
+        return None, 0.0
+    
+    digits = ""
+    confidence = 1.0
+    for glyph in glyphs:
+        digit, score = classifier.classify(glyph)
+        confidence = min(confidence, score)
+        if digit is None:
+            return None, confidence
+        digits += digit
+    if digits not in DIGIT_WORDS:
+        return None, confidence
+    return int(digits), confidence
+
+
+def split_number_glyphs(text_mask):
+    """
+    Splits the first word of a text mask into glyphs at the blank columns between them.
+    The word ends at the first gap wider than WORD_GAP times the text height.
+    """
+    ink = text_mask < 128
+    rows = np.flatnonzero(ink.any(axis=1))
+    if len(rows) == 0:
+        return []
+    height = rows[-1] - rows[0] + 1
+    columns = np.concatenate([[False], ink.any(axis=0), [False]])
+    edges = np.flatnonzero(columns[1:] != columns[:-1]) # Alternating starts and ends of ink
+    spans = [(edges[0], edges[1])]
+    for start, end in zip(edges[2::2], edges[3::2]):
+        if start - spans[-1][1] > WORD_GAP * height:
+            break
+        spans.append((start, end))
+    return [text_mask[:, start:end] for start, end in spans]
+
+
+def read_room_text(hsv_room, debug=False):
+    text_mask = get_text_mask(hsv_room, ROOM_TEXT_RANGE, reduce_noise=True, debug=False)
+    return recognize_room_text(text_mask)
+
+
+def recognize_room_text(text_mask, candidates=None):
+    return classify_or_ocr(text_mask, ROOM_CLASSIFIER, read_room_text_with_ocr, candidates)
+
+
+def read_room_text_with_ocr(text_mask, candidates=None):
+    ocr = image_to_string(text_mask, ROOM_TESS_CONFIG).strip()
+    output = match_candidates(ocr, candidates, ROOM_WORDS)[0]
+    return ocr, validate_room_text(output)
+
+
+def validate_room_text(output):
+    if output not in ROOM_DATA.index:
+        # read_room_text(hsv_room, debug=True)
+        # Add logging here
+        raise ValueError(f"Room not found, got {output} instead")
+
+    return output
+
+
+def stitch_text_masks(text_masks):
+    """
+    Stacks text masks vertically into one white page. Returns the page and the (top, bottom) rows of each mask.
+    """
+    width = max(mask.shape[1] for mask in text_masks)
+    height = sum(mask.shape[0] for mask in text_masks) + BATCH_SEPARATOR * (len(text_masks) - 1)
+    page = np.full((height, width), 255, dtype=np.uint8)
+    spans = []
+    top = 0
+    for mask in text_masks:
+        page[top:top + mask.shape[0], :mask.shape[1]] = mask
+        spans.append((top, top + mask.shape[0]))
+        top += mask.shape[0] + BATCH_SEPARATOR
+    return page, spans
+
+
+def read_room_texts_batched(text_masks):
+    """
+    Reads several rooms (text masks keyed by slot) with one OCR call by stacking their text masks into a single page.
+    Words are assigned back to rooms by the vertical center of their bounding box.
+    Rooms that get no words, or whose words don't match a room name, are read on their own instead.
+    Rooms that still cannot be read are left out of the output.
+    """
+
+    output = {}
+    uncached = []
+    for slot, text_mask in text_masks.items():
+        label, _ = ROOM_CLASSIFIER.classify(text_mask)
+        if label is not None:
+            output[slot] = label
+            continue
+        cached = OCR_CACHE.get(OCR_CACHE.key(text_mask, ROOM_TESS_CONFIG))
+        if cached is None:
+            uncached.append(slot)
+        else:
+            output[slot] = validate_room_text(post_ocr_correction(cached.strip(), ROOM_WORDS))
+    if len(uncached) == 0:
+        return output
+
+    page, spans = stitch_text_masks([text_masks[slot] for slot in uncached])
+    slot_words = {slot: [] for slot in uncached}
+    with span("batched_ocr", rooms=len(uncached)):
+        words = get_engine().image_to_data(page, ROOM_TESS_CONFIG)
+    for word in words: # psm 6 reads the page as one block of lines
+        center = word["top"] + word["height"] / 2
+        for slot, (top, bottom) in zip(uncached, spans):
+            if top <= center < bottom:
+                slot_words[slot].append(word["text"])
+                break
+
+    for slot in uncached:
+        ocr = " ".join(slot_words[slot]).strip()
+        try:
+            output[slot], score = match_ocr(ocr, ROOM_WORDS)
+            OCR_CACHE.put(OCR_CACHE.key(text_masks[slot], ROOM_TESS_CONFIG), ocr)
+            if score >= ENROLL_SIMILARITY:
+                ROOM_CLASSIFIER.enroll(text_masks[slot], output[slot])
+        except ValueError:
+            try:
+                output[slot] = recognize_room_text(text_masks[slot])
+            except ValueError:
+                pass # Left out, so the caller knows which rooms failed
+    
+    return output
+
+
+def connection_present(connection_hsv):
+    connection_mask = in_range(connection_hsv, CONNECTION_RANGE)
+    return 255 in connection_mask
+
+
+# def shortcut(screenshot, slot):
+#     with open(r"src\image_params.json") as f:
+#         cache = json.load(f)
+    
+#     slot_data = {"Name": "", "Connections": []}
+#     layer = int(slot[0])
+#     diag = int(slot[-1])
+#     directions = {-1: "/", 0: "—", 1: "\\"}
+    
+#     if screenshot.shape[-1] == 4: # Alpha channel present
+#         screenshot = np.array(screenshot)[..., :-1] # Removing alpha channel
+#     screenshot = screenshot[..., ::-1] # BGR to RGB
+#     # screenshot = crop_to_incursion_menu(screenshot) # Don't think this is needed anymore
+#     hsv_image = cv2.cvtColor(screenshot, cv2.COLOR_RGB2HSV)
+#     # Need to make it read the room text and check connections twice and read the submenu and remaining
+#     average_room_width = cache["room_details"]["room_width"]
+#     average_room_height = cache["room_details"]["room_height"]
+#     horizontal_gap = cache["room_details"]["horizontal_gap"]
+#     vertical_gap = cache["room_details"]["vertical_gap"]
+#     x = cache["slots_to_xy"][slot]["x"]
+#     y = cache["slots_to_xy"][slot]["y"]
+#     room_image = hsv_image[y + round(0.4 * average_room_height):y + average_room_height, x:x + average_room_width]
+#     slot_data["Name"] = read_room_text(room_image)
+
+#     room_connection_hsv = hsv_image[y - vertical_gap:y + average_room_height + vertical_gap, x - horizontal_gap:x + round(average_room_width / 2)]
+#     room_connection_hsv[vertical_gap:average_room_height + vertical_gap, horizontal_gap:round(average_room_width / 2) + horizontal_gap] = (0, 0, 0)
+#     connection_ys = [0, vertical_gap, average_room_height + vertical_gap, average_room_height + 2 * vertical_gap]
+#     direction = -2
+#     for region_idx in range(len(connection_ys) - 1):
+#         region_idx = len(connection_ys) - region_idx - 1
+#         direction += 1
+#         # Only checks for a connection if there is another room to connect to in that direction from the current room
+#         # Ex: There cannot be rooms below the lowest layer, so that direction is not checked for layer 0
+#         if ((direction == -1 and layer > 0 and diag < 3) or \
+#             (direction == 0 and diag < ROOMS_PER_LAYER[layer] - 1 + (layer == 0)) or \
+#             (direction == 1 and (layer == 0 or diag < ROOMS_PER_LAYER[layer] - 1))) and \
+#             connection_present(room_connection_hsv[connection_ys[region_idx - 1]:connection_ys[region_idx]]):
+#                 slot_data["Connections"].append(directions[direction])
+
+#     for region_idx in range(len(connection_ys) - 1):
+#         region_idx = len(connection_ys) - region_idx - 1
+#         direction += 1
+#         # Only checks for a connection if there is another room to connect to in that direction from the current room
+#         # Ex: There cannot be rooms below the lowest layer, so that direction is not checked for layer 0
+#         if ((direction == -1 and layer > 0 and diag < 3) or \
+#             (direction == 0 and diag < ROOMS_PER_LAYER[layer] - 1 + (layer == 0)) or \
+#             (direction == 1 and (layer == 0 or diag < ROOMS_PER_LAYER[layer] - 1))) and \
+#             connection_present(room_connection_hsv[connection_ys[region_idx - 1]:connection_ys[region_idx]]):
+#                 slot_data["Connections"].append(directions[direction])
+    
+#     # TODO: What if the image doesn't have these?
+#     incursion_x = cache["incursion_menu_rect"]["x"]
+#     incursion_y = cache["incursion_menu_rect"]["y"]
+#     incursion_w = cache["incursion_menu_rect"]["w"]
+#     incursion_h = cache["incursion_menu_rect"]["h"]
+#     incursion_menu_hsv = hsv_image[incursion_y:incursion_y + incursion_h, incursion_x:incursion_x + incursion_w]
+#     incursion_data = read_incursion_submenu(incursion_menu_hsv)
+
+#     # TODO: Or these?
+#     remaining_x = cache["incursions_remaining_rect"]["x"]
+#     remaining_y = cache["incursions_remaining_rect"]["y"]
+#     remaining_w = cache["incursions_remaining_rect"]["w"]
+#     remaining_h = cache["incursions_remaining_rect"]["h"]
+#     incursions_remaining_hsv = hsv_image[remaining_y:remaining_y + remaining_h, remaining_x:remaining_x + remaining_w]
+#     incursions_remaining = read_incursions_remaining(incursions_remaining_hsv)
+
+#     output = {"slot": slot_data, "incursion": incursion_data, "remaining": incursions_remaining}
+
+
+if __name__ == "__main__":
+    # reset_saved_params()
+    import time
+    image = cv2.imread(r"tests\Images\CompleteTemple.png")
+    start = time.time()
+    output = process_screenshot(image)
+    end = time.time()
+    print(end - start)
+    print(output)
+    start = time.time()
+    slot = "0F1"
+    output = process_screenshot(image, {"slot": "0F1", "remaining": 2})
+    end = time.time()
+    print(end - start)
+    print(output)
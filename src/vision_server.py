@@ -0,0 +1,184 @@
+"""
+Headless vision service, reads temple screenshots without the GUI.
+
+Usage: python -m src.vision_server [--port 8765] [--workers 2] [--ocr-workers 4]
+
+POST /vision with the screenshot as the body, either
+    a PNG (Content-Type: image/png), or
+    a raw BGR/BGRA frame (Content-Type: application/octet-stream) with X-Width, X-Height and X-Channels headers.
+The optional X-Previous header holds the previous incursion as json ({"remaining": 3, "slot": "1F2"}), optionally with
+the "candidates" of Temple.get_recognition_candidates.
+Returns {"vision_output": {...}, "calibrated": bool, "elapsed_ms": float}, or {"error": "..."} with status 422.
+
+GET /health returns the worker and cache state.
+"""
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+import numpy as np
+import cv2
+import pytesseract
+
+from src import vision
+from src.data import ImageProfiles, profile_key
+from src.ocr import create_engine, set_engine, get_engine
+
+
+MAX_BODY_BYTES = 64 * 1024 * 1024 # An uncompressed 4K BGRA frame is about 33 MB
+
+
+class VisionService:
+    """
+    Runs process_screenshot for several clients. Calibrations are shared per frame size, and at most
+    `workers` screenshots are processed at once, each using the shared OCR pool. Nothing is reused from earlier
+    requests (no frame history), as they may come from another client.
+    """
+    def __init__(self, workers: int = 2):
+        self.workers = workers
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vision")
+        self.image_profiles = ImageProfiles()
+        self.requests = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+
+    def process(self, screenshot, previous=None):
+        return self.pool.submit(self.process_now, screenshot, previous).result()
+
+    def process_now(self, screenshot, previous=None):
+        start = time.perf_counter()
+        key = profile_key(screenshot.shape[1], screenshot.shape[0], 0)
+        with self._lock:
+            self.requests += 1
+            image_params = self.image_profiles.get(key)
+        try:
+            # Requests from different clients would reuse each other's regions, so every region is read
+            image_params, output = vision.process_screenshot(screenshot, image_params, previous=previous, history=None)
+        except (ValueError, cv2.error):
+            # The profile is kept, process_screenshot already recalibrates full screenshots whose rooms moved
+            with self._lock:
+                self.failures += 1
+            raise
+        with self._lock:
+            calibrated = key not in self.image_profiles
+            self.image_profiles.put(key, image_params)
+        return {"vision_output": output, "calibrated": calibrated, "elapsed_ms": round((time.perf_counter() - start) * 1000, 3)}
+
+    def health(self):
+        with self._lock:
+            return {
+                "status": "ok",
+                "workers": self.workers,
+                "ocr_workers": vision.OCR_WORKERS,
+                "ocr_engine": get_engine().name,
+                "profiles": list(self.image_profiles.profiles),
+                "requests": self.requests,
+                "failures": self.failures,
+                "ocr_cache": {"entries": len(vision.OCR_CACHE.entries), "hits": vision.OCR_CACHE.hits, "misses": vision.OCR_CACHE.misses},
+            }
+
+    def close(self):
+        self.pool.shutdown(wait=True)
+
+
+def decode_frame(body: bytes, headers):
+    """
+    Returns the frame in the body as a BGR(A) array, see the module docstring for the formats
+    """
+    content_type = headers.get("Content-Type", "image/png").split(";")[0].strip()
+    if content_type == "application/octet-stream":
+        try:
+            width, height = int(headers["X-Width"]), int(headers["X-Height"])
+            channels = int(headers.get("X-Channels", 4))
+        except (KeyError, ValueError):
+            raise ValueError("Raw frames need X-Width and X-Height headers")
+        if len(body) != width * height * channels:
+            raise ValueError(f"Expected {width * height * channels} bytes for a {width}x{height}x{channels} frame, got {len(body)}")
+        return np.frombuffer(body, dtype=np.uint8).reshape(height, width, channels)
+    frame = cv2.imdecode(np.frombuffer(body, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if frame is None:
+        raise ValueError(f"Could not decode the body as an image ({content_type})")
+    return frame
+
+
+def make_handler(service: VisionService):
+    class VisionRequestHandler(BaseHTTPRequestHandler):
+        def send_json(self, status: int, data: dict):
+            body = json.dumps(data).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if urlparse(self.path).path == "/health":
+                self.send_json(200, service.health())
+            else:
+                self.send_json(404, {"error": f"Unknown path {self.path}"})
+
+        def do_POST(self):
+            if urlparse(self.path).path != "/vision":
+                self.send_json(404, {"error": f"Unknown path {self.path}"})
+                return
+            length = int(self.headers.get("Content-Length", 0))
+            if length <= 0 or length > MAX_BODY_BYTES:
+                self.send_json(413 if length > 0 else 400, {"error": f"Body must be between 1 and {MAX_BODY_BYTES} bytes"})
+                return
+            body = self.rfile.read(length)
+            try:
+                screenshot = decode_frame(body, self.headers)
+                previous = self.headers.get("X-Previous")
+                previous = json.loads(previous) if previous else None
+            except (ValueError, json.JSONDecodeError) as error:
+                self.send_json(400, {"error": str(error)})
+                return
+            try:
+                self.send_json(200, service.process(screenshot, previous))
+            except (ValueError, cv2.error) as error:
+                self.send_json(422, {"error": str(error)})
+
+        def log_message(self, format, *args):
+            pass # One line per request is too noisy under load
+
+    return VisionRequestHandler
+
+
+def create_server(service: VisionService, host: str = "127.0.0.1", port: int = 8765):
+    return ThreadingHTTPServer((host, port), make_handler(service))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless vision service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=2, help="Screenshots processed at the same time")
+    parser.add_argument("--ocr-workers", type=int, default=vision.OCR_WORKERS, help="Regions OCRed at the same time, shared by all screenshots")
+    parser.add_argument("--ocr-backend", default="auto", choices=["auto", "tesserocr", "pytesseract"])
+    parser.add_argument("--tesseract", default="", help="Path to tesseract.exe")
+    args = parser.parse_args()
+
+    if args.tesseract != "":
+        pytesseract.pytesseract.tesseract_cmd = args.tesseract
+    set_engine(create_engine(args.ocr_backend, args.tesseract))
+    vision.set_ocr_workers(args.ocr_workers)
+    vision.warm_up_ocr_workers()
+    vision.get_pixel_lut()
+
+    service = VisionService(args.workers)
+    server = create_server(service, args.host, args.port)
+    print(f"Vision service on http://{args.host}:{server.server_port} ({get_engine().name}, {args.workers} workers, {args.ocr_workers} OCR workers)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
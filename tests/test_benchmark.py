@@ -0,0 +1,57 @@
+import json
+import numpy as np
+import cv2
+
+from src.benchmark import Accuracy, score_output, run_benchmark, reset_vision_state
+from src import vision
+
+
+EXPECTED = {
+    "layout": {"0F2": {"Name": "ENTRANCE", "Connections": ["—"]}, "0F1": {"Name": "PITS", "Connections": ["—", "\\"]}},
+    "incursion": {"room": "PITS", "left_option": "POISON GARDEN", "right_option": "VAULT"},
+    "remaining": 1
+}
+
+
+def test_score_output():
+    accuracy = Accuracy()
+    output = json.loads(json.dumps(EXPECTED))
+    output["layout"]["0F1"]["Connections"] = ["\\", "—"] # Order does not matter
+    output["incursion"]["right_option"] = "VAULTS"
+    score_output(output, EXPECTED, accuracy)
+    summary = accuracy.summary()
+    assert summary["room_name"] == {"correct": 2, "total": 2, "accuracy": 1.0}
+    assert summary["connections"]["correct"] == 2
+    assert summary["incursion_right_option"]["correct"] == 0
+    assert summary["remaining"]["correct"] == 1
+
+
+def test_run_benchmark_records_failures(tmp_path):
+    cv2.imwrite(str(tmp_path / "empty.png"), np.zeros((90, 160, 3), dtype=np.uint8))
+    with open(tmp_path / "empty.json", "w") as f:
+        json.dump(EXPECTED, f)
+    cv2.imwrite(str(tmp_path / "unlabeled.png"), np.zeros((90, 160, 3), dtype=np.uint8))
+    original = vision.classify_pixels
+    report = run_benchmark(str(tmp_path))
+    assert vision.classify_pixels is original
+    assert report["screenshots"] == 1
+    assert len(report["failures"]) == 1
+    assert report["cold"]["stages"]["pixel_classification"]["calls"] >= 1
+    assert report["cold"]["stages"]["get_room_boxes"]["calls"] >= 1
+    assert report["cold"]["accuracy"]["room_name"]["accuracy"] == 0
+
+
+def test_templates_reset_for_each_run(tmp_path):
+    text_mask = np.full((60, 400), 255, dtype=np.uint8)
+    cv2.putText(text_mask, "VAULT", (10, 45), cv2.FONT_HERSHEY_SIMPLEX, 1.2, 0, 3)
+    classifier = vision.CLASSIFIERS["room"]
+    saved = classifier.to_arrays("room")
+    try:
+        classifier.clear()
+        classifier.enroll(text_mask, "VAULT")
+        run_benchmark(str(tmp_path))
+        assert len(classifier) == 1 # Loaded templates are put back after the benchmark
+        reset_vision_state()
+        assert len(classifier) == 0 # Templates enrolled by the cold run are not matched by the warm one
+    finally:
+        classifier.from_arrays(saved, "room")
@@ -0,0 +1,59 @@
+import numpy as np
+
+from src.capture import CaptureSession
+
+
+class FakeShot:
+    def __init__(self, region, value):
+        self.width = region["width"]
+        self.height = region["height"]
+        self.raw = bytearray(np.full((self.height, self.width, 4), value, dtype=np.uint8).tobytes())
+
+
+class FakeGrabber:
+    monitors = [{}, {"left": 0, "top": 0, "width": 8, "height": 6}]
+
+    def __init__(self):
+        self.grabs = 0
+
+    def grab(self, region):
+        self.grabs += 1
+        return FakeShot(region, self.grabs)
+
+
+def make_session(**kwargs):
+    session = CaptureSession(**kwargs)
+    session.sct = FakeGrabber()
+    return session
+
+
+def test_grab_reuses_ring_buffers():
+    session = make_session(ring_size=2)
+    region = {"left": 0, "top": 0, "width": 4, "height": 3}
+    frames = [session.grab(region) for _ in range(3)]
+    assert frames[0].image.shape == (3, 4, 4)
+    assert (frames[1].image == 2).all()
+    assert frames[2].image is frames[0].image # Overwritten by the third grab
+    assert (frames[0].image == 3).all()
+    assert [frame.sequence for frame in session.recent_frames()] == [3, 2]
+
+
+def test_least_recently_used_size_is_dropped():
+    session = make_session(max_sizes=2)
+    session.grab({"left": 0, "top": 0, "width": 4, "height": 3})
+    session.grab(session.monitors[1])
+    session.grab({"left": 0, "top": 0, "width": 4, "height": 3})
+    session.grab({"left": 0, "top": 0, "width": 2, "height": 2})
+    assert list(session.rings) == [(3, 4), (2, 2)]
+
+
+def test_warm_up_leaves_the_ring_alone():
+    session = make_session(ring_size=1)
+    region = {"left": 0, "top": 0, "width": 4, "height": 3}
+    frame = session.grab(region)
+    session.warm_up(region)
+    session.warm_up({"left": 0, "top": 0, "width": 2, "height": 2})
+    assert session.sct.grabs == 3
+    assert (frame.image == 1).all() # Still the frame being read
+    assert session.sequence == 1
+    assert (2, 2) in session.rings
@@ -0,0 +1,73 @@
+import pytest
+import numpy as np
+import cv2
+
+from src.classifier import TemplateClassifier, save_classifiers, load_classifiers
+
+
+def render(text, x_offset=10):
+    mask = np.full((60, 400), 255, dtype=np.uint8)
+    cv2.putText(mask, text, (x_offset, 45), cv2.FONT_HERSHEY_SIMPLEX, 1.2, 0, 3)
+    return mask
+
+
+@pytest.fixture()
+def classifier():
+    classifier = TemplateClassifier()
+    for name in ["HALL OF HEROES", "HALL OF LORDS", "PITS", "VAULT"]:
+        classifier.enroll(render(name), name)
+    return classifier
+
+
+def test_classify(classifier):
+    assert classifier.classify(render("HALL OF HEROES", x_offset=30))[0] == "HALL OF HEROES"
+    assert classifier.classify(render("PITS", x_offset=50))[0] == "PITS"
+    assert classifier.classify(render("SACRIFICIAL CHAMBER"))[0] is None
+    assert classifier.classify(np.full((60, 400), 255, dtype=np.uint8))[0] is None
+
+
+def test_classify_with_candidates(classifier):
+    # The candidates are off (the tracked temple drifted), so every label is considered
+    assert classifier.classify(render("PITS"), candidates=["VAULT"])[0] == "PITS"
+    assert classifier.classify(render("HALL OF HEROES"), candidates=["HALL OF LORDS", "VAULT"])[0] == "HALL OF HEROES"
+
+
+def test_candidates_tell_look_alikes_apart():
+    classifier = TemplateClassifier()
+    classifier.enroll(render("HALL OF LORDS"), "HALL OF LORDS")
+    classifier.enroll(render("HALL 0F LORDS"), "LOOK ALIKE")
+    assert classifier.classify(render("HALL OF LORDS"))[0] is None # Within the margin
+    assert classifier.classify(render("HALL OF LORDS"), candidates=["HALL OF LORDS"])[0] == "HALL OF LORDS"
+    # The look-alike matches better than the candidate, so the candidate is not forced
+    assert classifier.classify(render("HALL 0F LORDS"), candidates=["HALL OF LORDS"])[0] is None
+
+
+def test_enroll_skips_duplicates(classifier):
+    assert classifier.enroll(render("PITS", x_offset=40), "PITS") is False
+    assert len(classifier) == 4
+
+
+def test_save_and_load(classifier, tmp_path):
+    save_classifiers({"room": classifier}, tmp_path / "templates.npz")
+    loaded = TemplateClassifier()
+    load_classifiers({"room": loaded, "other": TemplateClassifier()}, tmp_path / "templates.npz")
+    assert len(loaded) == 4
+    assert loaded.classify(render("VAULT", x_offset=20))[0] == "VAULT"
+
+
+def test_load_skips_other_feature_size(classifier, tmp_path):
+    save_classifiers({"digit": classifier}, tmp_path / "templates.npz")
+    glyphs = TemplateClassifier(feature_size=(16, 24))
+    load_classifiers({"digit": glyphs}, tmp_path / "templates.npz")
+    assert len(glyphs) == 0
+
+
+def test_save_only_after_enroll(classifier, tmp_path):
+    path = tmp_path / "templates.npz"
+    assert save_classifiers({"room": classifier}, path) is True
+    assert save_classifiers({"room": classifier}, path) is False
+    loaded = TemplateClassifier()
+    load_classifiers({"room": loaded}, path)
+    assert save_classifiers({"room": loaded}, path) is False
+    loaded.enroll(render("SACRIFICIAL CHAMBER"), "SACRIFICIAL CHAMBER")
+    assert save_classifiers({"room": loaded}, path) is True
@@ -0,0 +1,62 @@
+import os
+
+from src.client_log import ClientLogTail
+
+
+def append(path, text):
+    with open(path, "ab") as f:
+        f.write(text.encode())
+
+
+def test_only_new_lines_are_read(tmp_path):
+    path = tmp_path / "Client.txt"
+    append(path, "old line\r\n")
+    with ClientLogTail(str(path)) as tail:
+        assert tail.read_lines() == []
+        append(path, "2024/01/01 12:00:00 Alva, Master Explorer: Let's go.\r\nsecond\r\n")
+        assert tail.read_lines() == ["2024/01/01 12:00:00 Alva, Master Explorer: Let's go.", "second"]
+        assert tail.read_lines() == []
+
+
+def test_partial_lines_wait_for_their_newline(tmp_path):
+    path = tmp_path / "Client.txt"
+    path.write_bytes(b"")
+    with ClientLogTail(str(path)) as tail:
+        append(path, "half a ")
+        assert tail.read_lines() == []
+        append(path, "line\r\nnext")
+        assert tail.read_lines() == ["half a line"]
+        append(path, "\n")
+        assert tail.read_lines() == ["next"]
+
+
+def test_truncated_and_replaced_files_are_read_from_the_start(tmp_path):
+    path = tmp_path / "Client.txt"
+    append(path, "a long line that is already there\n")
+    with ClientLogTail(str(path)) as tail:
+        path.write_bytes(b"short\n")
+        assert tail.read_lines() == ["short"]
+        replacement = tmp_path / "new.txt"
+        replacement.write_bytes(b"rotated\n")
+        os.replace(replacement, path)
+        assert tail.read_lines() == ["rotated"]
+
+
+def test_missing_file_is_followed_once_created(tmp_path):
+    path = tmp_path / "Client.txt"
+    with ClientLogTail(str(path)) as tail:
+        assert tail.read_lines() == []
+        append(path, "first\n")
+        assert tail.read_lines() == ["first"]
+
+
+def test_poll_interval_backs_off_while_quiet(tmp_path):
+    path = tmp_path / "Client.txt"
+    path.write_bytes(b"")
+    with ClientLogTail(str(path), min_interval=0.001, max_interval=0.004) as tail:
+        for _ in range(4):
+            assert tail.poll() == []
+        assert tail.interval == 0.004
+        append(path, "line\n")
+        assert tail.poll() == ["line"]
+        assert tail.interval == 0.001
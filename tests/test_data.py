@@ -0,0 +1,24 @@
+from src.data import ImageParams, ImageProfiles, profile_key
+
+
+def test_image_profiles():
+    profiles = ImageProfiles()
+    key = profile_key(2560, 1440, 1)
+    assert key not in profiles
+    assert profiles.get(key).cached is False
+    image_params = ImageParams(cached=True)
+    image_params.incursion_menu_rect["x"] = 1563
+    profiles.put(key, image_params)
+    profiles.put(profile_key(1920, 1080, 2), ImageParams()) # Not calibrated, not stored
+    assert ImageProfiles.from_dict(profiles.__dict__).get(key) == image_params
+    assert profile_key(1920, 1080, 2) not in profiles
+    profiles.invalidate(key)
+    assert key not in profiles
+
+
+def test_translated_image_params():
+    image_params = ImageParams(cached=True)
+    image_params.slots_to_xy["0F2"] = {"x": 100, "y": 200}
+    translated = image_params.translated(-10, -20)
+    assert translated.slots_to_xy["0F2"] == {"x": 90, "y": 180}
+    assert image_params.slots_to_xy["0F2"] == {"x": 100, "y": 200}
@@ -0,0 +1,35 @@
+import numpy as np
+
+from src.frame_diff import FrameHistory
+
+
+def test_unchanged_region_reuses_result():
+    history = FrameHistory()
+    text_mask = np.random.default_rng(0).integers(0, 2, (40, 120), dtype=np.uint8) * 255
+    assert history.lookup("room:1F0", text_mask) is None
+    history.store("room:1F0", text_mask, "VAULT")
+    noisy = text_mask.copy()
+    noisy[0, :3] = 255 - noisy[0, :3] # A few pixels on the edge of the text
+    assert history.lookup("room:1F0", noisy) == "VAULT"
+    assert history.lookup("room:1F1", text_mask) is None
+
+
+def test_changed_region_is_read_again():
+    history = FrameHistory()
+    text_mask = np.zeros((112, 337), dtype=np.uint8)
+    text_mask[40:65, 60:300] = 255 # Incursions Remaining
+    history.store("remaining", text_mask, 3)
+    changed = text_mask.copy()
+    changed[40:65, 31:33] = 255 # A new 2 pixel wide digit, a tiny fraction of the region and of its text
+    assert history.lookup("remaining", changed) is None
+    assert history.lookup("remaining", text_mask[:, :100]) is None # Different size
+    history.clear()
+    assert history.lookup("remaining", text_mask) is None
+
+
+def test_region_with_little_text():
+    history = FrameHistory()
+    text_mask = np.zeros((40, 120), dtype=np.uint8)
+    text_mask[10:13, 10:12] = 255
+    history.store("remaining", text_mask, 1)
+    assert history.lookup("remaining", np.zeros_like(text_mask)) is None # The only glyph is gone
@@ -0,0 +1,51 @@
+import pytest
+import difflib
+import random
+
+from src.matcher import FuzzyMatcher
+from src.vision import WORDS, DIGIT_WORDS, ROOM_WORDS
+
+
+@pytest.fixture()
+def matcher():
+    return FuzzyMatcher(WORDS)
+
+
+def test_match(matcher):
+    assert matcher.match("ASAGEWAYS ")[0] == "PASSAGEWAYS"
+    assert matcher.match("HALL OF HERDES")[0] == "HALL OF HEROES"
+    assert matcher.match("SANCTUM OF UNITV")[0] == "SANCTUM OF UNITY"
+    assert matcher.match("QQQQQQQQQQQQQQQ") == (None, pytest.approx(0, abs=0.2))
+
+
+def test_match_agrees_with_difflib(matcher):
+    for text in ["ASAGEWAYS", "DORYANIS INSTITUTE", "TOMB", "HAL OF LORD", "1O", "VAUT"]:
+        word, score = matcher.match(text)
+        assert word == difflib.get_close_matches(text, WORDS, n=1)[0]
+        assert score == pytest.approx(difflib.SequenceMatcher(None, text, word).ratio())
+
+
+def test_match_agrees_with_difflib_on_perturbed_words(matcher):
+    rng = random.Random(0)
+    texts = ["T1", " AUT", "WASJM"] # The trigram shortlist misses the best word for these
+    for _ in range(500):
+        text = list(rng.choice(WORDS))
+        for _ in range(rng.randint(1, 3)):
+            idx = rng.randrange(len(text))
+            edit = rng.choice(["delete", "insert", "replace"])
+            if edit == "delete" and len(text) > 1:
+                del text[idx]
+            elif edit == "insert":
+                text.insert(idx, rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ 0123456789"))
+            else:
+                text[idx] = rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ 0123456789")
+        texts.append("".join(text))
+    for text in texts:
+        expected = difflib.get_close_matches(text, WORDS, n=1)
+        assert matcher.match(text)[0] == (expected[0] if expected else None), text
+
+
+def test_match_with_candidates(matcher):
+    assert matcher.match("1", DIGIT_WORDS)[0] == "1"
+    assert matcher.match("PITS", DIGIT_WORDS)[0] is None
+    assert matcher.match("11", ROOM_WORDS)[0] is None
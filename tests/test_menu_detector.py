@@ -0,0 +1,64 @@
+import numpy as np
+import cv2
+
+from src.menu_detector import MenuDetector
+
+
+def make_frame(value=40, text_value=None):
+    hsv = np.full((180, 320, 3), (0, 0, value), dtype=np.uint8)
+    hsv[::8, :] = (15, 151, 204) # Room borders
+    if text_value is not None:
+        hsv[60:120, 100:220] = (0, 0, text_value)
+    return cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)
+
+
+def test_triggers_once_menu_settles():
+    detector = MenuDetector(on_menu=None, get_region=None)
+    closed = np.zeros((180, 320, 3), dtype=np.uint8)
+    assert detector.process_frame(closed) is False
+    assert detector.menu_open is False
+    assert detector.process_frame(make_frame()) is False # Just opened
+    assert detector.menu_open is True
+    assert detector.process_frame(make_frame()) is True
+    assert detector.process_frame(make_frame()) is False # Same state
+
+
+def test_triggers_again_when_menu_changes():
+    detector = MenuDetector(on_menu=None, get_region=None)
+    detector.process_frame(make_frame())
+    assert detector.process_frame(make_frame()) is True
+    assert detector.process_frame(make_frame(text_value=250)) is False
+    assert detector.process_frame(make_frame(text_value=250)) is True
+    detector.process_frame(np.zeros((180, 320, 3), dtype=np.uint8))
+    detector.process_frame(make_frame())
+    assert detector.process_frame(make_frame()) is True # Reopened
+
+
+class FakeShot:
+    def __init__(self, frame):
+        self.height, self.width = frame.shape[:2]
+        self.raw = cv2.cvtColor(frame, cv2.COLOR_BGR2BGRA).tobytes()
+
+
+class FakeGrabber:
+    def __init__(self, frame):
+        self.frame = frame
+        self.regions = []
+
+    def grab(self, region):
+        self.regions.append(region)
+        return FakeShot(self.frame)
+
+
+def test_poll_waits_for_a_region():
+    calls = []
+    region = None
+    detector = MenuDetector(on_menu=lambda: calls.append(True), get_region=lambda sct: region)
+    sct = FakeGrabber(make_frame())
+    detector.poll(sct)
+    assert sct.regions == [] # The temple's position is not known yet
+    region = {"left": 0, "top": 0, "width": 320, "height": 180}
+    detector.poll(sct)
+    detector.poll(sct)
+    assert len(sct.regions) == 2
+    assert calls == [True]
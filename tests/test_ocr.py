@@ -0,0 +1,14 @@
+import pytest
+
+from src.ocr import parse_config, create_engine, PytesseractEngine
+
+
+def test_parse_config():
+    psm, variables, init_variables = parse_config('-c tessedit_char_whitelist="ABC abc()\'" --psm 6 --user-words "C:\\TessConfig\\eng.user-words"')
+    assert psm == 6
+    assert variables == {"tessedit_char_whitelist": "ABC abc()'"}
+    assert init_variables == {"user_words_file": "C:\\TessConfig\\eng.user-words"}
+
+
+def test_create_engine():
+    assert isinstance(create_engine("pytesseract"), PytesseractEngine)
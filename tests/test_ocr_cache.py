@@ -0,0 +1,57 @@
+import pytest
+import numpy as np
+
+from src.ocr_cache import OCRCache, perceptual_hash
+
+
+@pytest.fixture()
+def text_mask():
+    mask = np.full((40, 200), 255, dtype=np.uint8)
+    mask[10:30, 20:60] = 0
+    mask[10:30, 80:180] = 0
+    return mask
+
+
+def test_perceptual_hash(text_mask):
+    noisy_mask = text_mask.copy()
+    noisy_mask[0, 0] = 0
+    other_mask = np.full((40, 200), 255, dtype=np.uint8)
+    other_mask[10:30, 20:180] = 0
+    assert perceptual_hash(text_mask) == perceptual_hash(noisy_mask)
+    assert perceptual_hash(text_mask) != perceptual_hash(other_mask)
+
+
+def test_lru_eviction(text_mask):
+    cache = OCRCache(max_size=2)
+    cache.put("a", "PITS")
+    cache.put("b", "VAULT")
+    cache.get("a")
+    cache.put("c", "TOMBS")
+    assert cache.get("b") is None
+    assert cache.get("a") == "PITS"
+    assert cache.key(text_mask, "--psm 6") != cache.key(text_mask, "--psm 7")
+
+
+def test_save_and_load(tmp_path, text_mask):
+    cache = OCRCache()
+    key = cache.key(text_mask, "--psm 6")
+    cache.put(key, "HALL OF HEROES")
+    cache.save(tmp_path / "ocr_cache.json")
+    loaded = OCRCache()
+    loaded.load(tmp_path / "ocr_cache.json")
+    assert loaded.get(key) == "HALL OF HEROES"
+
+
+def test_save_only_when_changed(tmp_path, text_mask):
+    path = tmp_path / "ocr_cache.json"
+    cache = OCRCache()
+    key = cache.key(text_mask, "--psm 6")
+    cache.put(key, "VAULT")
+    assert cache.save(path) is True
+    cache.put(key, "VAULT")
+    assert cache.save(path) is False
+    loaded = OCRCache()
+    loaded.load(path)
+    assert loaded.save(path) is False
+    loaded.put(key, "PITS")
+    assert loaded.save(path) is True
@@ -0,0 +1,89 @@
+import threading
+
+from src.pipeline import Pipeline
+
+
+def test_items_flow_through_stages():
+    results = []
+    collected = threading.Semaphore(0)
+
+    def collect(item):
+        results.append(item)
+        collected.release()
+
+    pipeline = Pipeline([("double", lambda item: item * 2), ("drop_odd", lambda item: item if item % 4 == 0 else None), ("collect", collect)])
+    pipeline.start()
+    pipeline.submit(2)
+    assert collected.acquire(timeout=5)
+    pipeline.submit(1) # Dropped by the second stage
+    pipeline.submit(4)
+    assert collected.acquire(timeout=5)
+    pipeline.stop()
+    assert results == [4, 8]
+
+
+def test_errors_do_not_stop_the_stage():
+    results = []
+    done = threading.Event()
+
+    def fail_on_one(item):
+        if item == 1:
+            raise ValueError("Bad item")
+        return item
+
+    pipeline = Pipeline([("check", fail_on_one), ("collect", lambda item: (results.append(item), done.set()) and None)])
+    pipeline.start()
+    pipeline.submit(1)
+    pipeline.submit(2)
+    assert done.wait(5)
+    pipeline.stop()
+    assert results == [2]
+
+
+def test_only_the_newest_request_is_processed():
+    started = threading.Event()
+    release = threading.Event()
+    results = []
+    done = threading.Event()
+
+    def slow(item):
+        started.set()
+        release.wait(5)
+        return item
+
+    def collect(item):
+        results.append(item)
+        if item == "newest":
+            done.set()
+
+    pipeline = Pipeline([("slow", slow), ("collect", collect)])
+    pipeline.start()
+    pipeline.submit("first")
+    assert started.wait(5)
+    for item in ["second", "third", "newest"]: # Queued while "first" is in flight
+        pipeline.submit(item)
+    release.set()
+    assert done.wait(5)
+    pipeline.stop()
+    assert results == ["newest"] # "first" went stale in flight, the rest were coalesced
+
+
+def test_background_work_never_replaces_a_request():
+    release = threading.Event()
+    results = []
+    done = threading.Event()
+
+    def collect(item):
+        results.append(item)
+        if item == "request":
+            done.set()
+
+    pipeline = Pipeline([("wait", lambda item: release.wait(5) and item), ("collect", collect)])
+    pipeline.start()
+    pipeline.submit("blocker")
+    pipeline.submit("request")
+    pipeline.submit("warm_up", generation=pipeline.generation) # Queued behind the request
+    release.set()
+    assert done.wait(5)
+    pipeline.stop()
+    assert results == ["request"]
@@ -0,0 +1,46 @@
+import pytest
+import json
+import numpy as np
+
+from src.prices import PriceStore, room_vector, expected_value
+from src.constants import ROOM_DATA
+from src.room import Room
+
+
+@pytest.fixture()
+def store(tmp_path):
+    with open(tmp_path / "old.json", "w") as f:
+        json.dump({"timestamp": "2024-01-01T00:00:00", "prices": {"Locus of Corruption": 100, "DORYANI'S INSTITUTE": 40}}, f)
+    with open(tmp_path / "new.csv", "w") as f:
+        f.write("timestamp,name,price\n")
+        f.write("2024-01-02T00:00:00,LOCUS OF CORRUPTION,150\n")
+        f.write("2024-01-02T00:00:00,Incursion Scarab of Timelines,10\n")
+    return PriceStore(str(tmp_path), ttl=60)
+
+
+def test_latest_snapshot_wins(store):
+    assert store.get("LOCUS OF CORRUPTION") == 150
+    assert store.get("Doryani's Institute") == 40
+    assert store.get("Incursion Scarab of Timelines") == 10
+    assert store.get("FACTORY") == 0
+
+
+def test_refresh_respects_ttl(store, tmp_path):
+    store.refresh()
+    with open(tmp_path / "newest.json", "w") as f:
+        json.dump({"timestamp": 1800000000, "prices": {"LOCUS OF CORRUPTION": 200}}, f)
+    assert store.refresh() is False
+    assert store.get("LOCUS OF CORRUPTION") == 150
+    store.ttl = 0
+    assert store.refresh() is True
+    assert store.get("LOCUS OF CORRUPTION") == 200
+
+
+def test_expected_value(store):
+    prices = store.room_price_vector()
+    assert len(prices) == len(ROOM_DATA)
+    chronicles = np.stack([
+        room_vector([Room("CR", 3), Room("BR", 3)]),
+        room_vector([Room("GM", 3), Room("UN", 1)]),
+    ])
+    assert expected_value(chronicles, prices) == 95
@@ -0,0 +1,38 @@
+import json
+
+from src import tracing
+from src.tracing import span, enable_tracing, disable_tracing, NULL_SPAN
+
+
+def test_span_is_free_when_disabled():
+    disable_tracing()
+    assert span("ocr", shape=(10, 10)) is NULL_SPAN
+    with span("ocr"):
+        pass
+
+
+def test_chrome_trace(tmp_path):
+    tracer = enable_tracing(str(tmp_path), "chrome")
+    with span("take_screenshot"):
+        with span("ocr", shape=(20, 80)):
+            pass
+    disable_tracing()
+    with open(tracer.path) as f:
+        events = json.loads(f.read().rstrip().rstrip(",") + "]")
+    assert [event["name"] for event in events] == ["ocr", "take_screenshot"]
+    assert events[0]["args"] == {"shape": [20, 80]}
+    assert events[1]["dur"] >= events[0]["dur"]
+
+
+def test_jsonl_trace_rolls_over(tmp_path):
+    tracer = enable_tracing(str(tmp_path), "jsonl", max_bytes=500)
+    for idx in range(20):
+        with span("capture", idx=idx):
+            pass
+    disable_tracing()
+    with open(tracer.path + ".1") as f:
+        rolled = [json.loads(line) for line in f]
+    with open(tracer.path) as f:
+        current = [json.loads(line) for line in f]
+    assert len(rolled) > 0
+    assert (rolled + current)[-1]["args"]["idx"] == 19
@@ -1,99 +1,283 @@
-import pytest
-import cv2
-
-from src.vision import *
-
-DATA_DIR = Path(__file__).resolve().parent / "Images"
-pytesseract.pytesseract.tesseract_cmd = r"C:/Program Files/Tesseract-OCR/tesseract.exe"
-
-
-@pytest.fixture()
-def complete_test_image():
-    image = cv2.imread(DATA_DIR / "CompleteTemple.png")[..., ::-1]
-    return cv2.cvtColor(image, cv2.COLOR_RGB2HSV)
-
-
-def test_post_ocr_correction():
-    output = post_ocr_correction("ASAGEWAYS\n)")
-    assert output == "PASSAGEWAYS"
-
-
-def test_get_room_boxes(complete_test_image):
-    output = get_room_boxes(complete_test_image)
-    assert output == [(1166, 896, 228, 112), (1454, 874, 217, 99), (883, 868, 228, 112), (1589, 729, 229, 111), (1307, 729, 228, 111), (1024, 729, 229, 111), (741, 729, 229, 111), (1448, 589, 229, 112), (1166, 589, 228, 112), (883, 589, 228, 112), (1307, 450, 228, 111), (1024, 450, 229, 111), (1166, 309, 228, 112)]
-    extra_room_image = complete_test_image
-    extra_room_image[896:1008, 546:775] = complete_test_image[896:1008, 1166:1395]
-    with pytest.raises(ValueError, match="Expected 13 room boxes, got 14"):
-        get_room_boxes(extra_room_image)
-    empty_image = complete_test_image
-    empty_image[:, :] = (0, 0, 0)
-    with pytest.raises(ValueError):
-        get_room_boxes(empty_image)
-
-
-def test_get_image_parameters(complete_test_image):
-    output = get_image_parameters(complete_test_image)
-    assert output == {'room_details': {'room_width': 229, 'room_height': 112, 'horizontal_gap': 54, 'vertical_gap': 29}, 'slots_to_xy': {'0F2': {'x': 1166, 'y': 896}, '0F1': {'x': 1454, 'y': 867}, '0F3': {'x': 883, 'y': 868}, '1F0': {'x': 1589, 'y': 729}, '1F1': {'x': 1307, 'y': 729}, '1F2': {'x': 1024, 'y': 729}, '1F3': {'x': 741, 'y': 729}, '2F0': {'x': 1448, 'y': 589}, '2F1': {'x': 1166, 'y': 589}, '2F2': {'x': 883, 'y': 589}, '3F0': {'x': 1307, 'y': 450}, '3F1': {'x': 1024, 'y': 450}, '4F0': {'x': 1166, 'y': 309}}, 'incursion_menu_rect': {'x': 1563, 'y': 56, 'w': 648, 'h': 506}, 'incursions_remaining_rect': {'x': 1112, 'y': 1014, 'w': 337, 'h': 112}, 'cached': 1}
-    empty_image = complete_test_image
-    empty_image[:, :] = (0, 0, 0)
-    with pytest.raises(ValueError):
-        get_room_boxes(empty_image)
-
-
-def test_read_image_using_saved_params_full_temple(complete_test_image):
-    # Need more testing options for missing submenu/remaining
-    cache = get_image_parameters(complete_test_image)
-    full_temple = read_image_using_saved_params(complete_test_image, cache)
-    assert full_temple == {'layout': {'0F2': {'Name': 'ENTRANCE', 'Connections': ['—']}, '0F1': {'Name': 'PITS', 'Connections': ['—', '\\']}, '0F3': {'Name': 'HALL OF HEROES', 'Connections': ['\\']}, '1F0': {'Name': 'SANCTUM OF UNITY', 'Connections': ['—', '\\']}, '1F1': {'Name': "SURVEYOR'S STUDY", 'Connections': []}, '1F2': {'Name': 'HYBRIDISATION CHAMBER', 'Connections': ['/', '—']}, '1F3': {'Name': 'GLITTERING HALLS', 'Connections': []}, '2F0': {'Name': "DORYANI'S INSTITUTE", 'Connections': ['/', '—']}, '2F1': {'Name': 'HALL OF LORDS', 'Connections': ['/', '\\']}, '2F2': {'Name': 'SPARRING ROOM', 'Connections': ['/']}, '3F0': {'Name': 'POOLS OF RESTORATION', 'Connections': ['/', '\\']}, '3F1': {'Name': 'LIGHTNING WORKSHOP', 'Connections': []}, '4F0': {'Name': 'APEX OF ATZOATL', 'Connections': []}}, 'incursion': {'room': 'PITS', 'left_option': 'POISON GARDEN', 'right_option': 'VAULT'}, 'remaining': 1}
-    empty_image = complete_test_image
-    empty_image[:, :] = (0, 0, 0)
-    with pytest.raises(ValueError):
-        get_room_boxes(empty_image)
-
-
-def test_read_image_using_saved_params_not_continuous(complete_test_image):
-    cache = get_image_parameters(complete_test_image)
-    previous = {"remaining": 3, "slot": "0F1"}
-    not_continuous = read_image_using_saved_params(complete_test_image, cache, previous)
-    assert not_continuous == {'layout': {'0F2': {'Name': 'ENTRANCE', 'Connections': ['—']}, '0F1': {'Name': 'PITS', 'Connections': ['—', '\\']}, '0F3': {'Name': 'HALL OF HEROES', 'Connections': ['\\']}, '1F0': {'Name': 'SANCTUM OF UNITY', 'Connections': ['—', '\\']}, '1F1': {'Name': "SURVEYOR'S STUDY", 'Connections': []}, '1F2': {'Name': 'HYBRIDISATION CHAMBER', 'Connections': ['/', '—']}, '1F3': {'Name': 'GLITTERING HALLS', 'Connections': []}, '2F0': {'Name': "DORYANI'S INSTITUTE", 'Connections': ['/', '—']}, '2F1': {'Name': 'HALL OF LORDS', 'Connections': ['/', '\\']}, '2F2': {'Name': 'SPARRING ROOM', 'Connections': ['/']}, '3F0': {'Name': 'POOLS OF RESTORATION', 'Connections': ['/', '\\']}, '3F1': {'Name': 'LIGHTNING WORKSHOP', 'Connections': []}, '4F0': {'Name': 'APEX OF ATZOATL', 'Connections': []}}, 'incursion': {'room': 'PITS', 'left_option': 'POISON GARDEN', 'right_option': 'VAULT'}, 'remaining': 1}
-
-
-def test_read_image_using_saved_params_continuous(complete_test_image):
-    cache = get_image_parameters(complete_test_image)
-    previous = {"remaining": 2, "slot": "0F1"}
-    not_continuous = read_image_using_saved_params(complete_test_image, cache, previous)
-    assert not_continuous == {'incursion': {'left_option': 'POISON GARDEN', 'right_option': 'VAULT', 'room': 'PITS'}, 'layout': {'0F1': {'Connections': ['—', '\\', 'r—'], 'Name': 'PITS'}}, 'remaining': 1}
-
-
-# def test_get_text_mask()
-# TODO: CHECK FOR WHEN THE TEXT MASK FINDS NOTHING
-
-
-def test_read_incursion_submenu():
-    menu_image = cv2.imread(DATA_DIR / "Submenu.png")[..., ::-1]
-    menu_image = cv2.cvtColor(menu_image, cv2.COLOR_RGB2HSV)
-    output = read_incursion_submenu(menu_image)
-    assert output == {'left_option': 'POISON GARDEN', 'right_option': 'VAULT', 'room': 'PITS'}
-
-
-def test_read_incursions_remaining():
-    rem_image = cv2.imread(DATA_DIR / "Remaining.png")[..., ::-1]
-    rem_image = cv2.cvtColor(rem_image, cv2.COLOR_RGB2HSV)
-    output = read_incursions_remaining(rem_image)
-    assert output == 1
-
-
-def test_read_room_text():
-    room_image = cv2.imread(DATA_DIR / "Room.png")[..., ::-1]
-    room_image = cv2.cvtColor(room_image, cv2.COLOR_RGB2HSV)
-    output = read_room_text(room_image)
-    assert output == "HALL OF HEROES"
-
-
-def test_connection_present():
-    connection_image = cv2.imread(DATA_DIR / "Connection.png")[..., ::-1]
-    connection_image = cv2.cvtColor(connection_image, cv2.COLOR_RGB2HSV)
-    present_image = connection_image[1:29]
-    not_present_image = connection_image[29:140]
-    assert connection_present(present_image) == True
-    assert connection_present(not_present_image) == False
+import pytest
+import cv2
+
+from src.vision import *
+from src.ocr import OCREngine, set_engine
+
+DATA_DIR = Path(__file__).resolve().parent / "Images"
+pytesseract.pytesseract.tesseract_cmd = r"C:/Program Files/Tesseract-OCR/tesseract.exe"
+
+
+@pytest.fixture()
+def complete_test_image():
+    image = cv2.imread(DATA_DIR / "CompleteTemple.png")[..., ::-1]
+    return cv2.cvtColor(image, cv2.COLOR_RGB2HSV)
+
+
+@pytest.fixture()
+def small_temple_params():
+    # 40x20 rooms that fit in a 260x200 image, small enough to draw in the tests
+    return ImageParams.from_dict({
+        "room_details": {"room_width": 40, "room_height": 20, "horizontal_gap": 10, "vertical_gap": 6},
+        "slots_to_xy": {slot: {"x": 200 - 50 * int(slot[-1]) - 25 * int(slot[0]), "y": 150 - 26 * int(slot[0])} for slot in ImageParams().slots_to_xy},
+        "incursion_menu_rect": {"x": 10, "y": 10, "w": 60, "h": 40},
+        "incursions_remaining_rect": {"x": 10, "y": 60, "w": 60, "h": 20},
+        "cached": True
+    })
+
+
+def test_post_ocr_correction():
+    output = post_ocr_correction("ASAGEWAYS\n)")
+    assert output == "PASSAGEWAYS"
+
+
+def test_get_room_boxes(complete_test_image):
+    output = get_room_boxes(complete_test_image)
+    assert output == [(1166, 896, 228, 112), (1454, 874, 217, 99), (883, 868, 228, 112), (1589, 729, 229, 111), (1307, 729, 228, 111), (1024, 729, 229, 111), (741, 729, 229, 111), (1448, 589, 229, 112), (1166, 589, 228, 112), (883, 589, 228, 112), (1307, 450, 228, 111), (1024, 450, 229, 111), (1166, 309, 228, 112)]
+    extra_room_image = complete_test_image
+    extra_room_image[896:1008, 546:775] = complete_test_image[896:1008, 1166:1395]
+    with pytest.raises(ValueError, match="Expected 13 room boxes, got 14"):
+        get_room_boxes(extra_room_image)
+    empty_image = complete_test_image
+    empty_image[:, :] = (0, 0, 0)
+    with pytest.raises(ValueError):
+        get_room_boxes(empty_image)
+
+
+def test_get_image_parameters(complete_test_image):
+    output = get_image_parameters(complete_test_image)
+    assert output == {'room_details': {'room_width': 229, 'room_height': 112, 'horizontal_gap': 54, 'vertical_gap': 29}, 'slots_to_xy': {'0F2': {'x': 1166, 'y': 896}, '0F1': {'x': 1454, 'y': 867}, '0F3': {'x': 883, 'y': 868}, '1F0': {'x': 1589, 'y': 729}, '1F1': {'x': 1307, 'y': 729}, '1F2': {'x': 1024, 'y': 729}, '1F3': {'x': 741, 'y': 729}, '2F0': {'x': 1448, 'y': 589}, '2F1': {'x': 1166, 'y': 589}, '2F2': {'x': 883, 'y': 589}, '3F0': {'x': 1307, 'y': 450}, '3F1': {'x': 1024, 'y': 450}, '4F0': {'x': 1166, 'y': 309}}, 'incursion_menu_rect': {'x': 1563, 'y': 56, 'w': 648, 'h': 506}, 'incursions_remaining_rect': {'x': 1112, 'y': 1014, 'w': 337, 'h': 112}, 'cached': 1}
+    empty_image = complete_test_image
+    empty_image[:, :] = (0, 0, 0)
+    with pytest.raises(ValueError):
+        get_room_boxes(empty_image)
+
+
+def test_read_image_using_saved_params_full_temple(complete_test_image):
+    # Need more testing options for missing submenu/remaining
+    cache = get_image_parameters(complete_test_image)
+    full_temple = read_image_using_saved_params(complete_test_image, cache)
+    assert full_temple == {'layout': {'0F2': {'Name': 'ENTRANCE', 'Connections': ['—']}, '0F1': {'Name': 'PITS', 'Connections': ['—', '\\']}, '0F3': {'Name': 'HALL OF HEROES', 'Connections': ['\\']}, '1F0': {'Name': 'SANCTUM OF UNITY', 'Connections': ['—', '\\']}, '1F1': {'Name': "SURVEYOR'S STUDY", 'Connections': []}, '1F2': {'Name': 'HYBRIDISATION CHAMBER', 'Connections': ['/', '—']}, '1F3': {'Name': 'GLITTERING HALLS', 'Connections': []}, '2F0': {'Name': "DORYANI'S INSTITUTE", 'Connections': ['/', '—']}, '2F1': {'Name': 'HALL OF LORDS', 'Connections': ['/', '\\']}, '2F2': {'Name': 'SPARRING ROOM', 'Connections': ['/']}, '3F0': {'Name': 'POOLS OF RESTORATION', 'Connections': ['/', '\\']}, '3F1': {'Name': 'LIGHTNING WORKSHOP', 'Connections': []}, '4F0': {'Name': 'APEX OF ATZOATL', 'Connections': []}}, 'incursion': {'room': 'PITS', 'left_option': 'POISON GARDEN', 'right_option': 'VAULT'}, 'remaining': 1}
+    empty_image = complete_test_image
+    empty_image[:, :] = (0, 0, 0)
+    with pytest.raises(ValueError):
+        get_room_boxes(empty_image)
+
+
+def test_read_image_using_saved_params_not_continuous(complete_test_image):
+    cache = get_image_parameters(complete_test_image)
+    previous = {"remaining": 3, "slot": "0F1"}
+    not_continuous = read_image_using_saved_params(complete_test_image, cache, previous)
+    assert not_continuous == {'layout': {'0F2': {'Name': 'ENTRANCE', 'Connections': ['—']}, '0F1': {'Name': 'PITS', 'Connections': ['—', '\\']}, '0F3': {'Name': 'HALL OF HEROES', 'Connections': ['\\']}, '1F0': {'Name': 'SANCTUM OF UNITY', 'Connections': ['—', '\\']}, '1F1': {'Name': "SURVEYOR'S STUDY", 'Connections': []}, '1F2': {'Name': 'HYBRIDISATION CHAMBER', 'Connections': ['/', '—']}, '1F3': {'Name': 'GLITTERING HALLS', 'Connections': []}, '2F0': {'Name': "DORYANI'S INSTITUTE", 'Connections': ['/', '—']}, '2F1': {'Name': 'HALL OF LORDS', 'Connections': ['/', '\\']}, '2F2': {'Name': 'SPARRING ROOM', 'Connections': ['/']}, '3F0': {'Name': 'POOLS OF RESTORATION', 'Connections': ['/', '\\']}, '3F1': {'Name': 'LIGHTNING WORKSHOP', 'Connections': []}, '4F0': {'Name': 'APEX OF ATZOATL', 'Connections': []}}, 'incursion': {'room': 'PITS', 'left_option': 'POISON GARDEN', 'right_option': 'VAULT'}, 'remaining': 1}
+
+
+def test_read_image_using_saved_params_continuous(complete_test_image):
+    cache = get_image_parameters(complete_test_image)
+    previous = {"remaining": 2, "slot": "0F1"}
+    not_continuous = read_image_using_saved_params(complete_test_image, cache, previous)
+    assert not_continuous == {'incursion': {'left_option': 'POISON GARDEN', 'right_option': 'VAULT', 'room': 'PITS'}, 'layout': {'0F1': {'Connections': ['—', '\\'], 'Name': 'PITS'}}, 'remaining': 1}
+
+
+# def test_get_text_mask()
+# TODO: CHECK FOR WHEN THE TEXT MASK FINDS NOTHING
+
+
+def test_read_incursion_submenu():
+    menu_image = cv2.imread(DATA_DIR / "Submenu.png")[..., ::-1]
+    menu_image = cv2.cvtColor(menu_image, cv2.COLOR_RGB2HSV)
+    output = read_incursion_submenu(menu_image)
+    assert output == {'left_option': 'POISON GARDEN', 'right_option': 'VAULT', 'room': 'PITS'}
+
+
+def test_read_incursions_remaining():
+    rem_image = cv2.imread(DATA_DIR / "Remaining.png")[..., ::-1]
+    rem_image = cv2.cvtColor(rem_image, cv2.COLOR_RGB2HSV)
+    output = read_incursions_remaining(rem_image)
+    assert output == 1
+
+
+def test_read_room_text():
+    room_image = cv2.imread(DATA_DIR / "Room.png")[..., ::-1]
+    room_image = cv2.cvtColor(room_image, cv2.COLOR_RGB2HSV)
+    output = read_room_text(room_image)
+    assert output == "HALL OF HEROES"
+
+
+def test_stitch_text_masks():
+    masks = [np.zeros((40, 100), dtype=np.uint8), np.zeros((60, 300), dtype=np.uint8)]
+    page, spans = stitch_text_masks(masks)
+    assert page.shape == (100 + BATCH_SEPARATOR, 300)
+    assert spans == [(0, 40), (40 + BATCH_SEPARATOR, 100 + BATCH_SEPARATOR)]
+    assert (page[40:40 + BATCH_SEPARATOR] == 255).all()
+    assert (page[:40, 100:] == 255).all()
+
+
+def test_connection_present():
+    connection_image = cv2.imread(DATA_DIR / "Connection.png")[..., ::-1]
+    connection_image = cv2.cvtColor(connection_image, cv2.COLOR_RGB2HSV)
+    present_image = connection_image[1:29]
+    not_present_image = connection_image[29:140]
+    assert connection_present(present_image) == True
+    assert connection_present(not_present_image) == False
+
+
+def test_get_text_masks():
+    color = tuple(int(c) for c in (np.array(ROOM_TEXT_RANGE[0]) + ROOM_TEXT_RANGE[1]) // 2)
+    crops = []
+    for idx, (text, shape) in enumerate([("VAULT", (60, 200)), ("HALL OF LORDS", (60, 200)), ("PITS", (50, 120))]):
+        crop = np.zeros(shape + (3,), dtype=np.uint8)
+        cv2.putText(crop, text, (5, 40), cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
+        crop[5:7, 100:103] = color # Noise above the text
+        crops.append(crop)
+    crops.append(np.zeros((60, 200, 3), dtype=np.uint8)) # No text
+    text_masks = get_text_masks(crops, ROOM_TEXT_RANGE, reduce_noise=True)
+    for crop, text_mask in zip(crops[:-1], text_masks):
+        assert (text_mask == get_text_mask(crop, ROOM_TEXT_RANGE, reduce_noise=True)).all()
+    assert (text_masks[0] < 128).any()
+    assert text_masks[-1] is None
+    with pytest.raises(ValueError):
+        get_text_mask(crops[-1], ROOM_TEXT_RANGE, reduce_noise=True)
+    assert text_masks[0].shape[0] < 2 * (crops[0].shape[0] + 20) # Cropped to the text
+
+
+def test_read_door_bitmask(small_temple_params):
+    cache = small_temple_params
+    hsv_image = np.zeros((200, 260, 3), dtype=np.uint8)
+    x, y, w, h = get_door_regions(cache)[("1F1", "—")]
+    hsv_image[y + h // 2, x + w // 2] = (30, 100, 200)
+    original = hsv_image.copy()
+    bitmask = read_door_bitmask(hsv_image, cache)
+    assert bitmask == 1 << DOOR_LIST.index(("1F1", "1F2"))
+    assert get_slot_connections(bitmask, "1F1") == ["—"]
+    assert get_slot_connections(bitmask, "1F2") == []
+    assert get_slot_connections(bitmask, "1F2", right_side=True) == ["r—"]
+    assert (hsv_image == original).all()
+
+
+def test_geometry_matches(small_temple_params):
+    cache = small_temple_params
+    border = tuple(int(c) for c in (np.array(ROOM_BORDER_RANGES["Open"][0]) + ROOM_BORDER_RANGES["Open"][1]) // 2)
+    hsv_image = np.zeros((200, 260, 3), dtype=np.uint8)
+    for xy in cache.slots_to_xy.values():
+        cv2.rectangle(hsv_image, (xy["x"], xy["y"]), (xy["x"] + 39, xy["y"] + 19), border, 1)
+    assert geometry_matches(hsv_image, cache)
+    assert geometry_matches(hsv_image, cache.translated(1, 0)) # Within tolerance
+    assert not geometry_matches(hsv_image, cache.translated(8, 0))
+    assert temple_visible(hsv_image, cache.translated(8, 0)) # Moved, not closed
+    assert not temple_visible(np.zeros_like(hsv_image), cache)
+
+
+def test_process_screenshot_failures(small_temple_params, monkeypatch):
+    cache = small_temple_params
+    def no_ocr(text_mask, config):
+        raise AssertionError("Regions without text should not be OCRed")
+    monkeypatch.setattr("src.vision.image_to_string", no_ocr)
+    FRAME_HISTORY.clear()
+    screenshot = np.zeros((200, 260, 4), dtype=np.uint8) # Menu closed
+    with pytest.raises(TempleNotVisibleError):
+        process_screenshot(screenshot, cache, origin=(0, 0))
+    with pytest.raises(TempleNotVisibleError):
+        process_screenshot(screenshot, ImageParams())
+
+    border_hsv = (np.array(ROOM_BORDER_RANGES["Open"][0]) + ROOM_BORDER_RANGES["Open"][1]) // 2
+    border = tuple(int(c) for c in cv2.cvtColor(border_hsv.astype(np.uint8).reshape(1, 1, 3), cv2.COLOR_HSV2BGR)[0, 0]) + (255,)
+    for xy in cache.slots_to_xy.values():
+        cv2.rectangle(screenshot, (xy["x"] + 8, xy["y"]), (xy["x"] + 47, xy["y"] + 19), border, 1)
+    with pytest.raises(LayoutChangedError):
+        process_screenshot(screenshot, cache, origin=(0, 0))
+    FRAME_HISTORY.clear()
+
+
+def test_classify_pixels():
+    hsv = np.random.default_rng(0).integers(0, 256, (60, 80, 3), dtype=np.uint8)
+    for idx, hsv_range in enumerate(PIXEL_CLASS_RANGES): # Some pixels of every class
+        hsv[idx, :20] = hsv_range[1]
+    screenshot = cv2.cvtColor(cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR), cv2.COLOR_BGR2BGRA)
+    hsv = cv2.cvtColor(screenshot[..., :3], cv2.COLOR_BGR2HSV)
+    classes = classify_pixels(screenshot)
+    for hsv_range in PIXEL_CLASS_RANGES:
+        assert (in_range(classes, hsv_range) == cv2.inRange(hsv, hsv_range[0], hsv_range[1])).all()
+    assert (classify_pixels(screenshot[..., :3]) == classes).all()
+    partial = classify_pixels(screenshot, [(10, 5, 20, 30)])
+    assert (partial[5:35, 10:30] == classes[5:35, 10:30]).all()
+    assert (partial[:5] == 0).all()
+    masks = get_text_masks([classes[:30, :40], classes[30:, 40:]], ROOM_TEXT_RANGE, reduce_noise=True)
+    for mask, expected in zip(masks, get_text_masks([hsv[:30, :40], hsv[30:, 40:]], ROOM_TEXT_RANGE, reduce_noise=True)):
+        assert (mask == expected).all()
+
+
+def render_text_mask(text, x_offset=10):
+    mask = np.full((70, 500), 255, dtype=np.uint8)
+    cv2.putText(mask, text, (x_offset, 50), cv2.FONT_HERSHEY_SIMPLEX, 1.2, 0, 3)
+    return mask
+
+
+def test_split_number_glyphs():
+    assert len(split_number_glyphs(render_text_mask("12 INCURSIONS REMAINING"))) == 2
+    assert len(split_number_glyphs(render_text_mask("7 INCURSIONS REMAINING"))) == 1
+    assert split_number_glyphs(np.full((70, 500), 255, dtype=np.uint8)) == []
+
+
+def test_read_remaining_digits():
+    classifier = TemplateClassifier(feature_size=(16, 24))
+    assert read_remaining_digits(render_text_mask("3 INCURSIONS REMAINING"), classifier) == (None, 0.0)
+    for digit in "0123456789":
+        classifier.enroll(render_text_mask(digit), digit)
+    for remaining in [1, 3, 8, 10, 12]:
+        output, confidence = read_remaining_digits(render_text_mask(f"{remaining} INCURSIONS REMAINING", x_offset=40), classifier)
+        assert output == remaining
+        assert confidence > 0.9
+    assert read_remaining_digits(render_text_mask("13 INCURSIONS REMAINING"), classifier)[0] is None # Not a valid count
+
+
+def test_match_candidates():
+    assert match_candidates("VAUL", ["VAULT", "PITS"], ROOM_WORDS) == ("VAULT", pytest.approx(0.889, abs=1e-3))
+    assert match_candidates("HALL OF LORDS", ["VAULT", "PITS"], ROOM_WORDS)[0] == "HALL OF LORDS" # Not a candidate
+    assert match_candidates("HALL OF LORD", None, ROOM_WORDS)[0] == "HALL OF LORDS"
+
+
+def test_warm_up_ocr_workers():
+    calls = []
+    class RecordingEngine(OCREngine):
+        def image_to_string(self, image, config=""):
+            calls.append((threading.get_ident(), config))
+            return ""
+    previous = get_engine()
+    set_engine(RecordingEngine())
+    try:
+        warm_up_ocr_workers()
+    finally:
+        set_engine(previous)
+    threads = {thread for thread, _ in calls}
+    assert len(threads) == OCR_WORKERS
+    for thread in threads: # Every worker creates the Tesseract APIs of every config it will read with
+        assert [config for caller, config in calls if caller == thread] == WARM_UP_TESS_CONFIGS
+
+
+def test_frame_history_sees_a_single_glyph():
+    FRAME_HISTORY.clear()
+    remaining = np.zeros((112, 337, 3), dtype=np.uint8)
+    remaining[40:65, 25:312] = cv2.imread(DATA_DIR / "Remaining.png")
+    classes = classify_pixels(remaining)
+    FRAME_HISTORY.store("remaining", history_mask("remaining", classes), 1)
+    assert FRAME_HISTORY.lookup("remaining", history_mask("remaining", classes.copy())) == 1
+    digit = np.flatnonzero(history_mask("remaining", classes).any(axis=0))[0]
+    erased = remaining.copy()
+    erased[:, digit:digit + 8] = 0 # The 1 of "1 Incursions Remaining"
+    assert FRAME_HISTORY.lookup("remaining", history_mask("remaining", classify_pixels(erased))) is None
+
+    submenu = cv2.imread(DATA_DIR / "Submenu.png")
+    classes = classify_pixels(submenu)
+    FRAME_HISTORY.store("incursion", history_mask("incursion", classes), "state")
+    title = submenu.copy()
+    title[:submenu.shape[0] // 5] = 0 # The chosen room's name
+    assert FRAME_HISTORY.lookup("incursion", history_mask("incursion", classify_pixels(title))) is None
+    FRAME_HISTORY.clear()
+
+
+def test_submit_if_changed_without_history():
+    region = np.zeros((20, 40), dtype=np.uint8)
+    history = FrameHistory()
+    assert submit_if_changed(get_ocr_pool(), "remaining", region, lambda region: 3, history).result() == 3
+    assert submit_if_changed(get_ocr_pool(), "remaining", region, lambda region: 4, history).result() == 3 # Unchanged
+    assert submit_if_changed(get_ocr_pool(), "remaining", region, lambda region: 4, None).result() == 4
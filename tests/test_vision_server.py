@@ -0,0 +1,53 @@
+import json
+import threading
+import urllib.request
+import urllib.error
+import pytest
+import numpy as np
+import cv2
+
+from src.vision_server import VisionService, create_server, decode_frame
+
+
+@pytest.fixture()
+def server():
+    service = VisionService(workers=1)
+    server = create_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+    service.close()
+
+
+def post(url, body, headers):
+    request = urllib.request.Request(url + "/vision", data=body, headers=headers, method="POST")
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as error:
+        return error.code, json.load(error)
+
+
+def test_decode_frame():
+    frame = np.arange(2 * 3 * 4, dtype=np.uint8).reshape(2, 3, 4)
+    headers = {"Content-Type": "application/octet-stream", "X-Width": "3", "X-Height": "2", "X-Channels": "4"}
+    assert (decode_frame(frame.tobytes(), headers) == frame).all()
+    png = cv2.imencode(".png", frame[..., :3])[1].tobytes()
+    assert (decode_frame(png, {"Content-Type": "image/png"}) == frame[..., :3]).all()
+    with pytest.raises(ValueError):
+        decode_frame(frame.tobytes()[:-1], headers)
+
+
+def test_server(server):
+    with urllib.request.urlopen(server + "/health") as response:
+        assert json.load(response)["status"] == "ok"
+
+    status, output = post(server, b"not an image", {"Content-Type": "image/png"})
+    assert status == 400
+
+    png = cv2.imencode(".png", np.zeros((90, 160, 3), dtype=np.uint8))[1].tobytes()
+    status, output = post(server, png, {"Content-Type": "image/png", "X-Previous": json.dumps({"remaining": 2, "slot": "0F1"})})
+    assert status == 422 # No temple in the screenshot
+    assert "error" in output